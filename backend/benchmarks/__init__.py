@@ -0,0 +1,2 @@
+# Benchmarks package initialization
+# This file makes the 'benchmarks' directory a Python package
@@ -20,14 +20,142 @@ TTS_API_ENDPOINT = os.getenv(
     "TTS_API_ENDPOINT", "http://localhost:5005/v1/audio/speech"
 )
 
+# LLM HTTP connection pool
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 10))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", 30))
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "True").lower() in ("true", "1", "yes")
+
+# Conversation history sent to the LLM (kept within a token budget per request)
+LLM_HISTORY_TOKEN_BUDGET = int(os.getenv("LLM_HISTORY_TOKEN_BUDGET", 3072))
+LLM_MAX_MESSAGE_TOKENS = int(os.getenv("LLM_MAX_MESSAGE_TOKENS", 512))
+LLM_HISTORY_MAX_MESSAGES = int(os.getenv("LLM_HISTORY_MAX_MESSAGES", 200))
+LLM_TOKENIZER = os.getenv("LLM_TOKENIZER", "") or None
+LLM_CHARS_PER_TOKEN = float(os.getenv("LLM_CHARS_PER_TOKEN", 4))
+
+# Summarize older exchanges in the background once the unsummarized history
+# exceeds this many tokens (0 disables); the latest messages stay verbatim
+LLM_COMPACTION_THRESHOLD = int(os.getenv("LLM_COMPACTION_THRESHOLD", 0))
+LLM_COMPACTION_KEEP_MESSAGES = int(os.getenv("LLM_COMPACTION_KEEP_MESSAGES", 6))
+LLM_SUMMARY_MAX_TOKENS = int(os.getenv("LLM_SUMMARY_MAX_TOKENS", 256))
+
+# Start the response on the partial transcript of streamed audio while the final
+# decode runs; it is kept if the final transcript differs by at most MAX_EDITS words
+LLM_SPECULATION = os.getenv("LLM_SPECULATION", "True").lower() in ("true", "1", "yes")
+LLM_SPECULATION_MAX_EDITS = int(os.getenv("LLM_SPECULATION_MAX_EDITS", 0))
+
+# Send llama.cpp prompt cache hints (cache_prompt, n_keep) with every request;
+# n_keep is only sent when LLM_TOKENIZER is set (it should be the server model's)
+LLM_CACHE_PROMPT = os.getenv("LLM_CACHE_PROMPT", "False").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
+# Voice response policy: token caps per kind of reply (0 uses LLM max_tokens) and
+# an optional stop after this many spoken sentences with an offer to continue
+LLM_GREETING_MAX_TOKENS = int(os.getenv("LLM_GREETING_MAX_TOKENS", 96))
+LLM_FOLLOWUP_MAX_TOKENS = int(os.getenv("LLM_FOLLOWUP_MAX_TOKENS", 96))
+LLM_ANSWER_MAX_TOKENS = int(os.getenv("LLM_ANSWER_MAX_TOKENS", 512))
+LLM_MAX_SPOKEN_SENTENCES = int(os.getenv("LLM_MAX_SPOKEN_SENTENCES", 0))
+LLM_CONTINUE_PROMPT = os.getenv("LLM_CONTINUE_PROMPT", "Want me to go on?")
+
+# Generate greetings and silent follow-ups (text and audio) ahead of time
+REPLY_PREGENERATION = os.getenv("REPLY_PREGENERATION", "True").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+REPLY_POOL_SIZE = int(os.getenv("REPLY_POOL_SIZE", 2))
+REPLY_CACHE_MAX_KEYS = int(os.getenv("REPLY_CACHE_MAX_KEYS", 32))
+REPLY_MAX_WAIT = float(os.getenv("REPLY_MAX_WAIT", 1.5))
+
+# Play a short pre-synthesized acknowledgement when the LLM's first token takes
+# longer than FILLER_DELAY_MS (phrases are separated by "|")
+FILLER_AUDIO = os.getenv("FILLER_AUDIO", "False").lower() in ("true", "1", "yes")
+FILLER_DELAY_MS = int(os.getenv("FILLER_DELAY_MS", 700))
+FILLER_PHRASES = [
+    p.strip() for p in os.getenv("FILLER_PHRASES", "").split("|") if p.strip()
+]
+
 # Whisper Model Configuration
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "tiny.en")
 
+# Transcription Scheduling
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", 1))
+TRANSCRIPTION_QUEUE_SIZE = int(os.getenv("TRANSCRIPTION_QUEUE_SIZE", 16))
+TRANSCRIPTION_OVERFLOW_POLICY = os.getenv("TRANSCRIPTION_OVERFLOW_POLICY", "reject")
+
+# Shared Whisper model server (empty runs the models inside each web worker)
+TRANSCRIPTION_SERVER_SOCKET = os.getenv("TRANSCRIPTION_SERVER_SOCKET", "")
+
+# Benchmark compute type / thread counts on startup (cached per host and model)
+WHISPER_AUTOTUNE = os.getenv("WHISPER_AUTOTUNE", "False").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+WHISPER_AUTOTUNE_CLIP = os.getenv("WHISPER_AUTOTUNE_CLIP", "") or None
+
+# Cross-session dynamic batching of Whisper inference
+WHISPER_BATCHING = os.getenv("WHISPER_BATCHING", "False").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+WHISPER_BATCH_WINDOW_MS = int(os.getenv("WHISPER_BATCH_WINDOW_MS", 50))
+WHISPER_MAX_BATCH_SIZE = int(os.getenv("WHISPER_MAX_BATCH_SIZE", 8))
+
+# Load-adaptive model tiers (extra, faster models kept resident next to WHISPER_MODEL)
+WHISPER_TIER_MODELS = [
+    m.strip() for m in os.getenv("WHISPER_TIER_MODELS", "").split(",") if m.strip()
+]
+WHISPER_TIER_QUEUE_DEPTHS = [
+    int(d) for d in os.getenv("WHISPER_TIER_QUEUE_DEPTHS", "").split(",") if d.strip()
+] or None
+WHISPER_TIER_MAX_RTF = float(os.getenv("WHISPER_TIER_MAX_RTF", 0.5))
+
+# Confidence-driven cascade (small model first, larger model only when unsure)
+WHISPER_CASCADE_MODEL = os.getenv("WHISPER_CASCADE_MODEL", "") or None
+WHISPER_CASCADE_LOGPROB_THRESHOLD = float(
+    os.getenv("WHISPER_CASCADE_LOGPROB_THRESHOLD", -0.7)
+)
+WHISPER_CASCADE_COMPRESSION_THRESHOLD = float(
+    os.getenv("WHISPER_CASCADE_COMPRESSION_THRESHOLD", 2.2)
+)
+WHISPER_CASCADE_NO_SPEECH_THRESHOLD = float(
+    os.getenv("WHISPER_CASCADE_NO_SPEECH_THRESHOLD", 0.5)
+)
+
+# Long utterances are split into overlapping windows transcribed in parallel
+# (only with more than one transcription worker)
+LONG_FORM_MIN_SECONDS = float(os.getenv("LONG_FORM_MIN_SECONDS", 30))
+LONG_FORM_WINDOW_SECONDS = float(os.getenv("LONG_FORM_WINDOW_SECONDS", 12))
+LONG_FORM_OVERLAP_SECONDS = float(os.getenv("LONG_FORM_OVERLAP_SECONDS", 1))
+
+# Streaming (incremental) transcription
+STREAMING_DECODE_INTERVAL_MS = int(os.getenv("STREAMING_DECODE_INTERVAL_MS", 500))
+STREAMING_MAX_WINDOW_SECONDS = float(os.getenv("STREAMING_MAX_WINDOW_SECONDS", 20))
+
 # TTS Configuration
 TTS_MODEL = os.getenv("TTS_MODEL", "tts-1")
 TTS_VOICE = os.getenv("TTS_VOICE", "tara")
 TTS_FORMAT = os.getenv("TTS_FORMAT", "wav")
 
+# Sentences of a reply synthesized at the same time (audio is still sent in order)
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", 2))
+
+# Forward audio from the TTS server's chunked /tts/stream endpoint as it is
+# generated (WAV only), in playable pieces of at least TTS_STREAM_CHUNK_MS
+TTS_STREAMING = os.getenv("TTS_STREAMING", "True").lower() in ("true", "1", "yes")
+TTS_STREAM_CHUNK_MS = int(os.getenv("TTS_STREAM_CHUNK_MS", 250))
+
+# Synthesized audio cache: byte budget in memory, and an optional directory
+# kept across restarts and shared by all workers on the host
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", 32))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR") or None
+TTS_CACHE_DISK_MAX_MB = int(os.getenv("TTS_CACHE_DISK_MAX_MB", 256))
+
 # Vision Model Configuration
 ENABLE_VISION_MODEL = os.getenv("ENABLE_VISION_MODEL", "False").lower() in (
     "true",
@@ -42,6 +170,8 @@ WEBSOCKET_PORT = int(os.getenv("WEBSOCKET_PORT", 8000))
 # Audio Processing
 VAD_THRESHOLD = float(os.getenv("VAD_THRESHOLD", 0.5))
 VAD_BUFFER_SIZE = int(os.getenv("VAD_BUFFER_SIZE", 30))
+VAD_MODE = os.getenv("VAD_MODE", "rms")  # 'rms', 'onnx' or 'off'
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", 250))
 AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", 48000))
 
 
@@ -55,14 +185,70 @@ def get_config() -> Dict[str, Any]:
     return {
         "llm_api_endpoint": LLM_API_ENDPOINT,
         "tts_api_endpoint": TTS_API_ENDPOINT,
+        "llm_max_connections": LLM_MAX_CONNECTIONS,
+        "llm_max_keepalive_connections": LLM_MAX_KEEPALIVE_CONNECTIONS,
+        "llm_keepalive_expiry": LLM_KEEPALIVE_EXPIRY,
+        "llm_http2": LLM_HTTP2,
+        "llm_history_token_budget": LLM_HISTORY_TOKEN_BUDGET,
+        "llm_max_message_tokens": LLM_MAX_MESSAGE_TOKENS,
+        "llm_history_max_messages": LLM_HISTORY_MAX_MESSAGES,
+        "llm_tokenizer": LLM_TOKENIZER,
+        "llm_chars_per_token": LLM_CHARS_PER_TOKEN,
+        "llm_compaction_threshold": LLM_COMPACTION_THRESHOLD,
+        "llm_compaction_keep_messages": LLM_COMPACTION_KEEP_MESSAGES,
+        "llm_summary_max_tokens": LLM_SUMMARY_MAX_TOKENS,
+        "llm_speculation": LLM_SPECULATION,
+        "llm_speculation_max_edits": LLM_SPECULATION_MAX_EDITS,
+        "llm_cache_prompt": LLM_CACHE_PROMPT,
+        "llm_greeting_max_tokens": LLM_GREETING_MAX_TOKENS,
+        "llm_followup_max_tokens": LLM_FOLLOWUP_MAX_TOKENS,
+        "llm_answer_max_tokens": LLM_ANSWER_MAX_TOKENS,
+        "llm_max_spoken_sentences": LLM_MAX_SPOKEN_SENTENCES,
+        "llm_continue_prompt": LLM_CONTINUE_PROMPT,
+        "reply_pregeneration": REPLY_PREGENERATION,
+        "reply_pool_size": REPLY_POOL_SIZE,
+        "reply_cache_max_keys": REPLY_CACHE_MAX_KEYS,
+        "reply_max_wait": REPLY_MAX_WAIT,
+        "filler_audio": FILLER_AUDIO,
+        "filler_delay_ms": FILLER_DELAY_MS,
+        "filler_phrases": FILLER_PHRASES,
         "whisper_model": WHISPER_MODEL,
+        "transcription_workers": TRANSCRIPTION_WORKERS,
+        "transcription_queue_size": TRANSCRIPTION_QUEUE_SIZE,
+        "transcription_overflow_policy": TRANSCRIPTION_OVERFLOW_POLICY,
+        "transcription_server_socket": TRANSCRIPTION_SERVER_SOCKET,
+        "whisper_autotune": WHISPER_AUTOTUNE,
+        "whisper_autotune_clip": WHISPER_AUTOTUNE_CLIP,
+        "whisper_batching": WHISPER_BATCHING,
+        "whisper_batch_window_ms": WHISPER_BATCH_WINDOW_MS,
+        "whisper_max_batch_size": WHISPER_MAX_BATCH_SIZE,
+        "whisper_tier_models": WHISPER_TIER_MODELS,
+        "whisper_tier_queue_depths": WHISPER_TIER_QUEUE_DEPTHS,
+        "whisper_tier_max_rtf": WHISPER_TIER_MAX_RTF,
+        "whisper_cascade_model": WHISPER_CASCADE_MODEL,
+        "whisper_cascade_logprob_threshold": WHISPER_CASCADE_LOGPROB_THRESHOLD,
+        "whisper_cascade_compression_threshold": WHISPER_CASCADE_COMPRESSION_THRESHOLD,
+        "whisper_cascade_no_speech_threshold": WHISPER_CASCADE_NO_SPEECH_THRESHOLD,
+        "long_form_min_seconds": LONG_FORM_MIN_SECONDS,
+        "long_form_window_seconds": LONG_FORM_WINDOW_SECONDS,
+        "long_form_overlap_seconds": LONG_FORM_OVERLAP_SECONDS,
+        "streaming_decode_interval_ms": STREAMING_DECODE_INTERVAL_MS,
+        "streaming_max_window_seconds": STREAMING_MAX_WINDOW_SECONDS,
         "tts_model": TTS_MODEL,
         "tts_voice": TTS_VOICE,
         "tts_format": TTS_FORMAT,
+        "tts_concurrency": TTS_CONCURRENCY,
+        "tts_streaming": TTS_STREAMING,
+        "tts_stream_chunk_ms": TTS_STREAM_CHUNK_MS,
+        "tts_cache_max_mb": TTS_CACHE_MAX_MB,
+        "tts_cache_dir": TTS_CACHE_DIR,
+        "tts_cache_disk_max_mb": TTS_CACHE_DISK_MAX_MB,
         "websocket_host": WEBSOCKET_HOST,
         "websocket_port": WEBSOCKET_PORT,
         "vad_threshold": VAD_THRESHOLD,
         "vad_buffer_size": VAD_BUFFER_SIZE,
+        "vad_mode": VAD_MODE,
+        "vad_min_speech_ms": VAD_MIN_SPEECH_MS,
         "audio_sample_rate": AUDIO_SAMPLE_RATE,
         "enable_vision_model": ENABLE_VISION_MODEL,
     }
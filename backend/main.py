@@ -4,6 +4,7 @@ Vocalis Backend Server
 FastAPI application entry point.
 """
 
+import asyncio
 import logging
 import uvicorn
 from fastapi import FastAPI, WebSocket, Depends, HTTPException
@@ -14,8 +15,15 @@ from contextlib import asynccontextmanager
 from . import config
 
 # Import services
-from .services.transcription import WhisperTranscriber
+from .services.transcription_scheduler import create_transcription_service
+from .services.transcription_server import RemoteTranscriptionService
 from .services.llm import LLMClient
+from .services.token_counter import TokenCounter
+from .services.speculation import speculation_stats
+from .services.reply_cache import ReplyCache
+from .services.filler import FillerLibrary
+from .services.response_policy import ResponsePolicy
+from .services.tts_pipeline import pipeline_stats
 from .services.tts import TTSClient
 
 # from .services.vision import vision_service
@@ -34,6 +42,10 @@ logger = logging.getLogger(__name__)
 transcription_service = None
 llm_service = None
 tts_service = None
+token_counter = None
+reply_cache = None
+filler_library = None
+response_policy = None
 # Vision service is a singleton already initialized in its module
 
 
@@ -48,15 +60,31 @@ async def lifespan(app: FastAPI):
     # Initialize services on startup
     logger.info("Initializing services...")
 
-    global transcription_service, llm_service, tts_service
+    global transcription_service, llm_service, tts_service, token_counter
+    global reply_cache, filler_library, response_policy
 
-    # Initialize transcription service
-    transcription_service = WhisperTranscriber(
-        model_size=cfg["whisper_model"], sample_rate=cfg["audio_sample_rate"]
-    )
+    # Initialize transcription service: in process, or a shared model server
+    if cfg["transcription_server_socket"]:
+        transcription_service = RemoteTranscriptionService(
+            cfg["transcription_server_socket"]
+        )
+    else:
+        transcription_service = create_transcription_service(cfg)
 
     # Initialize LLM service
-    llm_service = LLMClient(api_endpoint=cfg["llm_api_endpoint"])
+    llm_service = LLMClient(
+        api_endpoint=cfg["llm_api_endpoint"],
+        max_connections=cfg["llm_max_connections"],
+        max_keepalive_connections=cfg["llm_max_keepalive_connections"],
+        keepalive_expiry=cfg["llm_keepalive_expiry"],
+        http2=cfg["llm_http2"],
+        cache_prompt=cfg["llm_cache_prompt"],
+    )
+
+    # Token counts for budgeting conversation history (shared by all sessions)
+    token_counter = TokenCounter(
+        tokenizer=cfg["llm_tokenizer"], chars_per_token=cfg["llm_chars_per_token"]
+    )
 
     # Initialize TTS service
     tts_service = TTSClient(
@@ -64,8 +92,37 @@ async def lifespan(app: FastAPI):
         model=cfg["tts_model"],
         voice=cfg["tts_voice"],
         output_format=cfg["tts_format"],
+        streaming=cfg["tts_streaming"],
+        stream_chunk_ms=cfg["tts_stream_chunk_ms"],
+        cache_max_bytes=cfg["tts_cache_max_mb"] * 1024 * 1024,
+        cache_dir=cfg["tts_cache_dir"],
+        cache_disk_max_bytes=cfg["tts_cache_disk_max_mb"] * 1024 * 1024,
     )
 
+    # Length limits for spoken replies
+    response_policy = ResponsePolicy(
+        greeting_max_tokens=cfg["llm_greeting_max_tokens"],
+        followup_max_tokens=cfg["llm_followup_max_tokens"],
+        answer_max_tokens=cfg["llm_answer_max_tokens"],
+        max_sentences=cfg["llm_max_spoken_sentences"],
+        continue_prompt=cfg["llm_continue_prompt"],
+    )
+
+    # Greetings and follow-ups prepared ahead of time (shared by all sessions)
+    if cfg["reply_pregeneration"]:
+        reply_cache = ReplyCache(
+            llm_service,
+            tts_service,
+            pool_size=cfg["reply_pool_size"],
+            max_keys=cfg["reply_cache_max_keys"],
+            max_wait=cfg["reply_max_wait"],
+        )
+
+    # Filler clips are synthesized in the background, none play until ready
+    if cfg["filler_audio"]:
+        filler_library = FillerLibrary(tts_service, cfg["filler_phrases"])
+        filler_task = asyncio.create_task(filler_library.prepare())
+
     # # Initialize vision service only if enabled in config
     # if cfg["enable_vision_model"]:
     #     logger.info("Initializing vision service...")
@@ -80,8 +137,16 @@ async def lifespan(app: FastAPI):
     # Cleanup on shutdown
     logger.info("Shutting down services...")
 
-    # No specific cleanup needed for these services,
-    # but we could add resource release code here if needed (maybe in a future release lex 31/03/25)
+    # Release transcription worker threads
+    transcription_service.shutdown()
+
+    # Stop preparing replies, then close pooled LLM and TTS connections
+    if reply_cache:
+        reply_cache.close()
+    if filler_library:
+        filler_task.cancel()
+    await llm_service.aclose()
+    await tts_service.aclose()
 
     logger.info("Shutdown complete")
 
@@ -155,7 +220,13 @@ async def get_full_config():
     return {
         "transcription": transcription_service.get_config(),
         "llm": llm_service.get_config(),
+        "tokens": token_counter.get_config(),
+        "speculation": speculation_stats.get_stats(),
+        "replies": reply_cache.get_config() if reply_cache else None,
+        "filler": filler_library.get_config() if filler_library else None,
+        "responses": response_policy.get_config(),
         "tts": tts_service.get_config(),
+        "tts_pipeline": pipeline_stats.get_stats(),
         "system": config.get_config(),
     }
 
@@ -164,7 +235,16 @@ async def get_full_config():
 @app.websocket("/ws")
 async def websocket_route(websocket: WebSocket):
     """WebSocket endpoint for bidirectional audio streaming."""
-    await websocket_endpoint(websocket, transcription_service, llm_service, tts_service)
+    await websocket_endpoint(
+        websocket,
+        transcription_service,
+        llm_service,
+        tts_service,
+        token_counter,
+        reply_cache,
+        filler_library,
+        response_policy,
+    )
 
 
 # Run server directly if executed as script
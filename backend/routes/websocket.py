@@ -10,16 +10,34 @@ import asyncio
 import numpy as np
 import base64
 import os
-from typing import Dict, Any, List, Optional, AsyncGenerator
+from typing import (
+    Dict,
+    Any,
+    List,
+    Optional,
+    AsyncGenerator,
+    AsyncIterator,
+    Tuple,
+    Union,
+)
 from fastapi import WebSocket, WebSocketDisconnect, BackgroundTasks
 from pydantic import BaseModel
 from datetime import datetime
-import time
+import uuid
 
-from ..services.transcription import WhisperTranscriber
+from .. import config
+from ..services.transcription_scheduler import TranscriptionScheduler, audio_duration
+from ..services.streaming_transcription import StreamingTranscription
 from ..services.llm import LLMClient
 from ..services.tts import TTSClient
 from ..services.conversation_storage import ConversationStorage
+from ..services.conversation_session import ConversationSession
+from ..services.token_counter import TokenCounter
+from ..services.reply_cache import PreparedReply, ReplyCache
+from ..services.filler import FillerLibrary
+from ..services.response_policy import ResponseKind, ResponsePolicy
+from ..services.tts_pipeline import SentencePipeline
+from ..services.speculation import SpeculativeResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +47,7 @@ logger = logging.getLogger(__name__)
 # WebSocket message types
 class MessageType:
     AUDIO = "audio"
+    AUDIO_STREAM = "audio_stream"
     TRANSCRIPTION = "transcription"
     LLM_RESPONSE = "llm_response"
     TTS_CHUNK = "tts_chunk"
@@ -62,6 +81,45 @@ class MessageType:
     VISION_READY = "vision_ready"
 
 
+# Temperature for greetings and silent follow-ups
+PROMPTED_REPLY_TEMPERATURE = 0.7
+
+# Time allowed to answer an utterance, plus time for transcribing it that
+# grows with its length, so long utterances aren't cut off mid-decode
+SPEECH_PROCESSING_TIMEOUT = 10.0
+TRANSCRIPTION_TIMEOUT_PER_AUDIO_SECOND = 1.0
+
+
+class MessagePriority:
+    """
+    How a client message is dispatched.
+
+    Control and speech messages are handled as soon as they are read, in
+    order. Responses and background work run as tracked tasks so the next
+    message is read immediately; a new response, new speech or an interrupt
+    cancels response tasks, while background tasks run to completion.
+    """
+
+    CONTROL = 0
+    SPEECH = 1
+    RESPONSE = 2
+    BACKGROUND = 3
+
+
+# Messages not listed are control messages
+MESSAGE_PRIORITIES = {
+    MessageType.AUDIO: MessagePriority.SPEECH,
+    MessageType.AUDIO_STREAM: MessagePriority.SPEECH,
+    MessageType.GREETING: MessagePriority.RESPONSE,
+    MessageType.SILENT_FOLLOWUP: MessagePriority.RESPONSE,
+    MessageType.SAVE_SESSION: MessagePriority.BACKGROUND,
+    MessageType.LOAD_SESSION: MessagePriority.BACKGROUND,
+    MessageType.LIST_SESSIONS: MessagePriority.BACKGROUND,
+    MessageType.DELETE_SESSION: MessagePriority.BACKGROUND,
+    MessageType.VISION_FILE_UPLOAD: MessagePriority.BACKGROUND,
+}
+
+
 class WebSocketManager:
     """
     Manages WebSocket connections and audio processing.
@@ -69,22 +127,36 @@ class WebSocketManager:
 
     def __init__(
         self,
-        transcriber: WhisperTranscriber,
+        transcriber: TranscriptionScheduler,
         llm_client: LLMClient,
         tts_client: TTSClient,
         use_streaming=True,
+        token_counter: Optional[TokenCounter] = None,
+        reply_cache: Optional[ReplyCache] = None,
+        filler_library: Optional[FillerLibrary] = None,
+        response_policy: Optional[ResponsePolicy] = None,
     ):
         """
         Initialize the WebSocket manager.
 
         Args:
-            transcriber: Whisper transcription service
+            transcriber: Transcription scheduler wrapping the Whisper service
             llm_client: LLM client service
             tts_client: TTS client service
+            token_counter: Shared token counter for budgeting conversation history
+            reply_cache: Shared cache of greetings and follow-ups prepared ahead
+                of time (None generates them on request)
+            filler_library: Shared filler clips played while waiting for the
+                LLM (None disables filler audio)
+            response_policy: Length limits for spoken replies (None has no limits
+                beyond the LLM client's)
         """
         self.transcriber = transcriber
         self.llm_client = llm_client
         self.tts_client = tts_client
+        self.reply_cache = reply_cache
+        self.filler_library = filler_library
+        self.response_policy = response_policy or ResponsePolicy()
         self.use_streaming = use_streaming
         logger.info(f"Initialized WebSocket Manager (streaming mode: {use_streaming})")
 
@@ -93,8 +165,28 @@ class WebSocketManager:
         self.is_processing = False
         self.speech_buffer = []
         self.current_audio_task = None
-        self.interrupt_playback = asyncio.Event()
-        self.current_vision_context = None  # Store the latest vision context
+        self.audio_stream: Optional[StreamingTranscription] = None
+        self.partial_task: Optional[asyncio.Task] = None
+
+        # Message tasks in flight and their priority
+        self.tasks: Dict[asyncio.Task, int] = {}
+
+        # Cache key of the follow-up being prepared while the user is silent.
+        # Follow-ups are scoped to this connection, so discarding one never
+        # touches another connection's identical request
+        self.pending_followup: Optional[str] = None
+        self.reply_scope = uuid.uuid4().hex
+
+        # Conversation history, vision context and interrupt flag for this connection
+        self.session = ConversationSession(
+            max_messages=config.LLM_HISTORY_MAX_MESSAGES,
+            token_counter=token_counter,
+            token_budget=config.LLM_HISTORY_TOKEN_BUDGET,
+            max_message_tokens=config.LLM_MAX_MESSAGE_TOKENS,
+            compaction_threshold=config.LLM_COMPACTION_THRESHOLD,
+            compaction_keep_messages=config.LLM_COMPACTION_KEEP_MESSAGES,
+            summary_max_tokens=config.LLM_SUMMARY_MAX_TOKENS,
+        )
 
         # File paths
         self.prompt_path = os.path.join("prompts", "system_prompt.md")
@@ -170,7 +262,7 @@ class WebSocketManager:
             {
                 "transcription_active": self.transcriber.is_processing,
                 "llm_active": self.llm_client.is_processing,
-                "tts_active": self.tts_client.is_processing,
+                "tts_active": self._is_responding(),
             },
         )
 
@@ -178,6 +270,9 @@ class WebSocketManager:
             f"Client connected. Active connections: {len(self.active_connections)}"
         )
 
+        # Have the greeting ready before the microphone is activated
+        self._prepare_greetings()
+
     def disconnect(self, websocket: WebSocket):
         """
         Handle a WebSocket disconnection.
@@ -187,6 +282,19 @@ class WebSocketManager:
         """
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+
+        # Stop work for this connection
+        self._discard_followup()
+        if self.audio_stream:
+            self.audio_stream.cancel()
+            self.audio_stream = None
+        if self.partial_task and not self.partial_task.done():
+            self.partial_task.cancel()
+        for task in list(self.tasks):
+            task.cancel()
+        if self.current_audio_task and not self.current_audio_task.done():
+            self.current_audio_task.cancel()
+        self.session.close()
         logger.info(
             f"Client disconnected. Active connections: {len(self.active_connections)}"
         )
@@ -245,138 +353,315 @@ class WebSocketManager:
             # Let whisper handle the WAV data directly - it can parse WAV headers
             audio_array = np.frombuffer(audio_data, dtype=np.uint8)
 
-            # Track if we're interrupting (for better audio handling)
-            was_interrupting = self.interrupt_playback.is_set()
-            was_tts_processing = self.tts_client.is_processing
+            await self._prepare_for_new_speech(websocket)
 
-            # If in the middle of interruption, delay briefly to allow cleanup
-            if was_interrupting or was_tts_processing:
+            # Log audio array shape for debugging
+            logger.info(
+                f"Received audio data: {len(audio_array)} bytes, processing now"
+            )
+
+            await self._start_speech_task(websocket, audio_array)
+
+        except Exception as e:
+            logger.error(f"Error processing audio: {e}")
+            await self._send_error(websocket, f"Audio processing error: {str(e)}")
+
+    async def handle_audio_stream(self, websocket: WebSocket, message: Dict[str, Any]):
+        """
+        Process a frame of audio streamed while the user is still speaking.
+
+        Frames are transcribed incrementally; partial transcripts are sent
+        back as they stabilise and the final frame starts the response.
+
+        Args:
+            websocket: The WebSocket connection
+            message: The audio_stream message (stream_id, sample_rate, audio_data, final, cancel)
+        """
+        try:
+            stream_id = message.get("stream_id", "")
+
+            if message.get("cancel"):
+                if self.audio_stream and self.audio_stream.stream_id == stream_id:
+                    logger.info(f"Audio stream {stream_id} cancelled by client")
+                    self.audio_stream.cancel()
+                    self.audio_stream = None
+                return
+
+            if self.audio_stream is None or self.audio_stream.stream_id != stream_id:
+                if self.audio_stream:
+                    self.audio_stream.cancel()
+                self.audio_stream = StreamingTranscription(
+                    self.transcriber,
+                    stream_id,
+                    sample_rate=int(
+                        message.get("sample_rate", config.AUDIO_SAMPLE_RATE)
+                    ),
+                    decode_interval=config.STREAMING_DECODE_INTERVAL_MS / 1000,
+                    max_window=config.STREAMING_MAX_WINDOW_SECONDS,
+                )
+                logger.info(f"Started audio stream {stream_id}")
+
+            stream = self.audio_stream
+            audio_base64 = message.get("audio_data", "")
+            if audio_base64:
+                stream.append(base64.b64decode(audio_base64))
+
+            if message.get("final"):
+                self.audio_stream = None
                 logger.info(
-                    "Detected interrupt in progress, adding small delay for cleanup..."
+                    f"Audio stream {stream_id} ended after {stream.duration:.2f}s, "
+                    f"finalizing transcript"
                 )
-                await asyncio.sleep(0.1)  # 100ms delay for cleanup
-                # Clear interrupt flag to allow new audio processing
-                self.interrupt_playback.clear()
-                self.tts_client.interrupt_event.clear()
-                self.tts_client.is_processing = False
-
-            # First, clear any existing interrupt flags to prepare for new processing
-            # This creates a clean slate for new audio
-            self.interrupt_playback.clear()
-
-            # Interrupt any ongoing TTS playback
-            if self.tts_client.is_processing:
-                logger.info("Interrupting TTS playback due to new speech")
-
-                # Set interrupt event and reset TTS state
-                self.interrupt_playback.set()
-                self.tts_client.interrupt_event.set()
-                self.tts_client.reset_state()
-
-                # Send an immediate TTS_END to client to ensure UI resets
-                await websocket.send_json(
-                    {
-                        "type": MessageType.TTS_END,
-                        "timestamp": datetime.now().isoformat(),
-                    }
+                await self._prepare_for_new_speech(websocket)
+                await self._start_speech_task(websocket, stream)
+            elif stream.should_decode():
+                # Start the decode now so the next frame sees it in flight
+                decode_task = stream.start_partial_decode()
+                self.partial_task = asyncio.create_task(
+                    self._send_partial_transcription(websocket, stream, decode_task)
                 )
 
-                # Cancel current audio task if it exists
-                if self.current_audio_task and not self.current_audio_task.done():
-                    try:
-                        self.current_audio_task.cancel()
-                        logger.info("Previous audio task cancelled due to new speech")
-                    except asyncio.CancelledError:
-                        logger.info("Previous audio task cancelled successfully")
-                    except Exception as e:
-                        logger.error(f"Error cancelling audio task: {e}")
+        except Exception as e:
+            logger.error(f"Error processing audio stream: {e}")
+            await self._send_error(websocket, f"Audio stream error: {str(e)}")
 
-                # Wait for any pending tasks to complete
-                # Using a short timeout to prevent blocking for too long
-                await asyncio.sleep(0.1)
+    async def _send_partial_transcription(
+        self,
+        websocket: WebSocket,
+        stream: StreamingTranscription,
+        decode_task: asyncio.Task,
+    ):
+        """
+        Wait for a partial decode of a streamed utterance and send the result.
 
-                # Clear interrupt flag AFTER interruption is complete to prepare for new processing
-                self.interrupt_playback.clear()
+        Args:
+            websocket: The WebSocket connection
+            stream: The streaming transcription being decoded
+            decode_task: The stream's partial decode
+        """
+        try:
+            await decode_task
+            if stream.closed:
+                return
+            await websocket.send_json(
+                {
+                    "type": MessageType.TRANSCRIPTION,
+                    **stream.partial_message(),
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending partial transcription: {e}")
 
-                # Let client know we're ready for new input
-                await self._send_status(
-                    websocket,
-                    "interrupted",
-                    {"tts_active": False, "ready_for_input": True},
-                )
+    async def _prepare_for_new_speech(self, websocket: WebSocket):
+        """
+        Stop any ongoing playback so a new utterance can be processed.
 
-            # Log audio array shape for debugging
+        Args:
+            websocket: The WebSocket connection
+        """
+        # The user is no longer silent
+        self._discard_followup()
+
+        # If in the middle of an interruption, delay briefly to allow cleanup
+        if self.session.interrupt.is_set():
             logger.info(
-                f"Received audio data: {len(audio_array)} bytes, processing now"
+                "Detected interrupt in progress, adding small delay for cleanup..."
             )
+            await asyncio.sleep(0.1)  # 100ms delay for cleanup
+
+        # Stop this connection's response in progress, which closes its LLM
+        # stream and TTS requests (other connections' are left alone)
+        self.session.interrupt.set()
+        interrupted = self._abort_response("new speech")
+        if interrupted:
+            logger.info("Interrupted playback due to new speech")
 
-            # Create a new task for the current audio processing
-            self.current_audio_task = asyncio.create_task(
-                self._process_speech_segment(websocket, audio_array)
+            # Send an immediate TTS_END to client to ensure UI resets
+            await websocket.send_json(
+                {
+                    "type": MessageType.TTS_END,
+                    "timestamp": datetime.now().isoformat(),
+                }
             )
 
-            # Send processing status update
+            # Give the cancelled tasks a moment to finish
+            await asyncio.sleep(0.1)
+
+        # Clear interrupt flag AFTER interruption is complete to prepare for new processing
+        self.session.interrupt.clear()
+
+        if interrupted:
+            # Let client know we're ready for new input
             await self._send_status(
                 websocket,
-                "audio_processing",
-                {"transcription_active": self.transcriber.is_processing},
+                "interrupted",
+                {"tts_active": False, "ready_for_input": True},
             )
 
-        except Exception as e:
-            logger.error(f"Error processing audio: {e}")
-            await self._send_error(websocket, f"Audio processing error: {str(e)}")
+    def _is_responding(self) -> bool:
+        """Whether this connection has a response (answer, greeting or follow-up) in progress."""
+        if self.current_audio_task and not self.current_audio_task.done():
+            return True
+        return any(
+            priority == MessagePriority.RESPONSE and not task.done()
+            for task, priority in self.tasks.items()
+        )
+
+    def _abort_response(self, reason: str) -> bool:
+        """
+        Cancel the responses in progress for this connection.
+
+        This covers the speech response and any greeting or follow-up task.
+        Cancelling a task closes its LLM stream and any TTS request, so the
+        backends stop generating output nobody will hear.
+
+        Args:
+            reason: What caused the abort, for the log
+
+        Returns:
+            bool: Whether a response was in progress
+        """
+        aborted = self._cancel_tasks(MessagePriority.RESPONSE)
+        if self.current_audio_task and not self.current_audio_task.done():
+            self.current_audio_task.cancel()
+            aborted += 1
+        if aborted:
+            logger.info(f"Aborted {aborted} response(s) in progress ({reason})")
+        return aborted > 0
+
+    def _cancel_tasks(self, priority: int) -> int:
+        """
+        Cancel the message tasks of one priority.
+
+        Returns:
+            int: Number of tasks cancelled
+        """
+        cancelled = 0
+        for task, task_priority in list(self.tasks.items()):
+            if task_priority == priority and not task.done():
+                task.cancel()
+                cancelled += 1
+        return cancelled
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        """Forget a finished message task and log unexpected failures."""
+        self.tasks.pop(task, None)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Message task {task.get_name()} failed: {task.exception()}")
+
+    async def dispatch_message(self, websocket: WebSocket, message: Dict[str, Any]):
+        """
+        Dispatch a client message according to its priority.
+
+        Control and speech messages are handled inline, so they are processed
+        in order and never wait behind a response. Everything else runs as a
+        tracked task and the caller can read the next message right away.
+
+        Args:
+            websocket: The WebSocket connection
+            message: The message from the client
+        """
+        message_type = message.get("type", "")
+        priority = MESSAGE_PRIORITIES.get(message_type, MessagePriority.CONTROL)
+
+        if priority <= MessagePriority.SPEECH:
+            await self.handle_client_message(websocket, message)
+            return
+
+        if priority == MessagePriority.RESPONSE:
+            # Only the latest greeting or follow-up is spoken
+            self._cancel_tasks(MessagePriority.RESPONSE)
+
+        task = asyncio.create_task(
+            self.handle_client_message(websocket, message), name=message_type
+        )
+        self.tasks[task] = priority
+        task.add_done_callback(self._task_done)
+
+    async def _start_speech_task(
+        self, websocket: WebSocket, speech_audio: Union[np.ndarray, StreamingTranscription]
+    ):
+        """
+        Start processing a complete utterance as the current audio task.
+
+        Args:
+            websocket: The WebSocket connection
+            speech_audio: Speech audio as numpy array, or a finished audio stream
+        """
+        # A new utterance replaces a response that is still being generated
+        self._abort_response("barge-in")
+
+        # Create a new task for the current audio processing
+        self.current_audio_task = asyncio.create_task(
+            self._process_speech_segment(websocket, speech_audio)
+        )
+
+        # Send processing status update
+        await self._send_status(
+            websocket,
+            "audio_processing",
+            {"transcription_active": self.transcriber.is_processing},
+        )
 
     async def _process_speech_segment(
-        self, websocket: WebSocket, speech_audio: np.ndarray
+        self,
+        websocket: WebSocket,
+        speech_audio: Union[np.ndarray, StreamingTranscription],
     ):
         """
         Process a complete speech segment.
 
+        Cancelling this task (barge-in, disconnect) cancels the processing
+        inside it as well, which closes its LLM stream and TTS requests.
+
         Args:
             websocket: The WebSocket connection
-            speech_audio: Speech audio as numpy array
+            speech_audio: Speech audio as numpy array, or a finished audio stream
         """
         try:
             # Set processing flag
             self.is_processing = True
-            self.interrupt_playback.clear()
-
-            # Add timeout protection
-            process_timeout = asyncio.create_task(
-                asyncio.sleep(10)
-            )  # 10-second timeout
-            processing_task = asyncio.create_task(
-                self._actual_speech_processing(websocket, speech_audio)
-            )
+            self.session.interrupt.clear()
 
-            done, pending = await asyncio.wait(
-                [process_timeout, processing_task], return_when=asyncio.FIRST_COMPLETED
+            # Add timeout protection, scaled with the length of the utterance
+            if isinstance(speech_audio, StreamingTranscription):
+                duration = speech_audio.duration
+            else:
+                duration = audio_duration(speech_audio)
+            timeout = (
+                SPEECH_PROCESSING_TIMEOUT
+                + duration * TRANSCRIPTION_TIMEOUT_PER_AUDIO_SECOND
+            )
+            await asyncio.wait_for(
+                self._actual_speech_processing(websocket, speech_audio), timeout=timeout
             )
 
-            if process_timeout in done:
-                # Timeout occurred, cancel the processing
-                processing_task.cancel()
-                logger.warning("Speech processing timed out, forcefully interrupted")
-                self.interrupt_playback.set()
-                await websocket.send_json(
-                    {
-                        "type": MessageType.ERROR,
-                        "error": "Processing timed out",
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
-
-            # Cancel the timeout if processing completed normally
-            process_timeout.cancel()
-
+        except asyncio.TimeoutError:
+            # wait_for has already cancelled the processing
+            logger.warning("Speech processing timed out, forcefully interrupted")
+            self.session.interrupt.set()
+            await websocket.send_json(
+                {
+                    "type": MessageType.ERROR,
+                    "error": "Processing timed out",
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
         except Exception as e:
             logger.error(f"Error processing speech segment: {e}")
             await self._send_error(websocket, f"Speech processing error: {str(e)}")
         finally:
-            self.is_processing = False
+            # A newer utterance may already be processing
+            if self.current_audio_task in (None, asyncio.current_task()):
+                self.is_processing = False
 
     async def _actual_speech_processing(
-        self, websocket: WebSocket, speech_audio: np.ndarray
+        self,
+        websocket: WebSocket,
+        speech_audio: Union[np.ndarray, StreamingTranscription],
     ):
         """
         Perform the actual speech processing work.
@@ -385,11 +670,91 @@ class WebSocketManager:
 
         Args:
             websocket: The WebSocket connection
-            speech_audio: Speech audio as numpy array
+            speech_audio: Speech audio as numpy array, or a finished audio stream
+        """
+        speculation = None
+        try:
+            if isinstance(speech_audio, StreamingTranscription):
+                speculation = self._start_speculation(speech_audio)
+            await self._respond_to_speech(websocket, speech_audio, speculation)
+        finally:
+            # Stop a speculative response that wasn't used, or was cut short
+            if speculation:
+                speculation.cancel()
+
+    def _start_speculation(
+        self, stream: StreamingTranscription
+    ) -> Optional[SpeculativeResponse]:
+        """
+        Start the response on the partial transcript of a finished audio stream.
+
+        The LLM then works while the final decode runs; the response is only
+        used if the final transcript says the same thing. It is kept out of
+        the history until then, and recorded under the final transcript.
+
+        Args:
+            stream: The finished audio stream, before its final decode
+
+        Returns:
+            The speculative response, or None if speculation doesn't apply
+        """
+        if not config.LLM_SPECULATION or self.session.vision_context is not None:
+            return None
+
+        partial_transcript = stream.partial_message()["text"]
+        if not partial_transcript.strip():
+            return None
+
+        return SpeculativeResponse(
+            partial_transcript,
+            self.session.stream_reply(
+                self.llm_client,
+                partial_transcript,
+                self.system_prompt,
+                add_to_history=False,
+                max_tokens=self.response_policy.max_tokens(ResponseKind.ANSWER),
+            ),
+            max_edits=config.LLM_SPECULATION_MAX_EDITS,
+        )
+
+    async def _respond_to_speech(
+        self,
+        websocket: WebSocket,
+        speech_audio: Union[np.ndarray, StreamingTranscription],
+        speculation: Optional[SpeculativeResponse] = None,
+    ):
+        """
+        Transcribe an utterance and stream the spoken response.
+
+        Args:
+            websocket: The WebSocket connection
+            speech_audio: Speech audio as numpy array, or a finished audio stream
+            speculation: Response already started on the partial transcript
         """
-        # Transcribe speech
-        await self._send_status(websocket, "transcribing", {})
-        transcript, metadata = self.transcriber.transcribe(speech_audio)
+        # Transcribe speech on the worker pool so the event loop stays responsive
+        await self._send_status(
+            websocket, "transcribing", {"queue_depth": self.transcriber.queue_depth}
+        )
+        if isinstance(speech_audio, StreamingTranscription):
+            # Most of the utterance was decoded while the user was speaking
+            transcript, metadata = await speech_audio.finalize()
+        else:
+            transcript, metadata = await self.transcriber.transcribe_async(
+                speech_audio
+            )
+
+        if metadata.get("rejected"):
+            logger.warning("Transcription rejected, server is overloaded")
+            await self._send_error(
+                websocket, "Server is busy, please try again", metadata
+            )
+            await websocket.send_json(
+                {
+                    "type": MessageType.TTS_END,
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+            return
 
         # Send transcription result
         await websocket.send_json(
@@ -424,8 +789,18 @@ class WebSocketManager:
             )
             return
 
+        # Keep the speculative response only if the user said what we guessed
+        text_stream = None
+        if speculation:
+            if speculation.matches(transcript):
+                text_stream = self.session.record_stream(
+                    transcript, speculation.commit()
+                )
+            else:
+                speculation.cancel(transcript)
+
         # Check if we have recent vision context to incorporate
-        has_vision_context = self.current_vision_context is not None
+        has_vision_context = self.session.vision_context is not None
 
         # Signal TTS start before LLM processing
         await websocket.send_json(
@@ -438,7 +813,7 @@ class WebSocketManager:
             logger.info("Processing speech with vision context")
 
             # Add vision context to conversation history
-            self._add_vision_context_to_conversation(self.current_vision_context)
+            self._add_vision_context_to_conversation(self.session.vision_context)
 
             # Enhance user query with vision context reference
             enhanced_transcript = f"{transcript} [Note: This question refers to the image I just analyzed.]"
@@ -453,12 +828,16 @@ class WebSocketManager:
             # Use streaming response
             full_response = ""
             async for text_chunk in self._stream_llm_to_tts(
-                websocket, enhanced_transcript, self.system_prompt
+                websocket,
+                enhanced_transcript,
+                self.system_prompt,
+                filler=True,
+                offer_to_continue=True,
             ):
                 full_response += text_chunk
 
             # Clear vision context after use
-            self.current_vision_context = None
+            self.session.vision_context = None
             logger.info("Vision context processed and cleared")
         else:
             # Normal non-vision processing with streaming
@@ -467,7 +846,12 @@ class WebSocketManager:
             # Use streaming response
             full_response = ""
             async for text_chunk in self._stream_llm_to_tts(
-                websocket, transcript, self.system_prompt
+                websocket,
+                transcript,
+                self.system_prompt,
+                text_stream,
+                filler=True,
+                offer_to_continue=True,
             ):
                 full_response += text_chunk
 
@@ -482,7 +866,7 @@ class WebSocketManager:
         )
 
         # Signal TTS end
-        if not self.interrupt_playback.is_set():
+        if not self.session.interrupt.is_set():
             await websocket.send_json(
                 {
                     "type": MessageType.TTS_END,
@@ -490,59 +874,98 @@ class WebSocketManager:
                 }
             )
 
-    async def _send_tts_response(self, websocket: WebSocket, text: str):
+            # Get the first follow-up ready in case the user stays silent
+            self._prepare_followup(0)
+
+    async def _play_prepared_reply(self, websocket: WebSocket, reply: PreparedReply):
         """
-        Generate and send TTS audio.
+        Play a reply generated and synthesized ahead of time.
 
         Args:
             websocket: The WebSocket connection
-            text: Text to convert to speech
+            reply: The prepared reply
         """
-        if not text.strip():
-            logger.info("Empty text for TTS, skipping")
-            return
-
-        try:
-            # Signal TTS start
-            await websocket.send_json(
-                {"type": MessageType.TTS_START, "timestamp": datetime.now().isoformat()}
-            )
-
-            await self._send_status(websocket, "generating_speech", {})
-
-            start_time = time.time()
-            audio_data = await self.tts_client.async_text_to_speech(text)
-            tts_time = time.time() - start_time
-            logger.info(f"TTS processing time: {tts_time:.3f}s for {len(text)} chars")
+        await websocket.send_json(
+            {"type": MessageType.TTS_START, "timestamp": datetime.now().isoformat()}
+        )
 
-            # Check if playback should be interrupted
-            if self.interrupt_playback.is_set():
-                logger.info("TTS generation interrupted")
+        for sentence, audio_data in reply.chunks:
+            if self.session.interrupt.is_set():
+                logger.info("Prepared reply interrupted")
                 return
 
-            # Encode and send the complete audio file
-            encoded_audio = base64.b64encode(audio_data).decode("utf-8")
             await websocket.send_json(
                 {
                     "type": MessageType.TTS_CHUNK,
-                    "audio_chunk": encoded_audio,
+                    "audio_chunk": base64.b64encode(audio_data).decode("utf-8"),
                     "format": self.tts_client.output_format,
+                    "text": sentence,
                     "timestamp": datetime.now().isoformat(),
                 }
             )
 
-            # Signal TTS end
-            if not self.interrupt_playback.is_set():
-                await websocket.send_json(
-                    {
-                        "type": MessageType.TTS_END,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                )
+        await websocket.send_json(
+            {
+                "type": MessageType.LLM_RESPONSE,
+                "text": reply.text,
+                "metadata": {"streaming": True, "prepared": True},
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+        await websocket.send_json(
+            {
+                "type": MessageType.TTS_END,
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
 
-        except Exception as e:
-            logger.error(f"Error streaming TTS: {e}")
-            await self._send_error(websocket, f"TTS streaming error: {str(e)}")
+    async def _speak_reply(
+        self, websocket: WebSocket, user_input: str, text_stream: AsyncIterator[str]
+    ):
+        """
+        Speak a generated reply sentence by sentence as it streams in.
+
+        Playback starts after the first sentence instead of after the whole
+        reply has been generated and synthesized.
+
+        Args:
+            websocket: The WebSocket connection
+            user_input: Input the reply was generated for
+            text_stream: LLM text stream for the reply
+        """
+        # Check for interrupt before starting playback
+        if self.session.interrupt.is_set():
+            logger.info("Reply interrupted before speaking")
+            await text_stream.aclose()
+            return
+
+        await websocket.send_json(
+            {"type": MessageType.TTS_START, "timestamp": datetime.now().isoformat()}
+        )
+        await self._send_status(websocket, "generating_speech", {"streaming": True})
+
+        full_response = ""
+        async for text_chunk in self._stream_llm_to_tts(
+            websocket, user_input, text_stream=text_stream
+        ):
+            full_response += text_chunk
+
+        # Send LLM response (complete) for display purposes
+        if not self.session.interrupt.is_set():
+            await websocket.send_json(
+                {
+                    "type": MessageType.LLM_RESPONSE,
+                    "text": full_response,
+                    "metadata": {"streaming": True},
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
+            await websocket.send_json(
+                {
+                    "type": MessageType.TTS_END,
+                    "timestamp": datetime.now().isoformat(),
+                }
+            )
 
     def _load_user_profile(self) -> Dict[str, Any]:
         """
@@ -669,34 +1092,85 @@ class WebSocketManager:
 
         logger.info(f"Initializing conversation context with user name: {user_name}")
 
-        # Format the context message
-        context_message = {
-            "role": "system",
-            "content": f"USER CONTEXT: The user's name is {user_name}.",
-        }
-
-        # Check if we already have a system prompt as the first message
-        if (
-            self.llm_client.conversation_history
-            and self.llm_client.conversation_history[0]["role"] == "system"
-        ):
-            # Check if we already have a user context message
-            if len(
-                self.llm_client.conversation_history
-            ) > 1 and "USER CONTEXT" in self.llm_client.conversation_history[1].get(
-                "content", ""
-            ):
-                # Replace existing context message
-                self.llm_client.conversation_history[1] = context_message
-            else:
-                # Insert after system prompt
-                self.llm_client.conversation_history.insert(1, context_message)
-        else:
-            # No system prompt, add context as first message
-            self.llm_client.conversation_history.insert(0, context_message)
+        self.session.set_user_context(f"USER CONTEXT: The user's name is {user_name}.")
 
         return True
 
+    def _greeting_request(
+        self, is_returning_user: bool
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        Get the greeting instruction and the messages it is requested with.
+
+        The conversation context is initialized first, so a greeting requested
+        later is built from the same messages as one prepared now.
+
+        Args:
+            is_returning_user: Whether this is a returning user
+
+        Returns:
+            Tuple of the instruction and the request messages
+        """
+        # Initialize conversation context with user information
+        # This ensures the LLM knows the user's name in subsequent interactions
+        self._initialize_conversation_context()
+
+        instruction = self._get_greeting_prompt(is_returning_user=is_returning_user)
+        messages = self.session.build_messages(
+            instruction, self.system_prompt, recent=0
+        )
+        return instruction, messages
+
+    def _prepare_greetings(self):
+        """Prepare greetings for the current profile and system prompt in the background."""
+        if not self.reply_cache:
+            return
+        max_tokens = self.response_policy.max_tokens(ResponseKind.GREETING)
+        for is_returning_user in (False, True):
+            _, messages = self._greeting_request(is_returning_user)
+            self.reply_cache.fill(
+                messages, PROMPTED_REPLY_TEMPERATURE, max_tokens=max_tokens
+            )
+
+    @staticmethod
+    def _followup_input(tier: int) -> str:
+        """Silence indicator sent as the user input for a follow-up tier."""
+        # Select appropriate silence indicator based on tier
+        return (
+            "[silent]" if tier == 0 else "[no response]" if tier == 1 else "[still waiting]"
+        )
+
+    def _prepare_followup(self, tier: int):
+        """
+        Prepare a follow-up in the background while the user is silent.
+
+        It runs in the LLM client's background slot, like history compaction,
+        so it doesn't hold up the reply to the user's next utterance.
+
+        Args:
+            tier: Follow-up tier to prepare (0-2)
+        """
+        if not self.reply_cache:
+            return
+        self._discard_followup()
+        messages = self.session.build_messages(
+            self._followup_input(tier), self.system_prompt, preview=True
+        )
+        self.pending_followup = self.reply_cache.fill(
+            messages,
+            PROMPTED_REPLY_TEMPERATURE,
+            pool_size=1,
+            max_tokens=self.response_policy.max_tokens(ResponseKind.FOLLOWUP),
+            low_priority=True,
+            scope=self.reply_scope,
+        )
+
+    def _discard_followup(self):
+        """Stop preparing a follow-up that is no longer needed."""
+        if self.reply_cache and self.pending_followup:
+            self.reply_cache.discard(self.pending_followup)
+        self.pending_followup = None
+
     async def _handle_greeting(self, websocket: WebSocket):
         """
         Handle greeting request when user first clicks microphone.
@@ -706,46 +1180,43 @@ class WebSocketManager:
             # We need to preserve any existing interrupt signal
 
             # Check if user has conversation history
-            has_history = len(self.llm_client.conversation_history) > 0
-
-            # Save current conversation history and temporarily clear it
-            saved_history = self.llm_client.conversation_history.copy()
-            self.llm_client.conversation_history = []
-
-            # Get customized greeting prompt
-            instruction = self._get_greeting_prompt(is_returning_user=has_history)
-
-            # Get response from LLM without adding to conversation history, with moderate temperature
-            # Use instruction as user message, not as system message
-            logger.info("Generating greeting")
-            llm_response = self.llm_client.get_response(
-                instruction, self.system_prompt, add_to_history=False, temperature=0.7
-            )
-
-            # Restore saved conversation history
-            self.llm_client.conversation_history = saved_history
+            has_history = len(self.session) > 0
 
-            # Initialize conversation context with user information
-            # This ensures the LLM knows the user's name in subsequent interactions
-            self._initialize_conversation_context()
+            # Get customized greeting prompt and the request for it
+            instruction, messages = self._greeting_request(has_history)
+            max_tokens = self.response_policy.max_tokens(ResponseKind.GREETING)
 
-            # Check for interrupt before sending responses
-            if self.interrupt_playback.is_set():
-                logger.info("Greeting interrupted before sending response")
-                return
+            # Play a greeting prepared ahead of time if there is one
+            reply = None
+            if self.reply_cache:
+                reply = await self.reply_cache.take(
+                    messages, PROMPTED_REPLY_TEMPERATURE, max_tokens=max_tokens
+                )
+                # Prepare the next one for the following activation
+                self.reply_cache.fill(
+                    messages, PROMPTED_REPLY_TEMPERATURE, max_tokens=max_tokens
+                )
 
-            # Send LLM response
-            await websocket.send_json(
-                {
-                    "type": MessageType.LLM_RESPONSE,
-                    "text": llm_response["text"],
-                    "metadata": {k: v for k, v in llm_response.items() if k != "text"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+            if reply:
+                logger.info("Playing prepared greeting")
+                await self._play_prepared_reply(websocket, reply)
+            else:
+                # Stream the greeting without any history and without adding to it, with moderate temperature
+                # Use instruction as user message, not as system message
+                logger.info("Generating greeting")
+                text_stream = self.session.stream_reply(
+                    self.llm_client,
+                    instruction,
+                    self.system_prompt,
+                    add_to_history=False,
+                    temperature=PROMPTED_REPLY_TEMPERATURE,
+                    recent=0,
+                    max_tokens=max_tokens,
+                )
+                await self._speak_reply(websocket, instruction, text_stream)
 
-            # Generate and send TTS audio (this method already checks for interrupts)
-            await self._send_tts_response(websocket, llm_response["text"])
+            if not self.session.interrupt.is_set():
+                self._prepare_followup(0)
 
         except Exception as e:
             logger.error(f"Error generating greeting: {e}")
@@ -762,55 +1233,44 @@ class WebSocketManager:
             tier: Current follow-up tier (0-2)
         """
         try:
-            # Save full conversation history
-            full_history = self.llm_client.conversation_history.copy()
-
-            # Extract recent conversation context (keeping last few exchanges)
-            context_messages = []
+            user_input = self._followup_input(tier)
+            max_tokens = self.response_policy.max_tokens(ResponseKind.FOLLOWUP)
+
+            # Play the follow-up prepared while the user was silent, if it was
+            # prepared for the conversation as it is now
+            reply = None
+            if self.reply_cache:
+                messages = self.session.build_messages(
+                    user_input, self.system_prompt, preview=True
+                )
+                reply = await self.reply_cache.take(
+                    messages,
+                    PROMPTED_REPLY_TEMPERATURE,
+                    max_tokens=max_tokens,
+                    scope=self.reply_scope,
+                )
 
-            # If there's a system message, keep it at the beginning
-            if full_history and full_history[0]["role"] == "system":
-                context_messages.append(full_history[0])
-                recent_history = full_history[1:]
+            if reply:
+                logger.info(f"Playing prepared follow-up (tier {tier+1})")
+                await self._play_prepared_reply(websocket, reply)
             else:
-                recent_history = full_history
-
-            # Include the last several exchanges for context (up to 6 messages)
-            # This provides enough context for a meaningful continuation
-            num_context_messages = min(6, len(recent_history))
-            context_messages.extend(recent_history[-num_context_messages:])
-
-            # Temporarily set conversation history to just these context messages
-            self.llm_client.conversation_history = context_messages
-
-            # Select appropriate silence indicator based on tier
-            user_input = (
-                "[silent]"
-                if tier == 0
-                else "[no response]" if tier == 1 else "[still waiting]"
-            )
-
-            # Generate the follow-up with the silence indicator as user input
-            logger.info(f"Generating contextual follow-up (tier {tier+1})")
-            llm_response = self.llm_client.get_response(
-                user_input, self.system_prompt, add_to_history=False, temperature=0.7
-            )
-
-            # Restore original conversation history
-            self.llm_client.conversation_history = full_history
-
-            # Send LLM response
-            await websocket.send_json(
-                {
-                    "type": MessageType.LLM_RESPONSE,
-                    "text": llm_response["text"],
-                    "metadata": {k: v for k, v in llm_response.items() if k != "text"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            )
+                # Generate the follow-up with the silence indicator as user input.
+                # It is sent with the same history as a normal turn, so the LLM server
+                # can reuse the prompt it already has cached for this conversation
+                logger.info(f"Generating contextual follow-up (tier {tier+1})")
+                text_stream = self.session.stream_reply(
+                    self.llm_client,
+                    user_input,
+                    self.system_prompt,
+                    add_to_history=False,
+                    temperature=PROMPTED_REPLY_TEMPERATURE,
+                    max_tokens=max_tokens,
+                )
+                await self._speak_reply(websocket, user_input, text_stream)
 
-            # Generate and send TTS audio
-            await self._send_tts_response(websocket, llm_response["text"])
+            # Get the next tier ready in case the silence continues
+            if not self.session.interrupt.is_set() and tier < 2:
+                self._prepare_followup(tier + 1)
 
         except Exception as e:
             logger.error(f"Error generating silent follow-up: {e}")
@@ -831,8 +1291,8 @@ class WebSocketManager:
             session_id: Optional ID for the session (for overwriting existing)
         """
         try:
-            # Get current conversation history from LLM client
-            messages = self.llm_client.conversation_history.copy()
+            # Get current conversation history (a snapshot, later turns don't change it)
+            messages = self.session.snapshot()
 
             # Don't save empty conversations
             if not messages:
@@ -895,8 +1355,8 @@ class WebSocketManager:
                 await self._send_error(websocket, f"Session not found: {session_id}")
                 return
 
-            # Update LLM client's conversation history
-            self.llm_client.conversation_history = session.get("messages", [])
+            # Replace this connection's conversation history
+            self.session.replace_history(session.get("messages", []))
 
             # Send confirmation
             await websocket.send_json(
@@ -995,6 +1455,10 @@ class WebSocketManager:
                     audio_bytes = base64.b64decode(audio_base64)
                     await self.handle_audio(websocket, audio_bytes)
 
+            elif message_type == MessageType.AUDIO_STREAM:
+                # Handle a frame of incrementally streamed audio
+                await self.handle_audio_stream(websocket, message)
+
             elif message_type == MessageType.VISION_FILE_UPLOAD:
                 # Handle vision image upload
                 image_base64 = message.get("image_data", "")
@@ -1007,26 +1471,14 @@ class WebSocketManager:
                     "Received interrupt request from client - PRIORITY HANDLING"
                 )
 
-                # Track pre-interrupt state to help with recovery
-                was_processing = self.is_processing
+                # Stop this connection's processing; other connections
+                # sharing the TTS client keep speaking
                 self.is_processing = False
+                self.session.interrupt.set()
 
-                # Force immediate interrupt of TTS
-                self.tts_client.interrupt_event.set()
-
-                # Also set our internal interrupt flag for other processes
-                self.interrupt_playback.set()
-
-                # Reset TTS client state
-                self.tts_client.is_processing = False
-
-                # Cancel any ongoing audio tasks but preserve their state for potential recovery
-                if self.current_audio_task and not self.current_audio_task.done():
-                    try:
-                        logger.info("Force cancelling current audio task")
-                        self.current_audio_task.cancel()
-                    except Exception as e:
-                        logger.error(f"Error cancelling audio task: {e}")
+                # Cancel any ongoing audio task, closing its LLM and TTS requests
+                if not self._abort_response("interrupt"):
+                    logger.info("No response in progress to interrupt")
 
                 # Send interrupt confirmation back to client
                 await websocket.send_json(
@@ -1054,13 +1506,13 @@ class WebSocketManager:
                 # Reset the interrupt flag after a very short delay
                 # This ensures we're ready to receive new audio immediately
                 await asyncio.sleep(0.05)  # 50ms delay
-                self.interrupt_playback.clear()
+                self.session.interrupt.clear()
 
                 logger.info("Interrupt processing completed - ready for new input")
 
             elif message_type == "clear_history":
                 # Clear conversation history
-                self.llm_client.clear_history(keep_system_prompt=True)
+                self.session.clear_history(keep_system_prompt=True)
 
                 # Reinitialize conversation context to maintain user name awareness
                 # This ensures the LLM retains knowledge of the user's name even after history is cleared
@@ -1200,6 +1652,9 @@ class WebSocketManager:
                 logger.info(
                     f"Updated user profile name to: {name} and refreshed conversation context"
                 )
+
+                # Greetings for the new name are prepared off the critical path
+                self._prepare_greetings()
             else:
                 logger.error("Failed to update user profile")
 
@@ -1386,6 +1841,9 @@ class WebSocketManager:
             )
 
             logger.info("Updated system prompt")
+
+            # Greetings for the new prompt are prepared off the critical path
+            self._prepare_greetings()
         except Exception as e:
             logger.error(f"Error updating system prompt: {e}")
             await self._send_error(websocket, f"Error updating system prompt: {str(e)}")
@@ -1397,32 +1855,9 @@ class WebSocketManager:
         Args:
             vision_context: Description of the image from SmolVLM
         """
-        # Add as a system message to provide context for future exchanges
-        vision_message = {
-            "role": "system",
-            "content": f"[VISION CONTEXT]: {vision_context}",
-        }
-
-        # If conversation history is empty, add it as the first message
-        # Otherwise, insert after the main system prompt
-        if not self.llm_client.conversation_history:
-            self.llm_client.conversation_history.append(vision_message)
-        else:
-            # Find the last system message that's not a vision context
-            last_system_idx = -1
-            for i, msg in enumerate(self.llm_client.conversation_history):
-                if msg["role"] == "system" and not msg["content"].startswith(
-                    "[VISION CONTEXT]"
-                ):
-                    last_system_idx = i
-
-            # Insert after the last system message, or at the beginning if none found
-            if last_system_idx >= 0:
-                self.llm_client.conversation_history.insert(
-                    last_system_idx + 1, vision_message
-                )
-            else:
-                self.llm_client.conversation_history.insert(0, vision_message)
+        # Appended as a system message right before the question about the
+        # image, so it also provides context for future exchanges
+        self.session.add_vision_context(vision_context)
 
     async def _handle_vision_file_upload(self, websocket: WebSocket, image_base64: str):
         """
@@ -1485,7 +1920,7 @@ class WebSocketManager:
             )
 
             # Store the vision context for later use in conversation
-            self.current_vision_context = vision_context
+            self.session.vision_context = vision_context
 
             # Send vision ready notification with the generated context
             await websocket.send_json(
@@ -1502,7 +1937,13 @@ class WebSocketManager:
             await self._send_error(websocket, f"Vision processing error: {str(e)}")
 
     async def _stream_llm_to_tts(
-        self, websocket: WebSocket, user_input: str, system_prompt: Optional[str] = None
+        self,
+        websocket: WebSocket,
+        user_input: str,
+        system_prompt: Optional[str] = None,
+        text_stream: Optional[AsyncIterator[str]] = None,
+        filler: bool = False,
+        offer_to_continue: bool = False,
     ) -> AsyncGenerator[str, None]:
         """
         Stream LLM response to TTS in real-time.
@@ -1511,123 +1952,159 @@ class WebSocketManager:
             websocket: The WebSocket connection
             user_input: User's text input
             system_prompt: Optional system prompt to set context
+            text_stream: Response already under way (e.g. a committed speculation)
+                used instead of starting a new LLM request
+            filler: Play a filler clip if the first token is late
+            offer_to_continue: Stop after the response policy's number of spoken
+                sentences and ask whether to go on (for answers to the user)
 
         Yields:
             Text chunks that have been processed and sent to TTS
         """
-        # Get streaming response from LLM
-        buffer = ""
-        sentence_end_chars = [".", "!", "?", ":", ";"]
-        last_buffer_process_time = 0
-        tts_tasks = []
+        spoken_text = ""
+        pipeline = None
 
         try:
             # Check interrupt status before starting
-            if self.interrupt_playback.is_set():
+            if self.session.interrupt.is_set():
                 logger.info("LLM streaming interrupted before starting")
                 return
 
-            for text_chunk in self.llm_client.stream_response(
-                user_input, system_prompt
-            ):
-                # Check interrupt status IMMEDIATELY for each chunk
-                if self.interrupt_playback.is_set():
-                    logger.info("LLM streaming interrupted during chunk generation")
-                    break
-
-                # Add chunk to buffer
-                buffer += text_chunk
-
-                # Don't process too frequently - enforce minimum time between TTS calls
-                # to avoid overwhelming the system with too many small requests
-                current_time = time.time()
-                time_since_last_process = current_time - last_buffer_process_time
-
-                # Process buffer when we have a complete sentence or other threshold is met
-                # AND enough time has passed since last processing (minimum 300ms)
-                if (
-                    # Only break at natural sentence boundaries (highest priority)
-                    (
-                        any(end_char in buffer for end_char in sentence_end_chars)
-                        and len(buffer) >= 30
-                    )
-                    or
-                    # Complete phrases only if substantial (80+ chars)
-                    (" " in buffer and len(buffer) >= 80)
-                    or
-                    # Absolute maximum to prevent excessive waits
-                    len(buffer) >= 120
-                ) and time_since_last_process >= 0.3:  # 300ms minimum between TTS calls
-                    # Check interrupt status AGAIN before TTS processing
-                    if self.interrupt_playback.is_set():
-                        logger.info("LLM streaming interrupted before TTS processing")
-                        break
-
-                    # Process the buffer through TTS
-                    start_time = time.time()
-                    audio_data = await self.tts_client.async_text_to_speech(buffer)
-                    tts_time = time.time() - start_time
-                    logger.info(
-                        f"TTS processing time: {tts_time:.3f}s for {len(buffer)} chars"
-                    )
+            if text_stream is None:
+                text_stream = self.session.stream_reply(
+                    self.llm_client,
+                    user_input,
+                    system_prompt,
+                    max_tokens=self.response_policy.max_tokens(ResponseKind.ANSWER),
+                )
+            if filler and self.filler_library:
+                text_stream = self._with_filler(websocket, text_stream)
+
+            # LLM text keeps flowing while earlier sentences are synthesized
+            pipeline = SentencePipeline(
+                self.tts_client,
+                text_stream,
+                max_concurrency=config.TTS_CONCURRENCY,
+                max_sentences=(
+                    self.response_policy.max_sentences if offer_to_continue else 0
+                ),
+            )
 
-                    # Check interrupt status YET AGAIN before sending audio
-                    if self.interrupt_playback.is_set():
-                        logger.info("TTS generation interrupted before sending")
-                        break
+            async for sentence, audio_data in pipeline:
+                # Check interrupt status before sending each piece of audio
+                if self.session.interrupt.is_set():
+                    logger.info("TTS streaming interrupted before sending")
+                    return
 
-                    # Encode and send the audio chunk
+                # Encode and send the audio chunk (the text comes with a sentence's first one)
+                if audio_data:
                     encoded_audio = base64.b64encode(audio_data).decode("utf-8")
                     await websocket.send_json(
                         {
                             "type": MessageType.TTS_CHUNK,
                             "audio_chunk": encoded_audio,
                             "format": self.tts_client.output_format,
-                            "text": buffer,  # Include the text for debugging/display
+                            "text": sentence,  # Include the text for debugging/display
+                            "queue_depth": dict(pipeline.depth),
                             "timestamp": datetime.now().isoformat(),
                         }
                     )
 
-                    # Record the time we processed this buffer
-                    last_buffer_process_time = time.time()
-
-                    # Yield the processed chunk
-                    yield buffer
-
-                    # Clear buffer
-                    buffer = ""
+                # Yield the processed chunk
+                if sentence:
+                    text_chunk = f" {sentence}" if spoken_text else sentence
+                    spoken_text += text_chunk
+                    yield text_chunk
 
-            # Final interrupt check before processing remaining buffer
-            if buffer and not self.interrupt_playback.is_set():
-                start_time = time.time()
-                audio_data = await self.tts_client.async_text_to_speech(buffer)
-                tts_time = time.time() - start_time
+            if pipeline.stopped_early and not self.session.interrupt.is_set():
+                # Don't read a long answer aloud in full, offer to go on instead
+                continue_prompt = self.response_policy.continue_prompt
                 logger.info(
-                    f"TTS processing time: {tts_time:.3f}s for {len(buffer)} chars"
+                    f"Stopped answer after {pipeline.sentences} sentences, "
+                    f"offering to continue"
                 )
+                self.response_policy.record_early_stop()
 
-                # Last interrupt check before sending final audio
-                if self.interrupt_playback.is_set():
-                    logger.info("Final TTS chunk interrupted before sending")
-                    return
-
+                audio_data = await self.tts_client.async_text_to_speech(
+                    continue_prompt
+                )
                 encoded_audio = base64.b64encode(audio_data).decode("utf-8")
                 await websocket.send_json(
                     {
                         "type": MessageType.TTS_CHUNK,
                         "audio_chunk": encoded_audio,
                         "format": self.tts_client.output_format,
-                        "text": buffer,
+                        "text": continue_prompt,
                         "timestamp": datetime.now().isoformat(),
                     }
                 )
 
-                yield buffer
+                # Keep what was said, so "yes" continues from there
+                spoken_text = f"{spoken_text} {continue_prompt}"
+                self.session.revise_reply(spoken_text)
+                yield f" {continue_prompt}"
 
         except Exception as e:
             logger.error(f"Error in LLM-to-TTS streaming: {e}")
             # Still yield any error to preserve the generator return value
             yield f"Error: {str(e)}"
+        finally:
+            # Stop the LLM request and pending synthesis if we were interrupted
+            # (an answer stopped at its sentence limit has closed its stream already)
+            if pipeline is not None:
+                await pipeline.aclose()
+            if text_stream is not None:
+                await text_stream.aclose()
+
+    async def _with_filler(
+        self, websocket: WebSocket, text_stream: AsyncIterator[str]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Pass a text stream through, playing a filler clip if it starts late.
+
+        The clip is sent as a complete audio chunk before any of the response,
+        so the response follows it without being cut off.
+
+        Args:
+            websocket: The WebSocket connection
+            text_stream: LLM text stream
+
+        Yields:
+            The stream's text chunks
+        """
+        first_chunk = asyncio.ensure_future(text_stream.__anext__())
+        try:
+            done, _ = await asyncio.wait(
+                {first_chunk}, timeout=config.FILLER_DELAY_MS / 1000
+            )
+            if not done and not self.session.interrupt.is_set():
+                clip = self.filler_library.pick()
+                if clip:
+                    phrase, audio_data = clip
+                    logger.info(f"First token is late, playing filler {phrase!r}")
+                    await websocket.send_json(
+                        {
+                            "type": MessageType.TTS_CHUNK,
+                            "audio_chunk": base64.b64encode(audio_data).decode("utf-8"),
+                            "format": self.tts_client.output_format,
+                            "text": phrase,
+                            "filler": True,
+                            "timestamp": datetime.now().isoformat(),
+                        }
+                    )
+
+            try:
+                yield await first_chunk
+            except StopAsyncIteration:
+                return
+            async for text_chunk in text_stream:
+                yield text_chunk
+        finally:
+            # The stream can only be closed once the pending read has stopped
+            if not first_chunk.done():
+                first_chunk.cancel()
+                await asyncio.wait({first_chunk})
+            await text_stream.aclose()
 
     async def handle_toggle_streaming(self, websocket: WebSocket, enabled: bool):
         """
@@ -1647,21 +2124,38 @@ class WebSocketManager:
 
 async def websocket_endpoint(
     websocket: WebSocket,
-    transcriber: WhisperTranscriber,
+    transcriber: TranscriptionScheduler,
     llm_client: LLMClient,
     tts_client: TTSClient,
+    token_counter: Optional[TokenCounter] = None,
+    reply_cache: Optional[ReplyCache] = None,
+    filler_library: Optional[FillerLibrary] = None,
+    response_policy: Optional[ResponsePolicy] = None,
 ):
     """
     FastAPI WebSocket endpoint.
 
     Args:
         websocket: The WebSocket connection
-        transcriber: Whisper transcription service
+        transcriber: Transcription scheduler wrapping the Whisper service
         llm_client: LLM client service
         tts_client: TTS client service
+        token_counter: Shared token counter for budgeting conversation history
+        reply_cache: Shared cache of greetings and follow-ups prepared ahead of time
+        filler_library: Shared filler clips played while waiting for the LLM
+        response_policy: Length limits for spoken replies
     """
     # Create WebSocket manager
-    manager = WebSocketManager(transcriber, llm_client, tts_client, use_streaming=True)
+    manager = WebSocketManager(
+        transcriber,
+        llm_client,
+        tts_client,
+        use_streaming=True,
+        token_counter=token_counter,
+        reply_cache=reply_cache,
+        filler_library=filler_library,
+        response_policy=response_policy,
+    )
 
     try:
         # Accept connection
@@ -1675,8 +2169,8 @@ async def websocket_endpoint(
                     websocket.receive_json(), timeout=30.0  # 30 second timeout
                 )
 
-                # Process message
-                await manager.handle_client_message(websocket, message)
+                # Process message (long operations continue in the background)
+                await manager.dispatch_message(websocket, message)
 
             except asyncio.TimeoutError:
                 # Send a ping to keep the connection alive
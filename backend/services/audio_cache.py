@@ -0,0 +1,272 @@
+"""
+Audio Cache
+
+Synthesized speech keyed by normalized text and voice settings, kept in a
+byte-bounded LRU in memory with an optional persistent tier on disk.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# The disk tier is trimmed to this share of its budget when it overflows
+DISK_TRIM_TARGET = 0.9
+
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so spellings that are spoken the same share an entry."""
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class AudioCache:
+    """
+    LRU cache of synthesized audio bounded by total size.
+
+    Entries are looked up in memory first, then in the optional disk tier: a
+    directory with one file per entry, written atomically, so the files
+    survive restarts and all workers on the host share them (and the OS page
+    cache holding them). Disk hits are promoted to memory. Async callers use
+    aget() and aput(), which do the file I/O in a worker thread.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+    ):
+        """
+        Initialize the audio cache.
+
+        Args:
+            max_bytes: Memory budget for cached audio
+            disk_path: Directory of the persistent tier (None keeps audio in memory only)
+            disk_max_bytes: Disk budget for the persistent tier
+        """
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_bytes = 0
+
+        if disk_path:
+            try:
+                os.makedirs(disk_path, exist_ok=True)
+                self.disk_bytes = sum(size for _, size, _ in self._disk_files())
+            except OSError as e:
+                logger.warning(f"Audio cache directory {disk_path} unavailable: {e}")
+                self.disk_path = None
+
+        logger.info(
+            f"Initialized audio cache with max_bytes={max_bytes}, disk_path={self.disk_path}"
+        )
+
+    @staticmethod
+    def key(text: str, model: str, voice: str, output_format: str, speed: float) -> str:
+        """Key for the audio of a text spoken with the given voice settings."""
+        request = [normalize_text(text), model, voice, output_format, float(speed)]
+        return hashlib.sha1(json.dumps(request).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up audio.
+
+        Args:
+            key: Entry key (see key())
+
+        Returns:
+            The audio, or None if it isn't cached
+        """
+        audio_data = self._get_memory(key)
+        if audio_data is not None:
+            return audio_data
+        return self._promote(key, self._read_disk(key))
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """Look up audio without blocking the event loop on disk reads (see get())."""
+        audio_data = self._get_memory(key)
+        if audio_data is not None:
+            return audio_data
+        if not self.disk_path:
+            return self._promote(key, None)
+        return self._promote(key, await asyncio.to_thread(self._read_disk, key))
+
+    def put(self, key: str, audio_data: bytes) -> None:
+        """
+        Store audio in memory and, if configured, on disk.
+
+        Args:
+            key: Entry key (see key())
+            audio_data: Audio to store
+        """
+        if not audio_data:
+            return
+        with self._lock:
+            self._store(key, audio_data)
+        self._write_disk(key, audio_data)
+
+    async def aput(self, key: str, audio_data: bytes) -> None:
+        """Store audio without blocking the event loop on disk writes (see put())."""
+        if not audio_data:
+            return
+        with self._lock:
+            self._store(key, audio_data)
+        if self.disk_path:
+            await asyncio.to_thread(self._write_disk, key, audio_data)
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        """Look up an entry in memory, counting a hit."""
+        with self._lock:
+            audio_data = self._entries.get(key)
+            if audio_data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return audio_data
+
+    def _promote(self, key: str, audio_data: Optional[bytes]) -> Optional[bytes]:
+        """Count the result of a disk lookup and keep a hit in memory."""
+        with self._lock:
+            if audio_data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, audio_data)
+        return audio_data
+
+    def _store(self, key: str, audio_data: bytes) -> None:
+        """Add an entry to memory, evicting the least recently used ones."""
+        if len(audio_data) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= len(previous)
+        self._entries[key] = audio_data
+        self.bytes += len(audio_data)
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.disk_path, f"{key}.audio")
+
+    def _disk_files(self):
+        """(path, size, mtime) of every entry in the disk tier."""
+        for entry in os.scandir(self.disk_path):
+            if entry.name.endswith(".audio"):
+                stat = entry.stat()
+                yield entry.path, stat.st_size, stat.st_mtime
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        """Read an entry from the disk tier (None if it isn't there)."""
+        if not self.disk_path:
+            return None
+        path = self._file(key)
+        try:
+            with open(path, "rb") as f:
+                audio_data = f.read()
+            # Mark it as recently used for trimming
+            os.utime(path)
+        except OSError:
+            return None
+        return audio_data or None
+
+    def _write_disk(self, key: str, audio_data: bytes) -> None:
+        """Write an entry to the disk tier atomically, trimming it if over budget."""
+        if not self.disk_path or len(audio_data) > self.disk_max_bytes:
+            return
+        path = self._file(key)
+        try:
+            # An entry being replaced no longer counts towards the budget
+            previous = os.path.getsize(path)
+        except OSError:
+            previous = 0
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.disk_path, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio_data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write audio cache entry: {e}")
+            # Trimming only counts *.audio files, so don't leave this behind
+            if temp_path:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            return
+
+        with self._lock:
+            self.disk_bytes += len(audio_data) - previous
+            if self.disk_bytes <= self.disk_max_bytes:
+                return
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """Remove the least recently used files until the disk tier is under budget."""
+        try:
+            files = sorted(self._disk_files(), key=lambda f: f[2])
+        except OSError as e:
+            logger.warning(f"Could not trim audio cache: {e}")
+            return
+
+        # Other workers write to the same directory, so recount from the files
+        total = sum(size for _, size, _ in files)
+        target = self.disk_max_bytes * DISK_TRIM_TARGET
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        with self._lock:
+            self.disk_bytes = total
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with entries, bytes, max_bytes, hits, disk_hits, misses, hit_rate,
+            evictions, disk_path, disk_bytes and disk_max_bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "disk_path": self.disk_path,
+                "disk_bytes": self.disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes,
+            }
@@ -0,0 +1,365 @@
+"""
+Audio Ingestion
+
+Turns incoming WAV/PCM audio into the 16 kHz float32 samples Whisper expects,
+without round-tripping through a container decoder.
+"""
+
+import logging
+import struct
+from functools import lru_cache
+from math import gcd
+from typing import Dict, Any, Tuple, Union
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Whisper works on 16 kHz mono audio
+TARGET_SAMPLE_RATE = 16000
+
+# Resampling filter quality: zero crossings of the windowed sinc on each side
+FILTER_ZERO_CROSSINGS = 10
+FILTER_KAISER_BETA = 5.0
+
+# Output samples computed per vectorized block (bounds temporary memory)
+RESAMPLE_BLOCK_SIZE = 4096
+
+# WAV frames converted to float32 at a time while ingesting (bounds temporary memory)
+INGEST_BLOCK_FRAMES = 32768
+
+BufferLike = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+def parse_wav_header(data: BufferLike) -> Dict[str, Any]:
+    """
+    Parse a RIFF/WAVE header in place.
+
+    Args:
+        data: WAV file contents (any buffer, e.g. bytes or a uint8 array)
+
+    Returns:
+        Dict with sample_rate, channels, bits_per_sample, audio_format,
+        data_offset and data_size
+
+    Raises:
+        ValueError: If the buffer is not a PCM WAV file
+    """
+    view = memoryview(data).cast("B")
+    if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE buffer")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset : offset + 4])
+        (chunk_size,) = struct.unpack_from("<I", view, offset + 4)
+        body = offset + 8
+
+        if chunk_id == b"fmt ":
+            audio_format, channels, sample_rate, _, _, bits = struct.unpack_from(
+                "<HHIIHH", view, body
+            )
+            fmt = {
+                "audio_format": audio_format,
+                "channels": channels,
+                "sample_rate": sample_rate,
+                "bits_per_sample": bits,
+            }
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk found before fmt chunk")
+            # Streaming writers sometimes leave the size unset; clamp to the buffer
+            data_size = min(chunk_size, len(view) - body)
+            return {**fmt, "data_offset": body, "data_size": data_size}
+
+        # Chunks are word aligned
+        offset = body + chunk_size + (chunk_size & 1)
+
+    raise ValueError("WAV buffer has no data chunk")
+
+
+def pcm_view(data: BufferLike, header: Dict[str, Any]) -> np.ndarray:
+    """
+    View the PCM payload of a WAV buffer as samples without copying.
+
+    Args:
+        data: WAV file contents
+        header: Result of parse_wav_header
+
+    Returns:
+        Array of shape (frames, channels) sharing memory with ``data``
+    """
+    formats = {(1, 16): "<i2", (1, 32): "<i4", (3, 32): "<f4"}
+    dtype = formats.get((header["audio_format"], header["bits_per_sample"]))
+    if dtype is None:
+        raise ValueError(
+            f"Unsupported WAV encoding: format={header['audio_format']}, "
+            f"bits={header['bits_per_sample']}"
+        )
+
+    itemsize = np.dtype(dtype).itemsize
+    frame_size = itemsize * header["channels"]
+    count = (header["data_size"] // frame_size) * header["channels"]
+    samples = np.frombuffer(
+        data, dtype=dtype, count=count, offset=header["data_offset"]
+    )
+    return samples.reshape(-1, header["channels"])
+
+
+def to_float32_mono(samples: np.ndarray) -> np.ndarray:
+    """
+    Convert PCM samples of shape (frames, channels) to mono float32 in [-1, 1].
+
+    Args:
+        samples: Integer or float PCM samples
+
+    Returns:
+        1-D float32 array
+    """
+    if samples.ndim == 2 and samples.shape[1] > 1:
+        mono = samples.mean(axis=1, dtype=np.float32)
+    else:
+        mono = samples.reshape(-1).astype(np.float32)
+
+    if samples.dtype == np.int16:
+        mono *= 1.0 / 32768.0
+    elif samples.dtype == np.int32:
+        mono *= 1.0 / 2147483648.0
+    return mono
+
+
+@lru_cache(maxsize=16)
+def _filter_bank(up: int, down: int) -> Tuple[np.ndarray, int]:
+    """
+    Design the anti-aliasing low-pass filter and split it into polyphase branches.
+
+    Returns:
+        Tuple of (bank, half_len): bank has shape (up, taps_per_phase), with
+        each branch ordered oldest input sample first, and half_len is the
+        filter delay in upsampled samples
+    """
+    max_rate = max(up, down)
+    half_len = FILTER_ZERO_CROSSINGS * max_rate
+    n = np.arange(-half_len, half_len + 1)
+
+    # Kaiser windowed sinc with cutoff at the lower of the two Nyquist rates
+    cutoff = 1.0 / max_rate
+    h = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), FILTER_KAISER_BETA)
+    h *= up / h.sum()
+
+    taps = -(-len(h) // up)
+    padded = np.zeros(taps * up)
+    padded[: len(h)] = h
+    bank = padded.reshape(taps, up).T[:, ::-1].astype(np.float32)
+    return np.ascontiguousarray(bank), half_len
+
+
+class StreamResampler:
+    """
+    Vectorized polyphase resampler that can be fed audio in pieces.
+
+    Feeding a signal in several chunks produces exactly the same output as
+    resampling it in one go, so it is used both for whole utterances and for
+    frames streamed while the user speaks.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE):
+        """
+        Initialize the resampler.
+
+        Args:
+            source_rate: Sample rate of the input in Hz
+            target_rate: Sample rate of the output in Hz
+        """
+        divisor = gcd(source_rate, target_rate)
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        self.passthrough = self.up == self.down
+        if not self.passthrough:
+            self.bank, self.half_len = _filter_bank(self.up, self.down)
+            self.taps = self.bank.shape[1]
+
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0  # Input index of self._buffer[0]
+        self._received = 0
+        self._emitted = 0
+
+    def process(self, samples: np.ndarray, final: bool = False) -> np.ndarray:
+        """
+        Resample the next piece of input.
+
+        Args:
+            samples: Mono float32 input samples
+            final: Whether this is the last piece (flushes the filter tail)
+
+        Returns:
+            Output samples that can be computed so far
+        """
+        if self.passthrough:
+            return samples.astype(np.float32, copy=False)
+
+        self._buffer = (
+            np.concatenate([self._buffer, samples]) if self._buffer.size else samples
+        )
+        self._received += len(samples)
+
+        if final:
+            end = -(-self._received * self.up // self.down)
+        else:
+            # Only emit outputs whose newest input sample has already arrived
+            end = -(-(self._received * self.up - self.half_len) // self.down)
+        end = max(end, self._emitted)
+
+        output = self._apply(self._emitted, end - self._emitted)
+        self._emitted = end
+
+        # Keep just enough history for the next output's filter taps
+        keep_from = max(
+            self._buffer_start,
+            (self._emitted * self.down + self.half_len) // self.up - (self.taps - 1),
+        )
+        self._buffer = self._buffer[keep_from - self._buffer_start :]
+        self._buffer_start = keep_from
+        return output
+
+    def _apply(self, first_output: int, count: int) -> np.ndarray:
+        """
+        Compute ``count`` consecutive output samples from the buffered input.
+
+        Outputs whose filter window lies inside the buffer read it in place;
+        only the few at the edges, whose windows reach before the start or
+        past the end of the input, go through a small zero-padded copy.
+        """
+        result = np.empty(count, dtype=np.float32)
+        if not count:
+            return result
+
+        # Outputs [inner_start, inner_end) have their whole window in the buffer
+        start, length = self._buffer_start, len(self._buffer)
+        inner_start = -(-((start + self.taps - 1) * self.up - self.half_len) // self.down)
+        inner_end = ((start + length) * self.up - self.half_len - 1) // self.down + 1
+        inner_start = min(max(inner_start, first_output), first_output + count)
+        inner_end = min(max(inner_end, inner_start), first_output + count)
+
+        self._filter(self._buffer, start, inner_start, inner_end, first_output, result)
+        for edge_start, edge_end in (
+            (first_output, inner_start),
+            (inner_end, first_output + count),
+        ):
+            if edge_start < edge_end:
+                # Zero padding stands in for input before the start / after the end
+                lo = self._window_start(edge_start)
+                hi = self._window_start(edge_end - 1) + self.taps
+                padded = np.zeros(hi - lo, dtype=np.float32)
+                src_lo, src_hi = max(lo, start), min(hi, start + length)
+                if src_lo < src_hi:
+                    padded[src_lo - lo : src_hi - lo] = self._buffer[
+                        src_lo - start : src_hi - start
+                    ]
+                self._filter(padded, lo, edge_start, edge_end, first_output, result)
+        return result
+
+    def _window_start(self, output: int) -> int:
+        """Input index of the oldest sample in an output's filter window."""
+        return (output * self.down + self.half_len) // self.up - (self.taps - 1)
+
+    def _filter(
+        self,
+        signal: np.ndarray,
+        signal_start: int,
+        output_start: int,
+        output_end: int,
+        first_output: int,
+        result: np.ndarray,
+    ) -> None:
+        """
+        Compute outputs [output_start, output_end) from ``signal`` into ``result``.
+
+        Outputs that share a polyphase branch are ``up`` apart and read input
+        windows exactly ``down`` samples apart, so each branch is a strided
+        view of the input multiplied by one filter branch.
+        """
+        if output_start >= output_end:
+            return
+        windows = np.lib.stride_tricks.sliding_window_view(signal, self.taps)
+        targets_all = result[output_start - first_output : output_end - first_output]
+
+        for offset in range(min(self.up, output_end - output_start)):
+            output = output_start + offset
+            branch = self.bank[(output * self.down + self.half_len) % self.up]
+            first_window = self._window_start(output) - signal_start
+            targets = targets_all[offset :: self.up]
+
+            for block in range(0, len(targets), RESAMPLE_BLOCK_SIZE):
+                block_count = min(RESAMPLE_BLOCK_SIZE, len(targets) - block)
+                row = first_window + block * self.down
+                rows = windows[row : row + (block_count - 1) * self.down + 1 : self.down]
+                targets[block : block + block_count] = rows @ branch
+
+
+def resample(
+    samples: np.ndarray, source_rate: int, target_rate: int = TARGET_SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Resample a complete mono float32 signal with the polyphase filter.
+
+    Args:
+        samples: Mono float32 samples
+        source_rate: Sample rate of the input in Hz
+        target_rate: Sample rate of the output in Hz
+
+    Returns:
+        Resampled float32 samples
+    """
+    return StreamResampler(source_rate, target_rate).process(samples, final=True)
+
+
+def wav_to_float32(
+    data: BufferLike, target_rate: int = TARGET_SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Decode a PCM WAV buffer straight to model-ready samples.
+
+    The header is parsed in place and the payload is viewed without copying.
+    It is converted to float32 and resampled a block at a time straight into
+    the output array, so apart from the output only about one block of
+    temporary samples is held at once.
+
+    Args:
+        data: WAV file contents
+        target_rate: Output sample rate in Hz
+
+    Returns:
+        Mono float32 samples at ``target_rate``
+    """
+    header = parse_wav_header(data)
+    pcm = pcm_view(data, header)
+    resampler = StreamResampler(header["sample_rate"], target_rate)
+    if resampler.passthrough:
+        return to_float32_mono(pcm)
+
+    output = np.empty(-(-len(pcm) * resampler.up // resampler.down), dtype=np.float32)
+    filled = 0
+    for start in range(0, len(pcm) + 1, INGEST_BLOCK_FRAMES):
+        block = pcm[start : start + INGEST_BLOCK_FRAMES]
+        final = start + INGEST_BLOCK_FRAMES > len(pcm)
+        piece = resampler.process(to_float32_mono(block), final=final)
+        output[filled : filled + len(piece)] = piece
+        filled += len(piece)
+    return output
+
+
+def pcm16_to_float32(pcm: BufferLike) -> np.ndarray:
+    """
+    Convert raw little-endian 16-bit mono PCM to float32 in [-1, 1].
+
+    Args:
+        pcm: Raw PCM bytes
+
+    Returns:
+        1-D float32 array
+    """
+    return to_float32_mono(np.frombuffer(pcm, dtype="<i2"))
@@ -0,0 +1,678 @@
+"""
+Conversation Session
+
+Per-connection conversation state: message history, pending vision context
+and the interrupt flag. The LLM client is shared by every connection and
+stays stateless; each WebSocket connection owns one session.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional, AsyncGenerator, AsyncIterator
+
+from .llm import LLMClient
+from .token_counter import TokenCounter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+USER_CONTEXT_PREFIX = "USER CONTEXT"
+VISION_CONTEXT_PREFIX = "[VISION CONTEXT]"
+
+SUMMARY_PREFIX = "[CONVERSATION SUMMARY]"
+
+# Once over budget, old turns are dropped until the prompt is this fraction of
+# the budget, so the prompt prefix then stays the same for several turns
+EVICTION_TARGET = 0.75
+
+SUMMARY_INSTRUCTION = (
+    "Summarize the conversation below between a user and a voice assistant. "
+    "Keep names, facts, decisions, open questions and anything the user asked "
+    "the assistant to remember. Write plain sentences, no lists, under {words} words."
+)
+
+
+class ConversationSession:
+    """
+    Conversation state for a single connection.
+
+    Prompts are laid out for backends that reuse their KV cache when a prompt
+    starts with the same messages as the previous one (llama.cpp, LM Studio):
+    the system prompt comes first, then the history, which is only ever
+    appended to, and only then volatile context such as the user's name. Old
+    turns are dropped in blocks rather than one per request, so the prefix
+    stays the same between turns.
+
+    The history list is copy-on-write once it has been handed out with
+    `snapshot()`, so callers such as session saving can use it without
+    copying and later turns never change what they were given.
+
+    With a token budget, each request carries as much of the history as
+    fits: oversized messages are compacted and the oldest turns are left out.
+    The history itself keeps every message up to max_messages.
+
+    With a compaction threshold, older exchanges are additionally replaced in
+    prompts by a rolling summary, written by the LLM in the background
+    between turns. Only prompts change; the verbatim history is what gets
+    saved and loaded.
+    """
+
+    def __init__(
+        self,
+        max_messages: int = 200,
+        token_counter: Optional[TokenCounter] = None,
+        token_budget: int = 0,
+        max_message_tokens: int = 0,
+        compaction_threshold: int = 0,
+        compaction_keep_messages: int = 6,
+        summary_max_tokens: int = 256,
+    ):
+        """
+        Initialize the session.
+
+        Args:
+            max_messages: Maximum messages kept in history (a leading system message is always kept)
+            token_counter: Shared token counter (a length estimate is used if None)
+            token_budget: Maximum prompt tokens per request, excluding the reply (0 disables)
+            max_message_tokens: Longer history messages are shortened in requests (0 disables)
+            compaction_threshold: Summarize older exchanges once the unsummarized
+                history exceeds this many tokens (0 disables)
+            compaction_keep_messages: Latest messages always sent verbatim
+            summary_max_tokens: Maximum length of the summary
+        """
+        self.max_messages = max_messages
+        self.token_counter = token_counter or TokenCounter()
+        self.token_budget = token_budget
+        self.max_message_tokens = max_message_tokens
+        self.compaction_threshold = compaction_threshold
+        self.compaction_keep_messages = compaction_keep_messages
+        self.summary_max_tokens = summary_max_tokens
+
+        self._history: List[Dict[str, str]] = []
+        self._shared = False
+
+        # History messages before this index are left out of prompts (except
+        # pinned system messages); it only moves forward, in blocks
+        self._prompt_start = 0
+
+        # Summary sent instead of the history messages before _summary_end
+        self.summary: Optional[str] = None
+        self._summary_end = 0
+        self._compaction_task: Optional[asyncio.Task] = None
+        self.compactions = 0
+
+        # Messages trimmed by max_messages so far, and history replacements,
+        # so a summary finishing late can tell what it covers
+        self._dropped = 0
+        self._generation = 0
+
+        # Sent after the history so changing it doesn't invalidate cached prefixes
+        self.user_context: Optional[str] = None
+
+        # Latest image description, used by the next spoken turn
+        self.vision_context: Optional[str] = None
+
+        # Set while playback of the current response should stop
+        self.interrupt = asyncio.Event()
+
+        # What the budget did to the most recent request
+        self.last_prompt_tokens = 0
+        self.last_evicted_messages = 0
+        self.last_compacted_messages = 0
+
+        # Prefix reuse between consecutive requests
+        self._last_prompt: List[Dict[str, str]] = []
+        self.last_prefix_reuse = 0.0
+        self.prefix_reuse_total = 0.0
+        self.requests = 0
+
+    @property
+    def history(self) -> List[Dict[str, str]]:
+        """The conversation history (read-only; use the methods to change it)."""
+        return self._history
+
+    def __len__(self) -> int:
+        return len(self._history)
+
+    def snapshot(self) -> List[Dict[str, str]]:
+        """
+        Get the history without copying it.
+
+        The returned list is never modified afterwards; the next change to
+        the session works on a fresh list instead.
+        """
+        self._shared = True
+        return self._history
+
+    def _writable(self) -> List[Dict[str, str]]:
+        """Get a history list that may be modified in place."""
+        if self._shared:
+            self._history = list(self._history)
+            self._shared = False
+        return self._history
+
+    def add_message(self, role: str, content: str) -> None:
+        """
+        Add a message to the conversation history.
+
+        Args:
+            role: Message role ('system', 'user', or 'assistant')
+            content: Message content
+        """
+        history = self._writable()
+        history.append({"role": role, "content": content})
+
+        if len(history) > self.max_messages:
+            excess = len(history) - self.max_messages
+            # Always keep the system message if it exists
+            if history[0]["role"] == "system":
+                del history[1 : excess + 1]
+            else:
+                del history[:excess]
+            self._prompt_start = max(0, self._prompt_start - excess)
+            self._summary_end = max(0, self._summary_end - excess)
+            self._dropped += excess
+
+    def clear_history(self, keep_system_prompt: bool = True) -> None:
+        """
+        Clear the conversation history.
+
+        Args:
+            keep_system_prompt: Whether to keep a leading system message
+        """
+        if keep_system_prompt and self._history and self._history[0]["role"] == "system":
+            self._history = [self._history[0]]
+        else:
+            self._history = []
+        self._shared = False
+        self._reset_prompt_state()
+
+        logger.info("Cleared conversation history")
+
+    def replace_history(self, messages: List[Dict[str, str]]) -> None:
+        """
+        Replace the history, e.g. with a loaded session.
+
+        Args:
+            messages: Messages to use from now on (the list is taken over, not copied)
+        """
+        self._history = messages
+        self._shared = True
+        self._reset_prompt_state()
+
+    def _reset_prompt_state(self) -> None:
+        """Forget eviction and summary state after the history was replaced."""
+        self._prompt_start = 0
+        self.summary = None
+        self._summary_end = 0
+        self._generation += 1
+
+    def set_user_context(self, content: Optional[str]) -> None:
+        """
+        Set the user context sent with every request.
+
+        It is placed after the history, right before the user's message, so
+        updating it doesn't change the cached part of the prompt.
+
+        Args:
+            content: Context text, starting with USER CONTEXT (None removes it)
+        """
+        self.user_context = content
+
+    def add_vision_context(self, vision_context: str) -> None:
+        """
+        Add an image description to the history as a system message.
+
+        It is appended like any other message, so it sits right before the
+        question about the image and earlier messages keep their position.
+
+        Args:
+            vision_context: Description of the image
+        """
+        self.add_message("system", f"{VISION_CONTEXT_PREFIX}: {vision_context}")
+
+    def build_messages(
+        self,
+        user_input: str,
+        system_prompt: Optional[str] = None,
+        recent: Optional[int] = None,
+        preview: bool = False,
+    ) -> List[Dict[str, str]]:
+        """
+        Build the messages for one request without changing the history.
+
+        Args:
+            user_input: User's text input (appended last when not empty)
+            system_prompt: Optional system prompt placed first
+            recent: Only include a leading system message and the last `recent`
+                history messages (None includes what fits the budget, 0 none)
+            preview: Only look at the messages the request would be sent with
+                (e.g. to key a prepared reply); the turns left out to fit the
+                budget and the prompt statistics are not updated
+
+        Returns:
+            Messages in OpenAI chat format
+        """
+        head = []
+        if system_prompt:
+            head.append({"role": "system", "content": system_prompt})
+        if recent is None and self.summary:
+            head.append({"role": "system", "content": f"{SUMMARY_PREFIX}: {self.summary}"})
+
+        tail = []
+        if self.user_context:
+            tail.append({"role": "system", "content": self.user_context})
+        if user_input.strip():
+            tail.append({"role": "user", "content": user_input})
+
+        if recent is None:
+            reserved_tokens = self.token_counter.count_messages(head + tail)
+            history = self._fit_to_budget(reserved_tokens, preview)
+        elif recent > 0 and self._history:
+            history = self._history
+            if history[0]["role"] == "system":
+                history = history[:1] + history[1:][-recent:]
+            else:
+                history = history[-recent:]
+            history = self._compact(history, preview)
+        else:
+            history = []
+
+        return head + history + tail
+
+    @staticmethod
+    def _is_pinned(message: Dict[str, str]) -> bool:
+        """System messages other than vision contexts are never left out."""
+        return message["role"] == "system" and not message["content"].startswith(
+            VISION_CONTEXT_PREFIX
+        )
+
+    def _compact(
+        self, history: List[Dict[str, str]], preview: bool = False
+    ) -> List[Dict[str, str]]:
+        """Shorten messages over max_message_tokens (the same way every time)."""
+        if not self.max_message_tokens:
+            if not preview:
+                self.last_compacted_messages = 0
+            return history
+
+        counter = self.token_counter
+        compacted = []
+        shortened = 0
+        for message in history:
+            content = message.get("content", "")
+            if counter.count_text(content) > self.max_message_tokens:
+                message = dict(
+                    message, content=counter.truncate(content, self.max_message_tokens)
+                )
+                shortened += 1
+            compacted.append(message)
+        if not preview:
+            self.last_compacted_messages = shortened
+        return compacted
+
+    def _fit_to_budget(
+        self, reserved_tokens: int, preview: bool = False
+    ) -> List[Dict[str, str]]:
+        """
+        Select the history sent with a request.
+
+        Messages over max_message_tokens are shortened. When the prompt goes
+        over the token budget, the oldest turns (a user message with the
+        replies that follow it, and vision contexts) are left out until it is
+        back to EVICTION_TARGET of the budget. Later requests keep leaving out
+        the same turns, so the prompt prefix stays the same until the budget
+        is reached again. Messages covered by the summary are left out as well.
+        Other system messages are always kept.
+
+        Args:
+            reserved_tokens: Tokens used by the system prompt, user context and user input
+            preview: Don't record the turns left out or the prompt statistics
+
+        Returns:
+            The history to send (the session history is not changed)
+        """
+        history = self._compact(self._history, preview)
+        counts = [self.token_counter.count_message(m) for m in history]
+
+        start = min(max(self._prompt_start, self._summary_end), len(history))
+        total = reserved_tokens + sum(
+            counts[i] for i in range(start) if self._is_pinned(history[i])
+        )
+        total += sum(counts[start:])
+
+        if self.token_budget and total > self.token_budget:
+            target = self.token_budget * EVICTION_TARGET
+            while start < len(history):
+                # Stop on a turn boundary so no reply is sent without its question
+                if total <= target and history[start]["role"] != "assistant":
+                    break
+                if not self._is_pinned(history[start]):
+                    total -= counts[start]
+                start += 1
+
+            logger.info(
+                f"Leaving {start} old messages out of the prompt to fit "
+                f"{self.token_budget} tokens"
+            )
+            if total > self.token_budget:
+                logger.warning(
+                    f"Prompt needs {total} tokens even without old turns "
+                    f"(budget {self.token_budget})"
+                )
+            if not preview:
+                self._prompt_start = start
+
+        included = [
+            m for i, m in enumerate(history) if i >= start or self._is_pinned(m)
+        ]
+        if not preview:
+            self.last_evicted_messages = len(history) - len(included)
+            self.last_prompt_tokens = total
+        return included
+
+    def _track_prefix_reuse(self, messages: List[Dict[str, str]]) -> float:
+        """
+        Measure how much of a prompt repeats the start of the previous one.
+
+        Returns:
+            Share of the prompt's tokens in the leading messages it has in common
+            with the previous request (what a prefix cache can skip)
+        """
+        counter = self.token_counter
+        shared = 0
+        for previous, message in zip(self._last_prompt, messages):
+            if previous != message:
+                break
+            shared += counter.count_message(message)
+
+        total = counter.count_messages(messages)
+        reuse = shared / total if total else 0.0
+
+        self._last_prompt = messages
+        self.last_prefix_reuse = reuse
+        self.prefix_reuse_total += reuse
+        self.requests += 1
+        logger.info(f"Prompt prefix reuse: {reuse:.0%} of {total} tokens")
+        return reuse
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get history, prompt budget and prefix reuse statistics.
+
+        Returns:
+            Dict with history_length, token_budget, what the budget did to the
+            last request and the prefix reuse of the last and average request
+        """
+        return {
+            "history_length": len(self._history),
+            "history_tokens": self.token_counter.count_messages(self._history),
+            "token_budget": self.token_budget,
+            "max_message_tokens": self.max_message_tokens,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "last_evicted_messages": self.last_evicted_messages,
+            "last_compacted_messages": self.last_compacted_messages,
+            "last_prefix_reuse": self.last_prefix_reuse,
+            "avg_prefix_reuse": (
+                self.prefix_reuse_total / self.requests if self.requests else 0.0
+            ),
+            "summarized_messages": self._summary_end,
+            "summary_tokens": self.token_counter.count_text(self.summary or ""),
+            "compactions": self.compactions,
+        }
+
+    def _schedule_compaction(self, llm_client: LLMClient) -> None:
+        """Start summarizing older exchanges in the background if the history is long."""
+        if not self.compaction_threshold:
+            return
+        if self._compaction_task and not self._compaction_task.done():
+            return
+
+        unsummarized = self.token_counter.count_messages(
+            self._history[self._summary_end :]
+        )
+        if unsummarized <= self.compaction_threshold:
+            return
+
+        # Summarize up to the verbatim tail, ending on a turn boundary
+        end = len(self._history) - max(0, self.compaction_keep_messages)
+        while (
+            self._summary_end < end < len(self._history)
+            and self._history[end]["role"] == "assistant"
+        ):
+            end -= 1
+        if end <= self._summary_end:
+            return
+
+        lines = []
+        if self.summary:
+            lines.append(f"Earlier summary: {self.summary}")
+        for message in self._history[self._summary_end : end]:
+            if not self._is_pinned(message):
+                lines.append(f"{message['role']}: {message['content']}")
+
+        self._compaction_task = asyncio.create_task(
+            self._compact_history(llm_client, "\n".join(lines), end)
+        )
+
+    async def _compact_history(
+        self, llm_client: LLMClient, transcript: str, end: int
+    ) -> None:
+        """
+        Fold older exchanges into the rolling summary.
+
+        Runs between turns in the LLM client's background slot, so it waits
+        for a gap in interactive requests first. The result is dropped if the
+        history was cleared or replaced in the meantime.
+
+        Args:
+            llm_client: Shared LLM client
+            transcript: Earlier summary and the messages to fold into it
+            end: History index the new summary covers up to
+        """
+        generation, dropped = self._generation, self._dropped
+        start_time = time.time()
+
+        words = int(self.summary_max_tokens * 0.6)
+        messages = [
+            {"role": "system", "content": SUMMARY_INSTRUCTION.format(words=words)},
+            {"role": "user", "content": transcript},
+        ]
+
+        # Low priority: let interactive requests go first
+        async with llm_client.background_slot():
+            response = await llm_client.get_response(
+                messages, temperature=0.2, max_tokens=self.summary_max_tokens
+            )
+
+        if response.get("error") or not response.get("text", "").strip():
+            logger.warning(f"Conversation summary failed: {response.get('error')}")
+            return
+        if generation != self._generation:
+            logger.info("History changed while summarizing, discarding summary")
+            return
+
+        self.summary = response["text"].strip()
+        self._summary_end = max(0, end - (self._dropped - dropped))
+        self.compactions += 1
+        logger.info(
+            f"Summarized {self._summary_end} messages into "
+            f"{self.token_counter.count_text(self.summary)} tokens "
+            f"in {time.time() - start_time:.2f}s"
+        )
+
+    def close(self) -> None:
+        """Stop background work when the connection ends."""
+        if self._compaction_task and not self._compaction_task.done():
+            self._compaction_task.cancel()
+
+    def _prepare_request(
+        self, user_input: str, system_prompt: Optional[str], recent: Optional[int]
+    ) -> Dict[str, Any]:
+        """Build the request arguments for the LLM client."""
+        messages = self.build_messages(user_input, system_prompt, recent)
+        self._track_prefix_reuse(messages)
+
+        # Ask the backend to keep the system prompt when it has to shift its
+        # context. Only with a tokenizer: an estimate could keep part of the
+        # history or cut the system prompt short
+        n_keep = None
+        if system_prompt and self.token_counter.exact:
+            n_keep = self.token_counter.count_message(messages[0])
+        return {"messages": messages, "n_keep": n_keep}
+
+    def _record_reply(
+        self, user_input: str, response: Dict[str, Any], add_to_history: bool
+    ) -> None:
+        """Record one exchange, recovering from a rejected (HTTP 400) context."""
+        if not add_to_history:
+            return
+
+        if user_input.strip():
+            self.add_message("user", user_input)
+        if response.get("text"):
+            self.add_message("assistant", response["text"])
+
+        # If we get a 400 Bad Request, the context might be corrupt
+        if response.get("status_code") == 400:
+            logger.warning("Received 400 error, clearing conversation history to recover")
+            self.clear_history(keep_system_prompt=True)
+
+    def revise_reply(self, text: str) -> None:
+        """
+        Replace the reply recorded for the latest exchange, e.g. with the part
+        of it that was actually spoken.
+
+        Args:
+            text: The reply as it should be remembered
+        """
+        history = self._writable()
+        if history and history[-1]["role"] == "assistant":
+            history[-1] = {"role": "assistant", "content": text}
+        else:
+            self.add_message("assistant", text)
+
+    def record_stream(
+        self, user_input: str, text_stream: AsyncIterator[str]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Add an exchange whose reply comes from a stream started elsewhere
+        (e.g. a committed speculative response).
+
+        The user's message is added right away and the reply as it is
+        streamed, like stream_reply does.
+
+        Args:
+            user_input: User's text input
+            text_stream: Text chunks of the reply
+
+        Returns:
+            The reply's text chunks
+        """
+        if user_input.strip():
+            self.add_message("user", user_input)
+        return self._record_streamed_reply(text_stream)
+
+    async def _record_streamed_reply(
+        self, text_stream: AsyncIterator[str]
+    ) -> AsyncGenerator[str, None]:
+        """Pass a reply stream through and add what was streamed to the history."""
+        streamed: List[str] = []
+        try:
+            async for text_chunk in text_stream:
+                streamed.append(text_chunk)
+                yield text_chunk
+        finally:
+            await text_stream.aclose()
+            if "".join(streamed).strip():
+                self.add_message("assistant", "".join(streamed))
+
+    async def get_reply(
+        self,
+        llm_client: LLMClient,
+        user_input: str,
+        system_prompt: Optional[str] = None,
+        add_to_history: bool = True,
+        temperature: Optional[float] = None,
+        recent: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get a complete reply for this session.
+
+        Args:
+            llm_client: Shared LLM client
+            user_input: User's text input
+            system_prompt: Optional system prompt to set context
+            add_to_history: Whether to add this exchange to the history
+            temperature: Optional temperature override (0.0 to 1.0)
+            recent: Limit the history sent with the request (see build_messages)
+            max_tokens: Optional override of the maximum tokens to generate
+
+        Returns:
+            Dictionary containing the LLM response and metadata
+        """
+        request = self._prepare_request(user_input, system_prompt, recent)
+        response = await llm_client.get_response(
+            temperature=temperature, max_tokens=max_tokens, **request
+        )
+        self._record_reply(user_input, response, add_to_history)
+        self._schedule_compaction(llm_client)
+        return response
+
+    async def stream_reply(
+        self,
+        llm_client: LLMClient,
+        user_input: str,
+        system_prompt: Optional[str] = None,
+        add_to_history: bool = True,
+        temperature: Optional[float] = None,
+        recent: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream a reply for this session.
+
+        The user's message is added to the history before the request starts
+        and the reply once the stream completes. If the stream is abandoned
+        part way through (barge-in, cancellation), the part of the reply
+        already streamed is recorded instead, so the next turn still knows
+        what was said.
+
+        Args:
+            llm_client: Shared LLM client
+            user_input: User's text input
+            system_prompt: Optional system prompt to set context
+            add_to_history: Whether to add this exchange to the history
+            temperature: Optional temperature override (0.0 to 1.0)
+            recent: Limit the history sent with the request (see build_messages)
+            max_tokens: Optional override of the maximum tokens to generate
+
+        Yields:
+            Text chunks from the LLM response as they are generated
+        """
+        request = self._prepare_request(user_input, system_prompt, recent)
+        if add_to_history and user_input.strip():
+            self.add_message("user", user_input)
+
+        result: Dict[str, Any] = {}
+        streamed: List[str] = []
+        completed = False
+        text_stream = llm_client.stream_response(
+            temperature=temperature, result=result, max_tokens=max_tokens, **request
+        )
+        try:
+            async for text_chunk in text_stream:
+                streamed.append(text_chunk)
+                yield text_chunk
+            completed = True
+        finally:
+            # Close the upstream request right away if we stop early
+            await text_stream.aclose()
+            if completed:
+                self._record_reply("", result, add_to_history)
+            elif add_to_history and "".join(streamed).strip():
+                self.add_message("assistant", "".join(streamed))
+        self._schedule_compaction(llm_client)
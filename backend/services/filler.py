@@ -0,0 +1,96 @@
+"""
+Filler Audio
+
+A small library of short acknowledgement clips ("Mm-hm.", "Let me think.")
+synthesized once per voice, played while the LLM has not produced its first
+token yet.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .tts import TTSClient
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PHRASES = ["Mm-hm.", "Let me think.", "Hmm, okay.", "Right."]
+
+
+class FillerLibrary:
+    """
+    Pre-synthesized filler clips for each voice.
+
+    Clips are synthesized ahead of time, so picking one never calls a
+    backend; until they are ready no filler is played.
+    """
+
+    def __init__(self, tts_client: TTSClient, phrases: Optional[List[str]] = None):
+        """
+        Initialize the filler library.
+
+        Args:
+            tts_client: Shared TTS client used to synthesize the clips
+            phrases: Filler phrases (defaults to a few short acknowledgements)
+        """
+        self.tts_client = tts_client
+        self.phrases = phrases or DEFAULT_PHRASES
+
+        self._clips: Dict[Tuple, List[Tuple[str, bytes]]] = {}
+        self._next = 0
+        self.played = 0
+
+        logger.info(f"Initialized filler library with {len(self.phrases)} phrases")
+
+    def _voice(self) -> Tuple:
+        """Voice settings the clips are synthesized with."""
+        tts = self.tts_client
+        return (tts.model, tts.voice, tts.output_format, tts.speed)
+
+    async def prepare(self) -> None:
+        """Synthesize the clips for the current voice (once)."""
+        voice = self._voice()
+        if voice in self._clips:
+            return
+
+        clips = []
+        for phrase in self.phrases:
+            audio_data = await self.tts_client.async_text_to_speech(phrase)
+            if audio_data:
+                clips.append((phrase, audio_data))
+            else:
+                logger.warning(f"Could not synthesize filler phrase {phrase!r}")
+
+        self._clips[voice] = clips
+        logger.info(f"Prepared {len(clips)} filler clips for voice {voice[1]}")
+
+    def pick(self) -> Optional[Tuple[str, bytes]]:
+        """
+        Pick the next clip for the current voice.
+
+        Returns:
+            Tuple of phrase and audio, or None if no clips are ready
+        """
+        clips = self._clips.get(self._voice())
+        if not clips:
+            return None
+
+        # Rotate through the clips so the same one isn't heard twice in a row
+        clip = clips[self._next % len(clips)]
+        self._next += 1
+        self.played += 1
+        return clip
+
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the current configuration.
+
+        Returns:
+            Dict containing the current configuration
+        """
+        return {
+            "phrases": self.phrases,
+            "ready": bool(self._clips.get(self._voice())),
+            "played": self.played,
+        }
@@ -4,22 +4,68 @@ LLM Service
 Handles communication with the local LLM API endpoint.
 """
 
+import asyncio
+import contextvars
 import json
-import requests
 import logging
-from typing import Dict, Any, List, Optional, Generator
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Any, List, Optional, AsyncGenerator, AsyncIterator
+
+import httpx
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# HTTP/2 needs the optional h2 package; without it the client speaks HTTP/1.1
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Weight of the latest stream in the typical reply length and speed
+STREAM_SMOOTHING = 0.2
+
+# Background work starts once no interactive request has started for this
+# long, but is never deferred for longer than the maximum
+BACKGROUND_GAP_SECONDS = 0.5
+BACKGROUND_MAX_DEFERRAL_SECONDS = 10.0
+
+# Set while a task holds the background slot, so its requests don't count
+# as interactive traffic
+_in_background: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "in_background", default=False
+)
+
+# Set while a task closes a stream whose remaining reply isn't wanted (e.g. an
+# answer stopped at its sentence limit), so it isn't counted as an abort
+_stopping_early: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "stopping_early", default=False
+)
+
+
+@contextmanager
+def stopping_early():
+    """Count streams closed in this block as planned stops, not aborts."""
+    token = _stopping_early.set(True)
+    try:
+        yield
+    finally:
+        _stopping_early.reset(token)
+
 
 class LLMClient:
     """
     Client for communicating with a local LLM API.
 
     This class handles requests to a locally hosted LLM API that follows
-    the OpenAI API format.
+    the OpenAI API format. Requests go through one pooled async HTTP client,
+    so connections are kept alive between turns and many sessions can
+    stream concurrently without blocking the event loop. The client holds
+    no conversation state; callers pass the full message list.
     """
 
     def __init__(
@@ -29,6 +75,11 @@ class LLMClient:
         temperature: float = 0.7,
         max_tokens: int = 2048,
         timeout: int = 60,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        cache_prompt: bool = False,
     ):
         """
         Initialize the LLM client.
@@ -39,93 +90,232 @@ class LLMClient:
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
             timeout: Request timeout in seconds
+            max_connections: Maximum concurrent connections to the LLM API
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Whether to use HTTP/2 when the h2 package is installed
+            cache_prompt: Send llama.cpp prompt cache hints (cache_prompt, n_keep)
         """
         self.api_endpoint = api_endpoint
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.cache_prompt = cache_prompt
+
+        # Pooled HTTP client, created on first use inside the event loop
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Requests in flight across all sessions (conversation state lives
+        # in each connection's ConversationSession)
+        self.active_requests = 0
+
+        # Low-priority work (summaries, prepared replies) runs one at a time,
+        # in the gaps between interactive requests
+        self._background_slot = asyncio.Semaphore(1)
+        self._last_interactive_start = 0.0
+
+        # Typical reply length and speed, used to estimate what aborted streams saved
+        self.avg_stream_tokens: Optional[float] = None
+        self.avg_tokens_per_second: Optional[float] = None
+        self.aborted_streams = 0
+        self.stopped_streams = 0
+        self.saved_tokens = 0
+        self.saved_seconds = 0.0
+
+        logger.info(
+            f"Initialized LLM Client with endpoint={api_endpoint}, "
+            f"max_connections={max_connections}, http2={self.http2}"
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared, connection-pooling HTTP client."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+        return self._client
 
-        # State tracking
-        self.is_processing = False
-        self.conversation_history = []
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-        logger.info(f"Initialized LLM Client with endpoint={api_endpoint}")
+    @property
+    def is_processing(self) -> bool:
+        """Whether any request is in flight."""
+        return self.active_requests > 0
 
-    def add_to_history(self, role: str, content: str) -> None:
+    @asynccontextmanager
+    async def background_slot(self) -> AsyncIterator[None]:
         """
-        Add a message to the conversation history.
+        Hold the background slot for low-priority work.
 
-        Args:
-            role: Message role ('system', 'user', or 'assistant')
-            content: Message content
+        One holder at a time, so waiting work doesn't all start at once. The
+        slot is granted once no interactive request has started for
+        BACKGROUND_GAP_SECONDS, or after BACKGROUND_MAX_DEFERRAL_SECONDS at
+        the latest, so steady traffic can't starve it. Requests made while
+        holding it don't count as interactive.
         """
-        self.conversation_history.append({"role": role, "content": content})
-
-        # Allow deeper history for models with large context windows
-        if len(self.conversation_history) > 50:
-            # Always keep the system message if it exists
-            if self.conversation_history[0]["role"] == "system":
-                self.conversation_history = [
-                    self.conversation_history[0]
-                ] + self.conversation_history[-49:]
-            else:
-                self.conversation_history = self.conversation_history[-50:]
+        async with self._background_slot:
+            deadline = time.monotonic() + BACKGROUND_MAX_DEFERRAL_SECONDS
+            while True:
+                now = time.monotonic()
+                quiet = now - self._last_interactive_start
+                if quiet >= BACKGROUND_GAP_SECONDS or now >= deadline:
+                    break
+                await asyncio.sleep(
+                    min(BACKGROUND_GAP_SECONDS - quiet, deadline - now)
+                )
+
+            token = _in_background.set(True)
+            try:
+                yield
+            finally:
+                _in_background.reset(token)
+
+    def _start_request(self) -> None:
+        """Count a request in flight, noting when interactive traffic last arrived."""
+        self.active_requests += 1
+        if not _in_background.get():
+            self._last_interactive_start = time.monotonic()
+
+    def _build_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        stream: bool,
+        n_keep: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the chat completion payload.
+
+        With cache_prompt, llama.cpp compatible servers are asked to reuse the
+        KV cache of the previous prompt's shared prefix, and to keep the first
+        n_keep tokens (the system prompt) if the context has to be shifted.
+
+        Returns:
+            Request payload for the LLM API
+        """
+        payload = {
+            "model": self.model if self.model != "default" else None,
+            "messages": messages,
+            "temperature": (temperature if temperature is not None else self.temperature),
+            "max_tokens": max_tokens or self.max_tokens,
+            "stream": True if stream else None,
+            "cache_prompt": True if self.cache_prompt else None,
+            "n_keep": n_keep if self.cache_prompt else None,
+        }
+
+        # Remove None values
+        return {k: v for k, v in payload.items() if v is not None}
+
+    def _record_stream(self, tokens: int, generation_time: float) -> None:
+        """Update the typical reply length and speed from a completed stream."""
+        if tokens <= 0:
+            return
+        rate = tokens / generation_time if generation_time > 0 else None
+        if self.avg_stream_tokens is None:
+            self.avg_stream_tokens = float(tokens)
+            self.avg_tokens_per_second = rate
+        else:
+            self.avg_stream_tokens += STREAM_SMOOTHING * (tokens - self.avg_stream_tokens)
+            if rate and self.avg_tokens_per_second:
+                self.avg_tokens_per_second += STREAM_SMOOTHING * (
+                    rate - self.avg_tokens_per_second
+                )
+
+    def _record_abort(self, tokens: int, elapsed: float) -> None:
+        """
+        Log a stream closed before the reply was complete.
+
+        Closing the connection makes llama.cpp compatible servers stop
+        generating; the tokens and time saved are estimated from the typical
+        reply length and generation speed. Streams closed in a stopping_early()
+        block are counted as planned stops instead.
+        """
+        if _stopping_early.get():
+            self.stopped_streams += 1
+            logger.info(
+                f"Stopped LLM stream early after {elapsed:.2f}s and {tokens} tokens"
+            )
+            return
+
+        self.aborted_streams += 1
+        if self.avg_stream_tokens is None or not self.avg_tokens_per_second:
+            logger.info(
+                f"Aborted LLM stream after {elapsed:.2f}s and {tokens} tokens"
+            )
+            return
+
+        saved_tokens = max(0, round(self.avg_stream_tokens) - tokens)
+        saved_seconds = saved_tokens / self.avg_tokens_per_second
+        self.saved_tokens += saved_tokens
+        self.saved_seconds += saved_seconds
+        logger.info(
+            f"Aborted LLM stream after {elapsed:.2f}s and {tokens} tokens, "
+            f"saving about {saved_tokens} tokens and {saved_seconds:.2f}s of generation"
+        )
+
+    def _handle_request_error(self, e: Exception) -> Dict[str, Any]:
+        """
+        Log a failed request and build the apology spoken to the user.
+
+        Returns:
+            Dict with the error response text, the error and the HTTP status code if any
+        """
+        status_code = None
+        if isinstance(e, httpx.HTTPError):
+            logger.error(f"LLM API request error: {e}")
+            error_response = f"I'm sorry, I encountered a problem connecting to my language model. {str(e)}"
+            if isinstance(e, httpx.HTTPStatusError):
+                status_code = e.response.status_code
+        else:
+            logger.error(f"LLM processing error: {e}")
+            error_response = (
+                "I'm sorry, I encountered an unexpected error. Please try again."
+            )
+        return {"text": error_response, "error": str(e), "status_code": status_code}
 
-    def get_response(
+    async def get_response(
         self,
-        user_input: str,
-        system_prompt: Optional[str] = None,
-        add_to_history: bool = True,
+        messages: List[Dict[str, str]],
         temperature: Optional[float] = None,
+        n_keep: Optional[int] = None,
+        max_tokens: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
-        Get a response from the LLM for the given user input.
+        Get a complete response from the LLM.
 
         Args:
-            user_input: User's text input
-            system_prompt: Optional system prompt to set context
-            add_to_history: Whether to add this exchange to conversation history
+            messages: Messages in OpenAI chat format, including any history
             temperature: Optional temperature override (0.0 to 1.0)
+            n_keep: Leading prompt tokens to keep on a context shift (with cache_prompt)
+            max_tokens: Optional override of the maximum tokens to generate
 
         Returns:
             Dictionary containing the LLM response and metadata
         """
-        self.is_processing = True
-        start_time = logging.Formatter.converter()
+        self._start_request()
+        start_time = time.time()
 
         try:
-            # Prepare messages
-            messages = []
-
-            # Add system prompt if provided and not already in history
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-
-            # Add user input to history if it's not empty and add_to_history is True
-            if user_input.strip() and add_to_history:
-                self.add_to_history("user", user_input)
-
-            # Add conversation history (which now includes the user input if add_to_history=True)
-            messages.extend(self.conversation_history)
-
-            # Only add user input directly if not adding to history
-            # This ensures special cases (greetings/followups) work while preventing duplication for normal speech
-            if user_input.strip() and not add_to_history:
-                messages.append({"role": "user", "content": user_input})
-
-            # Prepare request payload with custom temperature if provided
-            payload = {
-                "model": self.model if self.model != "default" else None,
-                "messages": messages,
-                "temperature": (
-                    temperature if temperature is not None else self.temperature
-                ),
-                "max_tokens": self.max_tokens,
-            }
-
-            # Remove None values
-            payload = {k: v for k, v in payload.items() if v is not None}
+            payload = self._build_payload(
+                messages, temperature, False, n_keep, max_tokens
+            )
 
             # Log the full payload (truncated for readability)
             payload_str = json.dumps(payload)
@@ -144,9 +334,7 @@ class LLMClient:
                 logger.debug(f"Payload: {payload_str}")
 
             # Send request to LLM API
-            response = requests.post(
-                self.api_endpoint, json=payload, timeout=self.timeout
-            )
+            response = await self.client.post(self.api_endpoint, json=payload)
 
             # Check if request was successful
             response.raise_for_status()
@@ -159,13 +347,8 @@ class LLMClient:
                 result.get("choices", [{}])[0].get("message", {}).get("content", "")
             )
 
-            # Add assistant response to history (only if we added the user input)
-            if assistant_message and add_to_history:
-                self.add_to_history("assistant", assistant_message)
-
             # Calculate processing time
-            end_time = logging.Formatter.converter()
-            processing_time = end_time[0] - start_time[0]
+            processing_time = time.time() - start_time
 
             logger.info(f"Received response from LLM API after {processing_time:.2f}s")
 
@@ -176,119 +359,70 @@ class LLMClient:
                 "model": result.get("model", "unknown"),
             }
 
-        except requests.RequestException as e:
-            logger.error(f"LLM API request error: {e}")
-            error_response = f"I'm sorry, I encountered a problem connecting to my language model. {str(e)}"
-
-            # Add the error to history if requested and clear history on 400 errors
-            # to prevent the same error from happening repeatedly
-            if add_to_history:
-                self.add_to_history("assistant", error_response)
-
-                # If we get a 400 Bad Request, the context might be corrupt
-                if (
-                    isinstance(e, requests.exceptions.HTTPError)
-                    and e.response.status_code == 400
-                ):
-                    logger.warning(
-                        "Received 400 error, clearing conversation history to recover"
-                    )
-                    # Keep only system prompt if it exists
-                    self.clear_history(keep_system_prompt=True)
-
-            return {"text": error_response, "error": str(e)}
         except Exception as e:
-            logger.error(f"LLM processing error: {e}")
-            error_response = (
-                "I'm sorry, I encountered an unexpected error. Please try again."
-            )
-            self.add_to_history("assistant", error_response)
-            return {"text": error_response, "error": str(e)}
+            return self._handle_request_error(e)
         finally:
-            self.is_processing = False
+            self.active_requests -= 1
 
-    def stream_response(
+    async def stream_response(
         self,
-        user_input: str,
-        system_prompt: Optional[str] = None,
-        add_to_history: bool = True,
+        messages: List[Dict[str, str]],
         temperature: Optional[float] = None,
-    ) -> Generator[str, None, Dict[str, Any]]:
+        result: Optional[Dict[str, Any]] = None,
+        n_keep: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncGenerator[str, None]:
         """
-        Stream a response from the LLM for the given user input.
+        Stream a response from the LLM.
+
+        Closing the generator early, or cancelling the task consuming it,
+        closes the HTTP connection so the server stops generating.
 
         Args:
-            user_input: User's text input
-            system_prompt: Optional system prompt to set context
-            add_to_history: Whether to add this exchange to conversation history
+            messages: Messages in OpenAI chat format, including any history
             temperature: Optional temperature override (0.0 to 1.0)
+            result: Optional dict filled in when the stream completes with the
+                full text, processing_time and, on failure, error and status_code
+            n_keep: Leading prompt tokens to keep on a context shift (with cache_prompt)
+            max_tokens: Optional override of the maximum tokens to generate
 
         Yields:
             Text chunks from the LLM response as they are generated
-
-        Returns:
-            Dictionary containing metadata about the response when streaming completes
         """
-        self.is_processing = True
-        start_time = logging.Formatter.converter()
+        self._start_request()
+        start_time = time.time()
+        first_token_time = None
+        tokens = 0
         full_response = ""
+        if result is None:
+            result = {}
 
         try:
-            # Prepare messages
-            messages = []
-
-            # Add system prompt if provided and not already in history
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-
-            # Add user input to history if it's not empty and add_to_history is True
-            if user_input.strip() and add_to_history:
-                self.add_to_history("user", user_input)
-
-            # Add conversation history (which now includes the user input if add_to_history=True)
-            messages.extend(self.conversation_history)
-
-            # Only add user input directly if not adding to history
-            if user_input.strip() and not add_to_history:
-                messages.append({"role": "user", "content": user_input})
-
-            # Prepare request payload with custom temperature if provided
-            payload = {
-                "model": self.model if self.model != "default" else None,
-                "messages": messages,
-                "temperature": (
-                    temperature if temperature is not None else self.temperature
-                ),
-                "max_tokens": self.max_tokens,
-                "stream": True,  # Enable streaming
-            }
-
-            # Remove None values
-            payload = {k: v for k, v in payload.items() if v is not None}
+            payload = self._build_payload(
+                messages, temperature, True, n_keep, max_tokens
+            )
 
             # Log payload info
             logger.info(
                 f"Sending streaming request to LLM API with {len(messages)} messages"
             )
 
-            # For streaming, use a context manager with stream=True
-            with requests.post(
-                self.api_endpoint, json=payload, timeout=self.timeout, stream=True
+            async with self.client.stream(
+                "POST", self.api_endpoint, json=payload
             ) as response:
                 response.raise_for_status()
 
                 # Process the streaming response
-                for line in response.iter_lines():
+                async for line in response.aiter_lines():
                     if not line:
                         continue
 
                     # OpenAI format has "data: " prefix for each chunk
-                    line_text = line.decode("utf-8")
-                    if line_text == "data: [DONE]":
+                    if line == "data: [DONE]":
                         break
 
-                    if line_text.startswith("data: "):
-                        json_str = line_text[6:]  # Remove "data: " prefix
+                    if line.startswith("data: "):
+                        json_str = line[6:]  # Remove "data: " prefix
                         try:
                             chunk_data = json.loads(json_str)
                             chunk_content = (
@@ -298,87 +432,33 @@ class LLMClient:
                             )
 
                             if chunk_content:
+                                if first_token_time is None:
+                                    first_token_time = time.time()
+                                tokens += 1  # One delta per generated token
                                 full_response += chunk_content
                                 yield chunk_content
                         except json.JSONDecodeError as e:
                             logger.error(f"Failed to parse streaming JSON: {e}")
-                            logger.debug(f"Problem line: {line_text}")
-
-            # Add the full response to history when streaming is complete
-            if full_response and add_to_history:
-                self.add_to_history("assistant", full_response)
+                            logger.debug(f"Problem line: {line}")
 
             # Calculate processing time
-            end_time = logging.Formatter.converter()
-            processing_time = end_time[0] - start_time[0]
+            processing_time = time.time() - start_time
+            result.update(text=full_response, processing_time=processing_time)
+            if first_token_time is not None:
+                self._record_stream(tokens, time.time() - first_token_time)
 
             logger.info(f"Completed streaming response after {processing_time:.2f}s")
 
-            return {
-                "text": full_response,
-                "processing_time": processing_time,
-                "model": self.model,
-            }
-
-        except requests.RequestException as e:
-            logger.error(f"LLM API streaming request error: {e}")
-            error_response = f"I'm sorry, I encountered a problem connecting to my language model. {str(e)}"
-
-            if add_to_history:
-                self.add_to_history("assistant", error_response)
-
-                # If we get a 400 Bad Request, the context might be corrupt
-                if (
-                    isinstance(e, requests.exceptions.HTTPError)
-                    and e.response.status_code == 400
-                ):
-                    logger.warning(
-                        "Received 400 error, clearing conversation history to recover"
-                    )
-                    self.clear_history(keep_system_prompt=True)
-
-            yield error_response
-            return {"text": error_response, "error": str(e)}
+        except (asyncio.CancelledError, GeneratorExit):
+            # Barge-in, or the rest of the reply won't be spoken
+            self._record_abort(tokens, time.time() - start_time)
+            raise
         except Exception as e:
-            logger.error(f"LLM streaming error: {e}")
-            error_response = (
-                "I'm sorry, I encountered an unexpected error. Please try again."
-            )
-            self.add_to_history("assistant", error_response)
-            yield error_response
-            return {"text": error_response, "error": str(e)}
+            error = self._handle_request_error(e)
+            result.update(error)
+            yield error["text"]
         finally:
-            self.is_processing = False
-
-    def clear_history(self, keep_system_prompt: bool = True) -> None:
-        """
-        Clear the conversation history.
-
-        Args:
-            keep_system_prompt: Whether to keep the system prompt in history
-        """
-        # If we should keep the system prompt and it exists as the first message
-        if (
-            keep_system_prompt
-            and self.conversation_history
-            and self.conversation_history[0]["role"] == "system"
-        ):
-            system_prompt = self.conversation_history[0]
-            self.conversation_history = [system_prompt]
-        else:
-            self.conversation_history = []
-
-        logger.info("Cleared conversation history")
-
-    def reset_state(self) -> None:
-        """
-        Forcibly reset the LLM client state.
-
-        This is useful when operations need to be interrupted immediately,
-        such as when the user sends an interrupt command.
-        """
-        self.is_processing = False
-        logger.info("LLM client state forcibly reset")
+            self.active_requests -= 1
 
     def get_config(self) -> Dict[str, Any]:
         """
@@ -393,6 +473,15 @@ class LLMClient:
             "temperature": self.temperature,
             "max_tokens": self.max_tokens,
             "timeout": self.timeout,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "keepalive_expiry": self.keepalive_expiry,
+            "http2": self.http2,
+            "cache_prompt": self.cache_prompt,
             "is_processing": self.is_processing,
-            "history_length": len(self.conversation_history),
+            "active_requests": self.active_requests,
+            "aborted_streams": self.aborted_streams,
+            "stopped_streams": self.stopped_streams,
+            "saved_tokens": self.saved_tokens,
+            "saved_seconds": self.saved_seconds,
         }
@@ -0,0 +1,123 @@
+"""
+Long-form Transcription Helpers
+
+Splits long utterances into overlapping windows at low-energy points so they
+can be transcribed in parallel, and stitches the window transcripts back
+together by timestamp.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .transcription import WHISPER_SAMPLE_RATE
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Frame length used to find quiet cut points
+ENERGY_FRAME_SECONDS = 0.03
+
+
+def split_long_audio(
+    samples: np.ndarray,
+    window_seconds: float = 12.0,
+    overlap_seconds: float = 1.0,
+    search_seconds: float = 2.0,
+) -> List[Tuple[int, int]]:
+    """
+    Split audio into overlapping windows that are cut at low-energy points.
+
+    Each cut is placed at the quietest frame within ``search_seconds`` before
+    the nominal window end, so cuts land in pauses between words rather than
+    inside them. Windows extend half the overlap past each cut.
+
+    Args:
+        samples: Mono float32 samples at 16 kHz
+        window_seconds: Target window length including the overlap
+        overlap_seconds: Audio shared by neighbouring windows
+        search_seconds: How far before the nominal cut to look for a pause
+
+    Returns:
+        List of (start, end) sample ranges in order
+    """
+    total = len(samples)
+    core = int((window_seconds - overlap_seconds) * WHISPER_SAMPLE_RATE)
+    half_overlap = int(overlap_seconds * WHISPER_SAMPLE_RATE) // 2
+    search = min(int(search_seconds * WHISPER_SAMPLE_RATE), core // 2)
+    frame = int(ENERGY_FRAME_SECONDS * WHISPER_SAMPLE_RATE)
+
+    if core <= 0 or total <= core * 1.25:
+        return [(0, total)]
+
+    n_frames = total // frame
+    frames = samples[: n_frames * frame].reshape(n_frames, frame)
+    energy = np.mean(frames * frames, axis=1)
+
+    cuts = [0]
+    # Leave the last window between a quarter and 1.25 cores long
+    while total - cuts[-1] > core * 1.25:
+        target = cuts[-1] + core
+        first_frame = (target - search) // frame
+        last_frame = min(target // frame, n_frames)
+        quietest = first_frame + int(np.argmin(energy[first_frame:last_frame]))
+        cuts.append(quietest * frame + frame // 2)
+    cuts.append(total)
+
+    return [
+        (max(0, start - half_overlap), min(total, end + half_overlap))
+        for start, end in zip(cuts[:-1], cuts[1:])
+    ]
+
+
+def stitch_transcripts(
+    windows: List[Tuple[int, int]], window_segments: List[List[Dict[str, Any]]]
+) -> str:
+    """
+    Join window transcripts by timestamp, keeping each word exactly once.
+
+    Neighbouring windows both hear the audio they share. Every word is kept
+    only by the window that owns the part of that audio it falls in: the
+    boundary is the middle of the overlap, where split_long_audio placed
+    the cut. Text is never compared, so words the speaker really repeated
+    across the boundary ("no no no") are kept.
+
+    Args:
+        windows: (start, end) sample ranges from split_long_audio
+        window_segments: Segments of each window's transcript with timings
+            relative to the window (and "words" with per-word timings, if
+            available)
+
+    Returns:
+        The stitched transcript
+    """
+    words: List[str] = []
+    for i, ((start, end), segments) in enumerate(zip(windows, window_segments)):
+        # Part of the audio this window owns, in seconds from its start
+        owned_from = 0.0
+        if i > 0:
+            owned_from = (windows[i - 1][1] - start) / 2 / WHISPER_SAMPLE_RATE
+        owned_to = float("inf")
+        if i + 1 < len(windows):
+            owned_to = (windows[i + 1][0] + end) / 2 / WHISPER_SAMPLE_RATE - (
+                start / WHISPER_SAMPLE_RATE
+            )
+
+        for text, word_start, word_end in _timed_words(segments):
+            if owned_from <= (word_start + word_end) / 2 < owned_to:
+                words.append(text)
+    return " ".join(words)
+
+
+def _timed_words(segments: List[Dict[str, Any]]) -> Iterator[Tuple[str, float, float]]:
+    """(text, start, end) of each word, or of each segment without word timings."""
+    for segment in segments:
+        timed = segment.get("words")
+        if timed:
+            for word in timed:
+                if word["word"].strip():
+                    yield word["word"].strip(), word["start"], word["end"]
+        elif segment["text"].strip():
+            yield segment["text"].strip(), segment["start"], segment["end"]
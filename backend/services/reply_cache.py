@@ -0,0 +1,327 @@
+"""
+Prepared Reply Cache
+
+Generates and synthesizes replies ahead of time (greetings, silent
+follow-ups) so they can be played the moment they are requested instead of
+after an LLM and TTS round trip.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .llm import LLMClient
+from .tts import TTSClient
+from .tts_pipeline import split_sentences
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PreparedReply:
+    """A generated reply with its audio, one chunk per sentence."""
+
+    def __init__(self, text: str, chunks: List[Tuple[str, bytes]]):
+        self.text = text
+        self.chunks = chunks
+        self.created_at = time.time()
+
+
+class ReplyCache:
+    """
+    Pool of ready replies keyed by the request that produces them.
+
+    The key covers the exact messages sent to the LLM and the voice settings
+    used for synthesis, so a prepared reply is only served for the request it
+    was generated for. Keys not used recently are dropped first. The cache is
+    shared by all connections; replies only one connection may use (and
+    discard) carry that connection's scope in their key.
+    """
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        tts_client: TTSClient,
+        pool_size: int = 2,
+        max_keys: int = 32,
+        max_wait: float = 1.5,
+    ):
+        """
+        Initialize the reply cache.
+
+        Args:
+            llm_client: Shared LLM client used to generate replies
+            tts_client: Shared TTS client used to synthesize them
+            pool_size: Replies kept ready per key (variants served in turn)
+            max_keys: Number of distinct requests replies are kept for
+            max_wait: Seconds take() waits for a reply still being prepared
+        """
+        self.llm_client = llm_client
+        self.tts_client = tts_client
+        self.pool_size = pool_size
+        self.max_keys = max_keys
+        self.max_wait = max_wait
+
+        self._pools: "OrderedDict[str, List[PreparedReply]]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._ready: Dict[str, asyncio.Event] = {}
+        # Keys whose low-priority fill is waiting for the LLM's background slot
+        self._deferred: Set[str] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+
+        logger.info(
+            f"Initialized reply cache with pool_size={pool_size}, max_keys={max_keys}, "
+            f"max_wait={max_wait}s"
+        )
+
+    def key(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: Optional[int] = None,
+        scope: Optional[str] = None,
+    ) -> str:
+        """Key for the reply to a request with the current voice settings."""
+        tts = self.tts_client
+        request = {
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "scope": scope,
+            "voice": [tts.model, tts.voice, tts.output_format, tts.speed],
+        }
+        return hashlib.sha1(
+            json.dumps(request, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def fill(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        pool_size: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        low_priority: bool = False,
+        scope: Optional[str] = None,
+    ) -> str:
+        """
+        Prepare replies for a request in the background.
+
+        Does nothing if the pool for the request is already full or being
+        filled.
+
+        Args:
+            messages: Messages the reply is generated from
+            temperature: Temperature for generation
+            pool_size: Replies to keep ready (defaults to the cache's pool size)
+            max_tokens: Optional override of the maximum tokens to generate
+            low_priority: Generate in the LLM client's background slot, so
+                interactive requests go first
+            scope: Optional owner (e.g. a connection) the replies are kept for
+
+        Returns:
+            The request's key
+        """
+        key = self.key(messages, temperature, max_tokens, scope)
+        pool_size = pool_size or self.pool_size
+        if key in self._tasks or len(self._pools.get(key, [])) >= pool_size:
+            return key
+
+        task = asyncio.create_task(
+            self._fill(key, messages, temperature, pool_size, max_tokens, low_priority)
+        )
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._forget_task(key, task))
+        return key
+
+    def _forget_task(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished fill task unless it has been replaced."""
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            self._wake(key)
+
+    def _wake(self, key: str) -> None:
+        """Wake and drop the waiters for a key, if any."""
+        ready = self._ready.pop(key, None)
+        if ready:
+            ready.set()
+
+    async def _fill(
+        self,
+        key: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        pool_size: int,
+        max_tokens: Optional[int],
+        low_priority: bool,
+    ) -> None:
+        """Generate replies until the pool for a key is full."""
+        try:
+            while len(self._pools.get(key, [])) < pool_size:
+                reply = await self._generate(
+                    key, messages, temperature, max_tokens, low_priority
+                )
+                if reply is None:
+                    return
+                self._pools.setdefault(key, []).append(reply)
+                self._pools.move_to_end(key)
+                self._wake(key)
+                while len(self._pools) > self.max_keys:
+                    self._pools.popitem(last=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error preparing reply: {e}")
+
+    async def _generate(
+        self,
+        key: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        low_priority: bool,
+    ) -> Optional[PreparedReply]:
+        """Generate and synthesize one reply (None if generation failed)."""
+        start_time = time.time()
+        if low_priority:
+            response = await self._get_response_in_background(
+                key, messages, temperature, max_tokens
+            )
+        else:
+            response = await self.llm_client.get_response(
+                messages, temperature=temperature, max_tokens=max_tokens
+            )
+        if "error" in response or not response["text"].strip():
+            return None
+
+        chunks = []
+        for sentence in split_sentences(response["text"]):
+            audio_data = await self.tts_client.async_text_to_speech(sentence)
+            if not audio_data:
+                return None
+            chunks.append((sentence, audio_data))
+
+        self.generated += 1
+        logger.info(
+            f"Prepared reply of {len(chunks)} chunk(s) in {time.time() - start_time:.2f}s"
+        )
+        return PreparedReply(response["text"], chunks)
+
+    async def _get_response_in_background(
+        self,
+        key: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+    ) -> Dict[str, Any]:
+        """Generate in the LLM client's background slot, marking the key deferred until it is granted."""
+        self._deferred.add(key)
+        try:
+            async with self.llm_client.background_slot():
+                self._deferred.discard(key)
+                return await self.llm_client.get_response(
+                    messages, temperature=temperature, max_tokens=max_tokens
+                )
+        finally:
+            self._deferred.discard(key)
+
+    async def take(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        wait: bool = True,
+        max_tokens: Optional[int] = None,
+        scope: Optional[str] = None,
+    ) -> Optional[PreparedReply]:
+        """
+        Take a prepared reply for a request.
+
+        Args:
+            messages: Messages the reply would be generated from
+            temperature: Temperature for generation
+            wait: Wait (up to max_wait) for a reply already being generated for
+                the same request; one still waiting for the LLM's background
+                slot is not waited for
+            max_tokens: Optional override of the maximum tokens to generate
+            scope: The owner the reply was prepared for, if any
+
+        Returns:
+            The reply, or None if none is prepared
+        """
+        key = self.key(messages, temperature, max_tokens, scope)
+        pool = self._pools.get(key)
+        task = self._tasks.get(key)
+        if not pool and wait and task and key not in self._deferred:
+            # Already under way, which is still sooner than starting over
+            ready = self._ready.setdefault(key, asyncio.Event())
+            waiter = asyncio.ensure_future(ready.wait())
+            try:
+                await asyncio.wait(
+                    {task, waiter},
+                    timeout=self.max_wait,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                waiter.cancel()
+            pool = self._pools.get(key)
+
+        if not pool:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._pools.move_to_end(key)
+        return pool.pop(0)
+
+    def discard(self, key: str) -> None:
+        """Stop preparing and drop replies for a request that won't be made."""
+        task = self._tasks.pop(key, None)
+        if task:
+            task.cancel()
+        self._pools.pop(key, None)
+        self._wake(key)
+
+    def close(self) -> None:
+        """Stop preparing replies."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        self._tasks.clear()
+        for key in list(self._ready):
+            self._wake(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with ready replies, keys, preparing, hits, misses and generated
+        """
+        return {
+            "ready": sum(len(pool) for pool in self._pools.values()),
+            "keys": len(self._pools),
+            "preparing": len(self._tasks),
+            "hits": self.hits,
+            "misses": self.misses,
+            "generated": self.generated,
+        }
+
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the current configuration.
+
+        Returns:
+            Dict containing the current configuration
+        """
+        return {
+            "pool_size": self.pool_size,
+            "max_keys": self.max_keys,
+            "max_wait": self.max_wait,
+            **self.get_stats(),
+        }
@@ -0,0 +1,89 @@
+"""
+Voice Response Policy
+
+Limits how long spoken replies get: a token cap for each kind of request,
+and an optional stop after a number of spoken sentences with an offer to
+continue.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ResponseKind:
+    """Kinds of spoken replies, each with its own token cap."""
+
+    GREETING = "greeting"
+    FOLLOWUP = "followup"
+    ANSWER = "answer"
+
+
+class ResponsePolicy:
+    """
+    Length limits for spoken replies.
+
+    Counters are shared by all connections.
+    """
+
+    def __init__(
+        self,
+        greeting_max_tokens: int = 0,
+        followup_max_tokens: int = 0,
+        answer_max_tokens: int = 0,
+        max_sentences: int = 0,
+        continue_prompt: str = "Want me to go on?",
+    ):
+        """
+        Initialize the response policy.
+
+        Args:
+            greeting_max_tokens: Token cap for greetings (0 uses the LLM client's)
+            followup_max_tokens: Token cap for silent follow-ups (0 uses the LLM client's)
+            answer_max_tokens: Token cap for answers (0 uses the LLM client's)
+            max_sentences: Spoken sentences after which an answer is stopped
+                (0 never stops early)
+            continue_prompt: Spoken after an answer is stopped early
+        """
+        self.token_caps = {
+            ResponseKind.GREETING: greeting_max_tokens,
+            ResponseKind.FOLLOWUP: followup_max_tokens,
+            ResponseKind.ANSWER: answer_max_tokens,
+        }
+        self.max_sentences = max_sentences
+        self.continue_prompt = continue_prompt
+
+        self._lock = threading.Lock()
+        self.early_stops = 0
+
+        logger.info(
+            f"Initialized response policy with token caps {self.token_caps}, "
+            f"max_sentences={max_sentences}"
+        )
+
+    def max_tokens(self, kind: str) -> Optional[int]:
+        """Token cap for a kind of reply (None uses the LLM client's)."""
+        return self.token_caps.get(kind) or None
+
+    def record_early_stop(self) -> None:
+        """Count an answer stopped before the LLM finished it."""
+        with self._lock:
+            self.early_stops += 1
+
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the current configuration.
+
+        Returns:
+            Dict containing the current configuration
+        """
+        return {
+            "max_tokens": dict(self.token_caps),
+            "max_sentences": self.max_sentences,
+            "continue_prompt": self.continue_prompt,
+            "early_stops": self.early_stops,
+        }
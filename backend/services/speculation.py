@@ -0,0 +1,182 @@
+"""
+Speculative Response Service
+
+Starts the LLM response on the partial transcript of a streamed utterance
+while its final decode is still running. If the final transcript turns out
+to say the same thing, the response already under way is used; otherwise it
+is cancelled and a normal response is started.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Any, AsyncIterator, List, Optional
+
+from .streaming_transcription import normalize_word
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def normalize_words(text: str) -> List[str]:
+    """Split a transcript into normalized words (case and punctuation insensitive)."""
+    return [w for w in (normalize_word(word) for word in text.split()) if w]
+
+
+def word_edit_distance(left: List[str], right: List[str]) -> int:
+    """Count the word insertions, deletions and substitutions between two transcripts."""
+    previous = list(range(len(right) + 1))
+    for i, left_word in enumerate(left, 1):
+        current = [i]
+        for j, right_word in enumerate(right, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (left_word != right_word),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class SpeculationStats:
+    """Process-wide hit rate and latency saved by speculative responses."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def record(self, hit: bool, saved_seconds: float = 0.0) -> None:
+        """Record the outcome of one speculation."""
+        with self._lock:
+            self.attempts += 1
+            if hit:
+                self.hits += 1
+                self.saved_seconds += saved_seconds
+            else:
+                self.misses += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get speculation statistics.
+
+        Returns:
+            Dict with attempts, hits, misses, hit_rate, saved_seconds and avg_saved_seconds
+        """
+        with self._lock:
+            return {
+                "attempts": self.attempts,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / self.attempts if self.attempts else 0.0,
+                "saved_seconds": self.saved_seconds,
+                "avg_saved_seconds": (
+                    self.saved_seconds / self.hits if self.hits else 0.0
+                ),
+            }
+
+
+# Shared by all connections
+speculation_stats = SpeculationStats()
+
+
+class SpeculativeResponse:
+    """
+    An LLM response started before the final transcript is known.
+
+    Text chunks are buffered until the response is either committed, when
+    they are replayed and the rest is passed through as it arrives, or
+    cancelled, which stops the LLM request.
+    """
+
+    def __init__(self, transcript: str, text_stream: AsyncIterator[str], max_edits: int = 0):
+        """
+        Start a speculative response.
+
+        Args:
+            transcript: Partial transcript the response is generated for
+            text_stream: LLM text stream for that transcript
+            max_edits: Word edits between the partial and final transcript
+                still treated as the same utterance
+        """
+        self.transcript = transcript
+        self.max_edits = max_edits
+        self.started_at = time.time()
+
+        self._words = normalize_words(transcript)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._pump(text_stream))
+        self._settled = False
+
+        logger.info(f"Speculatively started response for: {transcript!r}")
+
+    async def _pump(self, text_stream: AsyncIterator[str]) -> None:
+        """Read the LLM stream into the buffer."""
+        try:
+            async for text_chunk in text_stream:
+                self._queue.put_nowait(text_chunk)
+        except Exception as e:
+            logger.error(f"Speculative response failed: {e}")
+        finally:
+            self._queue.put_nowait(None)
+
+    def matches(self, final_transcript: str) -> bool:
+        """Whether the final transcript says the same as the speculated one."""
+        return word_edit_distance(self._words, normalize_words(final_transcript)) <= self.max_edits
+
+    def commit(self) -> AsyncIterator[str]:
+        """
+        Use the response.
+
+        The speculative request doesn't add to the history; the caller
+        records the exchange under the final transcript.
+
+        Returns:
+            The response's text chunks, starting with those already generated
+        """
+        saved = time.time() - self.started_at
+        self._settled = True
+        speculation_stats.record(hit=True, saved_seconds=saved)
+        logger.info(f"Speculative response committed, {saved:.2f}s head start")
+        return self._chunks()
+
+    async def _chunks(self) -> AsyncIterator[str]:
+        """
+        Yield buffered and incoming chunks until the stream ends.
+
+        Closing the iterator early (barge-in, a spoken answer stopped short)
+        stops the LLM request too.
+        """
+        try:
+            while True:
+                text_chunk = await self._queue.get()
+                if text_chunk is None:
+                    return
+                yield text_chunk
+        finally:
+            if not self._task.done():
+                self._task.cancel()
+                await asyncio.wait({self._task})
+
+    def cancel(self, final_transcript: Optional[str] = None) -> None:
+        """
+        Abandon the response and stop its LLM request.
+
+        Args:
+            final_transcript: The transcript that didn't match, counted as a miss
+                (None when the turn was abandoned for another reason)
+        """
+        if not self._settled and final_transcript is not None:
+            speculation_stats.record(hit=False)
+            logger.info(
+                f"Speculation missed: {self.transcript!r} vs {final_transcript!r}"
+            )
+        self._settled = True
+        if not self._task.done():
+            self._task.cancel()
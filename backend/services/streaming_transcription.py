@@ -0,0 +1,240 @@
+"""
+Streaming Transcription Service
+
+Incrementally transcribes audio that is streamed in while the user is still
+speaking, so most of the speech-to-text work is done by the time they stop.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_ingest import StreamResampler, pcm16_to_float32
+from .transcription import WHISPER_SAMPLE_RATE
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def normalize_word(word: str) -> str:
+    """Normalize a word for hypothesis comparison (case and punctuation insensitive)."""
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class StreamingTranscription:
+    """
+    Rolling-window transcription of a single streamed utterance.
+
+    Every time enough new audio has arrived, the window of audio that has not
+    been committed yet is re-decoded. Words that two consecutive hypotheses
+    agree on form a stable prefix; complete segments inside that prefix are
+    committed and their audio is dropped from the window, so each re-decode
+    stays short and the final decode only covers the last few words.
+    """
+
+    def __init__(
+        self,
+        transcriber,
+        stream_id: str,
+        sample_rate: int,
+        decode_interval: float = 0.5,
+        max_window: float = 20.0,
+    ):
+        """
+        Initialize a streaming transcription.
+
+        Args:
+            transcriber: Transcription scheduler used to run the decodes
+            stream_id: Client identifier of the audio stream
+            sample_rate: Sample rate of the incoming PCM audio in Hz
+            decode_interval: Seconds of new audio required before re-decoding
+            max_window: Longest uncommitted window in seconds before segments are force-committed
+        """
+        self.transcriber = transcriber
+        self.stream_id = stream_id
+        self.sample_rate = sample_rate
+        self.decode_interval = decode_interval
+        self.max_window = max_window
+
+        # Audio state: 16 kHz float32 samples, and how many are already committed
+        self._resampler = StreamResampler(sample_rate, WHISPER_SAMPLE_RATE)
+        self._chunks: List[np.ndarray] = []
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._committed_samples = 0
+        self._decoded_samples = 0
+
+        # Text state
+        self.committed_text = ""
+        self._previous_words: List[str] = []
+        self.stable_text = ""
+        self.tentative_text = ""
+
+        # Decode bookkeeping
+        self._decode_task: Optional[asyncio.Task] = None
+        self.decode_count = 0
+        self.started_at = time.time()
+        self.closed = False
+
+    @property
+    def duration(self) -> float:
+        """Total seconds of audio received so far."""
+        return (len(self._audio) + sum(len(c) for c in self._chunks)) / WHISPER_SAMPLE_RATE
+
+    def append(self, pcm: bytes) -> None:
+        """
+        Add a chunk of little-endian 16-bit PCM audio.
+
+        Args:
+            pcm: Raw PCM bytes at the stream sample rate
+        """
+        self._chunks.append(self._resampler.process(pcm16_to_float32(pcm)))
+
+    def _flush_chunks(self) -> None:
+        """Merge pending chunks into the audio buffer."""
+        if self._chunks:
+            self._audio = np.concatenate([self._audio] + self._chunks)
+            self._chunks = []
+
+    def should_decode(self) -> bool:
+        """Whether enough new audio has arrived to justify another partial decode."""
+        if self.closed or (self._decode_task and not self._decode_task.done()):
+            return False
+        new_samples = len(self._audio) + sum(len(c) for c in self._chunks)
+        return (
+            new_samples - self._decoded_samples
+            >= self.decode_interval * WHISPER_SAMPLE_RATE
+        )
+
+    def start_partial_decode(self) -> asyncio.Task:
+        """Start a partial decode of the uncommitted window in the background."""
+        self._decode_task = asyncio.create_task(self._decode(final=False))
+        return self._decode_task
+
+    async def _decode(self, final: bool) -> Tuple[str, Dict[str, Any]]:
+        """Decode the uncommitted window and update the committed/stable text."""
+        if final:
+            # Flush the resampler's filter tail
+            self._chunks.append(
+                self._resampler.process(np.zeros(0, dtype=np.float32), final=True)
+            )
+        self._flush_chunks()
+        window = self._audio[self._committed_samples :]
+        self._decoded_samples = len(self._audio)
+        self.decode_count += 1
+
+        if window.size == 0:
+            return self.committed_text, {"segments": []}
+
+        text, metadata = await self.transcriber.transcribe_async(
+            window,
+            initial_prompt=self.committed_text or None,
+            return_segments=True,
+        )
+        if metadata.get("error"):
+            return self.committed_text, metadata
+
+        if final:
+            self.committed_text = self._join(self.committed_text, text)
+            self.stable_text = ""
+            self.tentative_text = ""
+        else:
+            self._update_hypothesis(metadata.get("segments", []))
+
+        return self.committed_text, metadata
+
+    def _update_hypothesis(self, segments: List[Dict[str, Any]]) -> None:
+        """Apply local agreement between the previous and current hypothesis."""
+        words = [w for segment in segments for w in segment["text"].split()]
+        normalized = [normalize_word(w) for w in words]
+
+        stable_count = 0
+        for previous, current in zip(self._previous_words, normalized):
+            if previous != current:
+                break
+            stable_count += 1
+
+        window_seconds = (len(self._audio) - self._committed_samples) / WHISPER_SAMPLE_RATE
+        force_commit = window_seconds > self.max_window
+
+        # Commit complete segments (never the last one) that lie inside the stable prefix.
+        # Segment timings are relative to the start of the decoded window.
+        window_start = self._committed_samples
+        committed_words = 0
+        for segment in segments[:-1]:
+            segment_words = len(segment["text"].split())
+            if committed_words + segment_words > stable_count and not force_commit:
+                break
+            committed_words += segment_words
+            self.committed_text = self._join(self.committed_text, segment["text"])
+            self._committed_samples = window_start + int(
+                segment["end"] * WHISPER_SAMPLE_RATE
+            )
+
+        self._previous_words = normalized[committed_words:]
+        self.stable_text = " ".join(words[committed_words:max(stable_count, committed_words)])
+        self.tentative_text = " ".join(words[max(stable_count, committed_words) :])
+
+    @staticmethod
+    def _join(left: str, right: str) -> str:
+        """Join two pieces of transcript with a single space."""
+        return " ".join(part for part in (left.strip(), right.strip()) if part)
+
+    def partial_message(self) -> Dict[str, Any]:
+        """Build the payload describing the current partial transcript."""
+        confirmed = self._join(self.committed_text, self.stable_text)
+        return {
+            "text": self._join(confirmed, self.tentative_text),
+            "committed": confirmed,
+            "tentative": self.tentative_text,
+            "partial": True,
+            "stream_id": self.stream_id,
+        }
+
+    async def finalize(self) -> Tuple[str, Dict[str, Any]]:
+        """
+        Finish the stream and return the full transcript.
+
+        Only the audio after the last committed segment is decoded again.
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: Final transcript and metadata
+        """
+        self.closed = True
+        if self._decode_task and not self._decode_task.done():
+            try:
+                await self._decode_task
+            except Exception as e:
+                logger.error(f"Partial decode failed before finalizing: {e}")
+
+        final_start = time.time()
+        tail_seconds = (
+            len(self._audio) + sum(len(c) for c in self._chunks) - self._committed_samples
+        ) / WHISPER_SAMPLE_RATE
+        text, metadata = await self._decode(final=True)
+        metadata.pop("segments", None)
+        metadata.update(
+            {
+                "streaming": True,
+                "stream_id": self.stream_id,
+                "partial_decodes": self.decode_count - 1,
+                "final_decode_audio": tail_seconds,
+                "final_decode_time": time.time() - final_start,
+                "audio_duration": self.duration,
+            }
+        )
+        logger.info(
+            f"Streaming transcription finalized after {self.decode_count - 1} partial "
+            f"decodes, final decode covered {tail_seconds:.2f}s of audio"
+        )
+        return text, metadata
+
+    def cancel(self) -> None:
+        """Abandon the stream and any partial decode in progress."""
+        self.closed = True
+        if self._decode_task and not self._decode_task.done():
+            self._decode_task.cancel()
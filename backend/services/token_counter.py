@@ -0,0 +1,205 @@
+"""
+Token Counter
+
+Estimates how many prompt tokens chat messages cost, so conversation history
+can be kept within a token budget instead of a message count.
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Tokenizers are optional; without one a characters-per-token estimate is used
+try:
+    from tokenizers import Tokenizer
+
+    TOKENIZERS_AVAILABLE = True
+except ImportError:
+    TOKENIZERS_AVAILABLE = False
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Chat templates add role markers and separators around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+COMPACTED_MARKER = " [...]"
+
+
+class TokenCounter:
+    """
+    Counts tokens with a local tokenizer, or estimates them from length.
+
+    Counts are cached per message text, so each message is tokenized once no
+    matter how many requests it is sent with. The counter is shared by all
+    sessions.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Optional[str] = None,
+        chars_per_token: float = 4.0,
+        cache_size: int = 4096,
+    ):
+        """
+        Initialize the token counter.
+
+        Args:
+            tokenizer: Path to a tokenizer.json, a Hugging Face tokenizer name, or
+                'tiktoken:<encoding>' (None estimates from chars_per_token)
+            chars_per_token: Average characters per token used without a tokenizer
+            cache_size: Number of message texts whose counts are remembered
+        """
+        self.tokenizer_name = tokenizer
+        self.chars_per_token = chars_per_token
+        self.cache_size = cache_size
+
+        self._encode: Optional[Callable[[str], List[int]]] = None
+        self._decode: Optional[Callable[[List[int]], str]] = None
+        if tokenizer:
+            self._load_tokenizer(tokenizer)
+
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        logger.info(
+            f"Initialized token counter with tokenizer={self.backend}, "
+            f"chars_per_token={chars_per_token}"
+        )
+
+    def _load_tokenizer(self, name: str) -> None:
+        """Load a local tokenizer, falling back to estimates when unavailable."""
+        try:
+            if name.startswith("tiktoken:"):
+                if not TIKTOKEN_AVAILABLE:
+                    raise ImportError("tiktoken is not installed")
+                encoding = tiktoken.get_encoding(name.split(":", 1)[1])
+                self._encode = encoding.encode
+                self._decode = encoding.decode
+            else:
+                if not TOKENIZERS_AVAILABLE:
+                    raise ImportError("tokenizers is not installed")
+                if os.path.exists(name):
+                    tokenizer = Tokenizer.from_file(name)
+                else:
+                    tokenizer = Tokenizer.from_pretrained(name)
+                self._encode = lambda text: tokenizer.encode(
+                    text, add_special_tokens=False
+                ).ids
+                self._decode = tokenizer.decode
+        except Exception as e:
+            logger.warning(
+                f"Could not load tokenizer {name}, estimating token counts instead: {e}"
+            )
+            self._encode = None
+            self._decode = None
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a tokenizer rather than a length estimate."""
+        return self._encode is not None
+
+    @property
+    def backend(self) -> str:
+        """Name of the tokenizer in use, or 'estimate'."""
+        return self.tokenizer_name if self._encode else "estimate"
+
+    def count_text(self, text: str) -> int:
+        """
+        Count the tokens in a text.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens
+        """
+        if not text:
+            return 0
+
+        count = self._cache.get(text)
+        if count is not None:
+            self._cache.move_to_end(text)
+            self.hits += 1
+            return count
+
+        self.misses += 1
+        if self._encode:
+            count = len(self._encode(text))
+        else:
+            count = max(1, round(len(text) / self.chars_per_token))
+
+        self._cache[text] = count
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return count
+
+    def count_message(self, message: Dict[str, str]) -> int:
+        """Count the tokens a chat message costs, including template overhead."""
+        return self.count_text(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Count the tokens a list of chat messages costs."""
+        return sum(self.count_message(m) for m in messages)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Shorten a text to at most max_tokens tokens.
+
+        Args:
+            text: Text to shorten
+            max_tokens: Token limit
+
+        Returns:
+            The text itself if it fits, otherwise its beginning followed by a marker
+        """
+        if self.count_text(text) <= max_tokens:
+            return text
+
+        if self._encode:
+            shortened = self._decode(self._encode(text)[:max_tokens])
+        else:
+            shortened = text[: int(max_tokens * self.chars_per_token)]
+
+        # Cut back to a word boundary when one is close
+        boundary = shortened.rfind(" ")
+        if boundary > len(shortened) * 0.8:
+            shortened = shortened[:boundary]
+        return shortened.rstrip() + COMPACTED_MARKER
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with cached_texts, hits and misses
+        """
+        return {
+            "cached_texts": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def get_config(self) -> Dict[str, object]:
+        """
+        Get the current configuration.
+
+        Returns:
+            Dict containing the current configuration
+        """
+        return {
+            "tokenizer": self.backend,
+            "chars_per_token": self.chars_per_token,
+            "cache_size": self.cache_size,
+            **self.get_stats(),
+        }
@@ -6,22 +6,62 @@ Uses Faster Whisper to transcribe speech audio.
 
 import numpy as np
 import logging
-import io  # For BytesIO
+import bisect
 from typing import Dict, Any, List, Optional, Tuple
-from faster_whisper import WhisperModel
+from faster_whisper import WhisperModel, BatchedInferencePipeline
 import time
 import torch  # For CUDA availability check
 
+from .audio_ingest import wav_to_float32, TARGET_SAMPLE_RATE
+from .vad import VoiceActivityDetector
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Whisper works on 16 kHz audio in 30 second windows
+WHISPER_SAMPLE_RATE = TARGET_SAMPLE_RATE
+WHISPER_CHUNK_SECONDS = 30
+
+# Decode profiles: "quality" is the regular decode, "fast" trades accuracy for
+# latency (greedy, no timestamps, no temperature fallback, no conditioning)
+DECODE_PROFILES = {
+    "quality": {},
+    "fast": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+    },
+}
+
+# Smoothing factor for the recent real-time factor of each tier
+RTF_SMOOTHING = 0.3
+
+# Seconds after which a tier's last real-time factor no longer keeps it skipped
+RTF_MAX_AGE = 30.0
+
+# Cascade pass names reported in metadata
+CASCADE_FIRST_PASS = "first"
+CASCADE_SECOND_PASS = "second"
+
 
 class WhisperTranscriber:
     """
     Speech-to-Text service using Faster Whisper.
 
     This class handles transcription of speech audio segments.
+
+    Several model sizes can be kept resident. Together with the decode
+    profiles they form tiers ordered from most accurate to fastest, and
+    select_tier() moves between them based on queue depth and the recent
+    real-time factor, so a burst degrades accuracy instead of latency.
+
+    In cascade mode every segment is first decoded with a small model and only
+    re-decoded with the tier's larger model when the first pass looks
+    unreliable (low log probability, high compression ratio or high
+    no-speech probability).
     """
 
     def __init__(
@@ -31,6 +71,17 @@ class WhisperTranscriber:
         compute_type: str = None,
         beam_size: int = 2,
         sample_rate: int = 44100,
+        num_workers: int = 1,
+        cpu_threads: int = 0,
+        autotune: Optional[Dict[str, Any]] = None,
+        vad: Optional[VoiceActivityDetector] = None,
+        tier_models: Optional[List[str]] = None,
+        tier_queue_depths: Optional[List[int]] = None,
+        max_rtf: float = 0.5,
+        cascade_model: Optional[str] = None,
+        cascade_logprob_threshold: float = -0.7,
+        cascade_compression_threshold: float = 2.2,
+        cascade_no_speech_threshold: float = 0.5,
     ):
         """
         Initialize the transcription service.
@@ -41,6 +92,17 @@ class WhisperTranscriber:
             compute_type: Model computation type (int8, int16, float16, float32), if None will select based on device
             beam_size: Beam size for decoding
             sample_rate: Audio sample rate in Hz
+            num_workers: Number of transcriptions the model may run in parallel
+            cpu_threads: CPU threads per model worker (0 uses the CTranslate2 default)
+            autotune: Result of the Whisper autotuner these settings came from, if any
+            vad: Optional voice activity detector that trims silence and rejects non-speech
+            tier_models: Additional, faster model sizes to keep resident (largest first)
+            tier_queue_depths: Queue depth at which each next tier is used
+            max_rtf: Recent real-time factor of a tier above which it is skipped
+            cascade_model: Small model decoding every segment first (None disables the cascade)
+            cascade_logprob_threshold: Re-decode when a segment's avg_logprob is below this
+            cascade_compression_threshold: Re-decode when a segment's compression ratio is above this
+            cascade_no_speech_threshold: Re-decode when a segment's no-speech probability is above this
         """
         self.model_size = model_size
 
@@ -58,6 +120,36 @@ class WhisperTranscriber:
 
         self.beam_size = beam_size
         self.sample_rate = sample_rate
+        self.num_workers = max(1, num_workers)
+        self.cpu_threads = max(0, cpu_threads)
+        self.autotune = autotune
+        self.vad = vad
+
+        # Model tiers, from most accurate to fastest
+        self.model_sizes = [model_size] + [
+            size for size in (tier_models or []) if size != model_size
+        ]
+        self.tiers = [
+            (size, profile) for size in self.model_sizes for profile in DECODE_PROFILES
+        ]
+        if tier_queue_depths is None:
+            tier_queue_depths = [2 ** (i + 1) for i in range(len(self.tiers) - 1)]
+        self.tier_queue_depths = sorted(tier_queue_depths)[: len(self.tiers) - 1]
+        self.max_rtf = max_rtf
+        self.active_tier = 0
+        # Recent real-time factor of each tier and when it was last measured
+        self.tier_rtf = [0.0] * len(self.tiers)
+        self.tier_rtf_at = [0.0] * len(self.tiers)
+
+        # Confidence-driven cascade (the small model must be resident too)
+        self.cascade_model = cascade_model
+        if cascade_model and cascade_model not in self.model_sizes:
+            self.model_sizes.append(cascade_model)
+        self.cascade_logprob_threshold = cascade_logprob_threshold
+        self.cascade_compression_threshold = cascade_compression_threshold
+        self.cascade_no_speech_threshold = cascade_no_speech_threshold
+        self.cascade_first_passes = 0
+        self.cascade_second_passes = 0
 
         # Initialize model
         self._initialize_model()
@@ -71,25 +163,136 @@ class WhisperTranscriber:
         )
 
     def _initialize_model(self):
-        """Initialize Whisper model."""
-        try:
-            # Load the model
-            self.model = WhisperModel(
-                self.model_size,  # Pass as positional argument, not keyword
-                device=self.device,
-                compute_type=self.compute_type,
+        """Initialize the Whisper models of every tier."""
+        self.models: Dict[str, WhisperModel] = {}
+        self.batched_models: Dict[str, BatchedInferencePipeline] = {}
+        for size in self.model_sizes:
+            try:
+                # Load the model
+                self.models[size] = WhisperModel(
+                    size,  # Pass as positional argument, not keyword
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    num_workers=self.num_workers,
+                    cpu_threads=self.cpu_threads,
+                )
+                # Batched pipeline shares the loaded model, it only adds batching logic
+                self.batched_models[size] = BatchedInferencePipeline(
+                    model=self.models[size]
+                )
+                logger.info(f"Successfully loaded Whisper model: {size}")
+            except Exception as e:
+                logger.error(f"Failed to load Whisper model: {e}")
+                raise
+
+        self.model = self.models[self.model_size]
+        self.batched_model = self.batched_models[self.model_size]
+
+    def select_tier(self, queue_depth: int) -> int:
+        """
+        Choose the tier for the next decode from the current load.
+
+        Deeper queues move to faster tiers, and a tier whose own recent
+        real-time factor is above max_rtf is skipped until that measurement is
+        RTF_MAX_AGE seconds old. Degrading is immediate while recovering
+        happens one tier per decode, so bursts do not make the tier flap.
+        RTF is tracked per tier, so a fast tier's low RTF never argues for
+        switching back to a slower one.
+
+        Args:
+            queue_depth: Number of requests waiting for a worker
+
+        Returns:
+            Index into self.tiers
+        """
+        last = len(self.tiers) - 1
+        target = min(bisect.bisect_right(self.tier_queue_depths, queue_depth), last)
+
+        if target < self.active_tier:
+            target = self.active_tier - 1
+        while target < last and self._too_slow(target):
+            target += 1
+        if target != self.active_tier:
+            logger.info(
+                f"Switching transcription tier to {self._tier_name(target)} "
+                f"(queue_depth={queue_depth}, "
+                f"{self._tier_name(self.active_tier)} rtf={self.tier_rtf[self.active_tier]:.2f})"
             )
-            logger.info(f"Successfully loaded Whisper model: {self.model_size}")
-        except Exception as e:
-            logger.error(f"Failed to load Whisper model: {e}")
-            raise
+        self.active_tier = target
+        return target
+
+    def _too_slow(self, tier: int) -> bool:
+        """Whether a tier recently decoded slower than max_rtf."""
+        recent = time.time() - self.tier_rtf_at[tier] < RTF_MAX_AGE
+        return recent and self.tier_rtf[tier] > self.max_rtf
+
+    def _tier_name(self, tier: int) -> str:
+        """Readable name of a tier, e.g. 'base.en/fast'."""
+        return "/".join(self.tiers[tier])
+
+    def _decode_options(self, tier: int) -> Tuple[str, Dict[str, Any]]:
+        """Model size and decode keyword arguments for a tier."""
+        size, profile = self.tiers[tier]
+        options = {"beam_size": self.beam_size, **DECODE_PROFILES[profile]}
+        return size, options
+
+    def _first_pass_model(self, size: str) -> str:
+        """Model that decodes first: the cascade model, unless it is not smaller than ``size``."""
+        if not self.cascade_model:
+            return size
+        if self.model_sizes.index(self.cascade_model) <= self.model_sizes.index(size):
+            return size
+        return self.cascade_model
+
+    def _escalation_reason(self, segments: List[Any]) -> Optional[str]:
+        """
+        Check a first-pass decode against the cascade thresholds.
+
+        Returns:
+            Name of the first threshold crossed, or None if the decode is trusted
+        """
+        if not segments:
+            return "no_text"
+        if min(s.avg_logprob for s in segments) < self.cascade_logprob_threshold:
+            return "avg_logprob"
+        if max(s.compression_ratio for s in segments) > self.cascade_compression_threshold:
+            return "compression_ratio"
+        if max(s.no_speech_prob for s in segments) > self.cascade_no_speech_threshold:
+            return "no_speech_prob"
+        return None
+
+    def _record_rtf(
+        self, tier: int, audio_seconds: float, processing_time: float
+    ) -> float:
+        """Fold a decode into its tier's recent real-time factor and return its own RTF."""
+        rtf = processing_time / audio_seconds if audio_seconds > 0 else 0.0
+        if time.time() - self.tier_rtf_at[tier] < RTF_MAX_AGE:
+            self.tier_rtf[tier] += RTF_SMOOTHING * (rtf - self.tier_rtf[tier])
+        else:
+            # The previous measurement is stale, start over from this decode
+            self.tier_rtf[tier] = rtf
+        self.tier_rtf_at[tier] = time.time()
+        return rtf
 
-    def transcribe(self, audio: np.ndarray) -> Tuple[str, Dict[str, Any]]:
+    def transcribe(
+        self,
+        audio: np.ndarray,
+        initial_prompt: Optional[str] = None,
+        return_segments: bool = False,
+        apply_vad: bool = True,
+        tier: Optional[int] = None,
+        word_timestamps: bool = False,
+    ) -> Tuple[str, Dict[str, Any]]:
         """
         Transcribe audio data to text.
 
         Args:
             audio: Audio data as numpy array
+            initial_prompt: Optional text that precedes this audio, used as decoder context
+            return_segments: Whether to include per-segment text and timings in the metadata
+            apply_vad: Whether to run voice activity detection (if configured) first
+            tier: Model/profile tier to decode with (defaults to the active tier)
+            word_timestamps: Whether returned segments include per-word timings
 
         Returns:
             Tuple[str, Dict[str, Any]]:
@@ -100,39 +303,37 @@ class WhisperTranscriber:
         self.is_processing = True
 
         try:
-            # Handle WAV data (if audio is in uint8 format, it contains WAV headers)
-            if audio.dtype == np.uint8:
-                # First check the RIFF header to confirm this is WAV data
-                header = bytes(audio[:44])
-                if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
-                    # Create a file-like object that Whisper can read from
-                    audio_file = io.BytesIO(bytes(audio))
-                    # The transcribe method expects a file-like object with read method
-                    audio = audio_file
-                else:
-                    # Not a proper WAV header
-                    logger.warning("Received audio data with incorrect WAV header")
-                    # Attempt to process as raw data
-                    audio = (
-                        audio.astype(np.float32) / np.max(np.abs(audio))
-                        if np.max(np.abs(audio)) > 0
-                        else audio
-                    )
-            else:
-                # Normalize audio if it's raw float data
-                audio = (
-                    audio.astype(np.float32) / np.max(np.abs(audio))
-                    if np.max(np.abs(audio)) > 0
-                    else audio
-                )
-
-            # Transcribe
-            segments, info = self.model.transcribe(
-                audio,
-                beam_size=self.beam_size,
-                language="en",  # Force English language
-                vad_filter=False,  # Disable VAD filter since we handle it in the frontend
-            )
+            audio = self.prepare_audio(audio)
+
+            trim_offset = 0.0
+            vad_info = None
+            if apply_vad:
+                audio, vad_info = self._apply_vad(audio)
+                if vad_info is not None:
+                    if not vad_info["speech"]:
+                        return "", self._rejected_metadata(vad_info, start_time)
+                    trim_offset = vad_info["trim_offset"]
+
+            if tier is None:
+                tier = self.active_tier
+            size, options = self._decode_options(tier)
+            if return_segments:
+                # Callers asking for segments rely on their timings
+                options["without_timestamps"] = False
+                options["word_timestamps"] = word_timestamps
+
+            # Transcribe, with the small cascade model first if configured
+            first_size = self._first_pass_model(size)
+            segments, info = self._decode(audio, first_size, options, initial_prompt)
+            cascade_pass, cascade_reason = None, None
+            if first_size != size:
+                cascade_pass = CASCADE_FIRST_PASS
+                cascade_reason = self._escalation_reason(segments)
+                self.cascade_first_passes += 1
+                if cascade_reason:
+                    segments, info = self._decode(audio, size, options, initial_prompt)
+                    cascade_pass = CASCADE_SECOND_PASS
+                    self.cascade_second_passes += 1
 
             # Collect all segment texts
             text_segments = [segment.text for segment in segments]
@@ -140,8 +341,12 @@ class WhisperTranscriber:
 
             # Calculate processing time
             processing_time = time.time() - start_time
+            rtf = self._record_rtf(
+                tier, len(audio) / WHISPER_SAMPLE_RATE, processing_time
+            )
             logger.info(
-                f"Transcription completed in {processing_time:.2f}s: {full_text[:50]}..."
+                f"Transcription completed in {processing_time:.2f}s "
+                f"({self._tier_name(tier)}): {full_text[:50]}..."
             )
 
             metadata = {
@@ -149,7 +354,38 @@ class WhisperTranscriber:
                 "language": getattr(info, "language", "en"),
                 "processing_time": processing_time,
                 "segments_count": len(text_segments),
+                "tier": self._tier_name(tier),
+                "rtf": rtf,
             }
+            if vad_info is not None:
+                metadata["vad_trimmed_seconds"] = vad_info["trimmed_seconds"]
+            if cascade_pass:
+                metadata["cascade_pass"] = cascade_pass
+                metadata["cascade_reason"] = cascade_reason
+                metadata["model"] = (
+                    first_size if cascade_pass == CASCADE_FIRST_PASS else size
+                )
+
+            if return_segments:
+                # Timings stay relative to the audio the caller passed in
+                metadata["segments"] = [
+                    {
+                        "text": segment.text,
+                        "start": segment.start + trim_offset,
+                        "end": segment.end + trim_offset,
+                    }
+                    for segment in segments
+                ]
+                if word_timestamps:
+                    for entry, segment in zip(metadata["segments"], segments):
+                        entry["words"] = [
+                            {
+                                "word": word.word,
+                                "start": word.start + trim_offset,
+                                "end": word.end + trim_offset,
+                            }
+                            for word in segment.words or []
+                        ]
 
             return full_text, metadata
 
@@ -159,37 +395,248 @@ class WhisperTranscriber:
         finally:
             self.is_processing = False
 
-    def transcribe_streaming(self, audio_generator):
+    def _decode(
+        self,
+        audio: np.ndarray,
+        size: str,
+        options: Dict[str, Any],
+        initial_prompt: Optional[str],
+    ) -> Tuple[List[Any], Any]:
+        """Run one model over the audio and materialize its segments."""
+        segments, info = self.models[size].transcribe(
+            audio,
+            language="en",  # Force English language
+            vad_filter=False,  # Disable VAD filter since we handle it in the frontend
+            initial_prompt=initial_prompt,
+            **options,
+        )
+        return list(segments), info
+
+    def prepare_audio(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Convert incoming audio into 16 kHz float32 samples for the model.
+
+        WAV data is parsed in place and resampled directly, so faster-whisper
+        never has to run its container decoder.
+
+        float32 samples already in [-1, 1] (as produced by the ingestion and
+        streaming paths) are passed through unchanged rather than scaled to
+        full peak, so quiet audio stays quiet for the VAD and the model.
+        Other samples, including float32 outside that range, are still
+        normalized by their peak.
+
+        Args:
+            audio: uint8 WAV bytes, 16 kHz float32 samples, or other raw samples
+
+        Returns:
+            Mono float32 samples at 16 kHz
+        """
+        # Handle WAV data (if audio is in uint8 format, it contains WAV headers)
+        if audio.dtype == np.uint8:
+            # First check the RIFF header to confirm this is WAV data
+            if audio[:4].tobytes() == b"RIFF" and audio[8:12].tobytes() == b"WAVE":
+                return wav_to_float32(audio)
+
+            # Not a proper WAV header
+            logger.warning("Received audio data with incorrect WAV header")
+
+        # Normalize audio if it's other raw data (attempt to process it as samples)
+        peak = np.max(np.abs(audio)) if audio.size else 0
+
+        # float32 samples in range are already model-ready (e.g. from the ingestion path)
+        if audio.dtype == np.float32 and peak <= 1.0:
+            return audio
+
+        return audio.astype(np.float32) / peak if peak > 0 else audio.astype(np.float32)
+
+    def _apply_vad(
+        self, audio: np.ndarray
+    ) -> Tuple[np.ndarray, Optional[Dict[str, Any]]]:
+        """
+        Trim silence with the voice activity detector, if one is configured.
+
+        Returns:
+            Tuple of the (possibly trimmed) audio and the detector result, or
+            None when no detector is configured
+        """
+        if self.vad is None or audio.size == 0:
+            return audio, None
+        return self.vad.process(audio)
+
+    @staticmethod
+    def _rejected_metadata(
+        vad_info: Dict[str, Any], start_time: float
+    ) -> Dict[str, Any]:
+        """Build the metadata returned for segments that contain no speech."""
+        logger.info(
+            f"Rejected non-speech segment ({vad_info['trimmed_seconds']:.2f}s) before transcription"
+        )
+        return {
+            "vad_rejected": True,
+            "vad_trimmed_seconds": vad_info["trimmed_seconds"],
+            "processing_time": time.time() - start_time,
+            "segments_count": 0,
+        }
+
+    def transcribe_batch(
+        self, audios: List[np.ndarray], tier: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, Any]]]:
         """
-        Stream transcription results from an audio generator.
+        Transcribe several independent audio segments in one batched decode.
+
+        Segments are laid out back to back and decoded through faster-whisper's
+        batched inference pipeline with one clip per segment, so a single
+        encoder/decoder pass serves every caller. Segments longer than one
+        Whisper window fall back to sequential decoding.
 
         Args:
-            audio_generator: Generator yielding audio chunks
+            audios: Audio segments, each in any format accepted by transcribe()
+            tier: Model/profile tier to decode with (defaults to the active tier)
 
-        Yields:
-            Partial transcription results as they become available
+        Returns:
+            List of (text, metadata) tuples in the same order as the input
         """
-        self.is_processing = True
+        start_time = time.time()
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(audios)
 
         try:
-            # Process the streaming transcription
-            segments = self.model.transcribe_with_vad(audio_generator, language="en")
-
-            # Yield each segment as it's transcribed
-            for segment in segments:
-                yield {
-                    "text": segment.text,
-                    "start": segment.start,
-                    "end": segment.end,
-                    "confidence": segment.avg_logprob,
-                }
+            self.is_processing = True
+
+            # Decode everything to 16 kHz float32 so segments can be concatenated
+            waveforms = [self.prepare_audio(audio) for audio in audios]
+
+            # Trim silence and answer non-speech segments without decoding them
+            vad_infos: List[Optional[Dict[str, Any]]] = [None] * len(audios)
+            for i, waveform in enumerate(waveforms):
+                waveforms[i], vad_infos[i] = self._apply_vad(waveform)
+                if vad_infos[i] is not None and not vad_infos[i]["speech"]:
+                    results[i] = ("", self._rejected_metadata(vad_infos[i], start_time))
+
+            max_samples = WHISPER_CHUNK_SECONDS * WHISPER_SAMPLE_RATE
+            batch_indices = [
+                i
+                for i, wave in enumerate(waveforms)
+                if results[i] is None and 0 < len(wave) <= max_samples
+            ]
+
+            if len(batch_indices) > 1:
+                if tier is None:
+                    tier = self.active_tier
+                size, options = self._decode_options(tier)
+                options["without_timestamps"] = True
+
+                # First pass (the small cascade model if configured)
+                first_size = self._first_pass_model(size)
+                clip_segments, info = self._decode_batch(
+                    waveforms, batch_indices, first_size, options
+                )
+                passes: Dict[int, Optional[str]] = {i: None for i in batch_indices}
+                reasons: Dict[int, Optional[str]] = {i: None for i in batch_indices}
+
+                # Second pass over the segments the small model was unsure about
+                if first_size != size:
+                    self.cascade_first_passes += len(batch_indices)
+                    for i in batch_indices:
+                        passes[i] = CASCADE_FIRST_PASS
+                        reasons[i] = self._escalation_reason(clip_segments[i])
+                    escalated = [i for i in batch_indices if reasons[i]]
+                    if escalated:
+                        second_segments, _ = self._decode_batch(
+                            waveforms, escalated, size, options
+                        )
+                        clip_segments.update(second_segments)
+                        for i in escalated:
+                            passes[i] = CASCADE_SECOND_PASS
+                        self.cascade_second_passes += len(escalated)
+
+                processing_time = time.time() - start_time
+                total_samples = sum(len(waveforms[i]) for i in batch_indices)
+                rtf = self._record_rtf(
+                    tier, total_samples / WHISPER_SAMPLE_RATE, processing_time
+                )
+                for i in batch_indices:
+                    segments = clip_segments[i]
+                    metadata = {
+                        "confidence": (
+                            float(np.mean([s.avg_logprob for s in segments]))
+                            if segments
+                            else 0
+                        ),
+                        "language": getattr(info, "language", "en"),
+                        "processing_time": processing_time,
+                        "segments_count": len(segments),
+                        "batch_size": len(batch_indices),
+                        "tier": self._tier_name(tier),
+                        "rtf": rtf,
+                    }
+                    if vad_infos[i] is not None:
+                        metadata["vad_trimmed_seconds"] = vad_infos[i]["trimmed_seconds"]
+                    if passes[i]:
+                        metadata["cascade_pass"] = passes[i]
+                        metadata["cascade_reason"] = reasons[i]
+                        metadata["model"] = (
+                            first_size if passes[i] == CASCADE_FIRST_PASS else size
+                        )
+                    results[i] = (" ".join(s.text for s in segments).strip(), metadata)
+
+                logger.info(
+                    f"Batched transcription of {len(batch_indices)} segments "
+                    f"completed in {processing_time:.2f}s"
+                )
+
+            # Anything not covered by the batch is decoded on its own
+            for i, waveform in enumerate(waveforms):
+                if results[i] is None:
+                    results[i] = self.transcribe(waveform, apply_vad=False, tier=tier)
+
+            return results
 
         except Exception as e:
-            logger.error(f"Streaming transcription error: {e}")
-            yield {"error": str(e)}
+            logger.error(f"Batched transcription error: {e}")
+            return [
+                result if result is not None else ("", {"error": str(e)})
+                for result in results
+            ]
         finally:
             self.is_processing = False
 
+    def _decode_batch(
+        self,
+        waveforms: List[np.ndarray],
+        indices: List[int],
+        size: str,
+        options: Dict[str, Any],
+    ) -> Tuple[Dict[int, List[Any]], Any]:
+        """
+        Decode the selected waveforms as clips of one batched decode.
+
+        Returns:
+            Tuple of the segments decoded for each index, and the transcription info
+        """
+        clips = []
+        offset = 0
+        for i in indices:
+            clips.append({"start": offset, "end": offset + len(waveforms[i])})
+            offset += len(waveforms[i])
+        combined = np.concatenate([waveforms[i] for i in indices])
+        clip_starts = [clip["start"] / WHISPER_SAMPLE_RATE for clip in clips]
+
+        segments, info = self.batched_models[size].transcribe(
+            combined,
+            language="en",  # Force English language
+            vad_filter=False,  # Clip boundaries are the segment boundaries
+            clip_timestamps=clips,
+            batch_size=len(clips),
+            **options,
+        )
+
+        # Route each decoded segment back to the clip it started in
+        clip_segments: Dict[int, List[Any]] = {i: [] for i in indices}
+        for segment in segments:
+            clip = bisect.bisect_right(clip_starts, segment.start + 1e-3) - 1
+            clip_segments[indices[max(0, clip)]].append(segment)
+        return clip_segments, info
+
     def get_config(self) -> Dict[str, Any]:
         """
         Get the current configuration.
@@ -203,7 +650,29 @@ class WhisperTranscriber:
             "compute_type": self.compute_type,
             "beam_size": self.beam_size,
             "sample_rate": self.sample_rate,
+            "num_workers": self.num_workers,
+            "cpu_threads": self.cpu_threads,
+            "autotune": (
+                {k: v for k, v in self.autotune.items() if k != "candidates"}
+                if self.autotune
+                else None
+            ),
+            "tiers": [self._tier_name(i) for i in range(len(self.tiers))],
+            "tier_queue_depths": self.tier_queue_depths,
+            "active_tier": self._tier_name(self.active_tier),
+            "tier_rtf": {
+                self._tier_name(i): self.tier_rtf[i] for i in range(len(self.tiers))
+            },
+            "cascade": {
+                "model": self.cascade_model,
+                "logprob_threshold": self.cascade_logprob_threshold,
+                "compression_threshold": self.cascade_compression_threshold,
+                "no_speech_threshold": self.cascade_no_speech_threshold,
+                "first_passes": self.cascade_first_passes,
+                "second_passes": self.cascade_second_passes,
+            },
             "is_processing": self.is_processing,
+            "vad": self.vad.get_stats() if self.vad is not None else None,
         }
 
     def reset_state(self) -> None:
@@ -0,0 +1,596 @@
+"""
+Transcription Scheduler
+
+Runs Whisper transcription on a bounded pool of worker threads so decoding
+never blocks the asyncio event loop.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Deque, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_ingest import parse_wav_header
+from .long_form import split_long_audio, stitch_transcripts
+from .transcription import WhisperTranscriber, WHISPER_SAMPLE_RATE
+from .vad import VoiceActivityDetector
+from .whisper_autotune import autotune
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def audio_duration(audio: np.ndarray) -> float:
+    """Duration of a request's audio in seconds, read from the WAV header if present."""
+    if audio.dtype == np.uint8:
+        try:
+            header = parse_wav_header(audio)
+        except ValueError:
+            return 0.0
+        frame_size = header["channels"] * header["bits_per_sample"] // 8
+        return header["data_size"] / max(1, frame_size) / header["sample_rate"]
+    return len(audio) / WHISPER_SAMPLE_RATE
+
+
+class _TranscriptionJob:
+    """A queued transcription request waiting for a worker."""
+
+    __slots__ = ("audio", "options", "future", "enqueued_at", "group")
+
+    def __init__(
+        self,
+        audio: np.ndarray,
+        options: Dict[str, Any],
+        future: asyncio.Future,
+        group: Optional[object] = None,
+    ):
+        self.audio = audio
+        self.options = options
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        # Windows of one long-form request share a group and a queue slot
+        self.group = group
+
+
+class TranscriptionScheduler:
+    """
+    Schedules transcription requests onto a fixed number of Whisper workers.
+
+    Requests wait in a bounded per-server queue. When the queue is full new
+    work is either rejected or the oldest waiting request is shed, depending
+    on the overflow policy.
+
+    With batching enabled, plain requests that arrive within a short window
+    are grouped (up to a maximum batch size) and decoded together through
+    WhisperTranscriber.transcribe_batch, then fanned back out to each caller.
+
+    The transcriber's model/profile tier is chosen from the queue depth each
+    time work is handed to a worker.
+
+    With more than one worker, long utterances are split into overlapping
+    windows decoded in parallel across the workers and stitched back
+    together afterwards. The windows are admitted as one request, so they
+    take a single queue slot.
+    """
+
+    OVERFLOW_POLICIES = ("reject", "shed_oldest")
+
+    def __init__(
+        self,
+        transcriber: WhisperTranscriber,
+        max_workers: int = 1,
+        max_queue_size: int = 16,
+        overflow_policy: str = "reject",
+        batching: bool = False,
+        batch_window: float = 0.05,
+        max_batch_size: int = 8,
+        long_form_seconds: float = 30.0,
+        long_form_window: float = 12.0,
+        long_form_overlap: float = 1.0,
+    ):
+        """
+        Initialize the transcription scheduler.
+
+        Args:
+            transcriber: Whisper transcription service doing the actual decoding
+            max_workers: Number of transcriptions allowed to run concurrently
+            max_queue_size: Maximum number of requests waiting for a worker
+            overflow_policy: What to do when the queue is full ('reject' or 'shed_oldest')
+            batching: Whether to group concurrent requests into batched decodes
+            batch_window: Seconds to wait for more requests before starting a batch
+            max_batch_size: Maximum number of segments decoded in one batch
+            long_form_seconds: Plain requests at least this long are split into
+                windows when there is more than one worker (0 disables)
+            long_form_window: Length of each window in seconds, overlap included
+            long_form_overlap: Seconds of audio shared by neighbouring windows
+        """
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{overflow_policy}', "
+                f"expected one of {self.OVERFLOW_POLICIES}"
+            )
+
+        self.transcriber = transcriber
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(0, max_queue_size)
+        self.overflow_policy = overflow_policy
+        self.batching = batching
+        self.batch_window = max(0.0, batch_window)
+        self.max_batch_size = max(1, max_batch_size)
+        self.long_form_seconds = max(0.0, long_form_seconds)
+        self.long_form_window = min(long_form_window, 30.0)
+        self.long_form_overlap = max(0.0, long_form_overlap)
+
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="whisper"
+        )
+
+        # Queue state (only touched from the event loop thread)
+        self._queue: Deque[_TranscriptionJob] = deque()
+        self._active = 0
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+
+        # Statistics
+        self.batch_count = 0
+        self.batched_segments = 0
+        self.started_count = 0
+        self.completed_count = 0
+        self.rejected_count = 0
+        self.shed_count = 0
+        self.max_queue_depth = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.last_wait_time = 0.0
+        self.long_form_count = 0
+        self.long_form_windows = 0
+
+        logger.info(
+            f"Initialized Transcription Scheduler with workers={self.max_workers}, "
+            f"max_queue_size={self.max_queue_size}, overflow_policy={overflow_policy}, "
+            f"batching={batching}"
+        )
+
+    @property
+    def is_processing(self) -> bool:
+        """Whether any transcription is currently running or waiting."""
+        return self._active > 0 or bool(self._queue)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a worker."""
+        return len(self._queue)
+
+    def _queued_requests(self) -> int:
+        """Number of waiting requests, counting a long-form request's windows once."""
+        return len({job.group or job for job in self._queue})
+
+    def transcribe(self, audio: np.ndarray, **options) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe audio synchronously, bypassing the queue.
+
+        Only intended for callers that already run off the event loop.
+        """
+        return self.transcriber.transcribe(audio, **options)
+
+    async def transcribe_async(
+        self, audio: np.ndarray, **options
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe audio on the worker pool without blocking the event loop.
+
+        Args:
+            audio: Audio data as numpy array
+            **options: Extra keyword arguments passed to WhisperTranscriber.transcribe
+
+        Returns:
+            Tuple[str, Dict[str, Any]]:
+                - Transcribed text (empty if the request was rejected or shed)
+                - Dictionary with additional information, including queue wait time
+        """
+        # Splitting only pays off when the windows can run side by side
+        if (
+            not options
+            and self.long_form_seconds
+            and self.max_workers > 1
+            and audio_duration(audio) >= self.long_form_seconds
+        ):
+            return await self._transcribe_long(audio)
+
+        overflow = self._admit()
+        if overflow:
+            return "", overflow
+        return await self._submit(audio, options)
+
+    def _admit(self) -> Optional[Dict[str, Any]]:
+        """
+        Make room for one more request under the overflow policy.
+
+        Returns:
+            None if the request may be queued, else the metadata it is rejected with
+        """
+        if (
+            self._queued_requests() < self.max_queue_size
+            or self._active < self.max_workers
+        ):
+            return None
+
+        if self.overflow_policy == "shed_oldest" and self._queue:
+            # Shedding a long-form window sheds the rest of its request too
+            group = self._queue[0].group or self._queue[0]
+            shed_jobs = [job for job in self._queue if (job.group or job) is group]
+            for shed_job in shed_jobs:
+                self._queue.remove(shed_job)
+                if not shed_job.future.done():
+                    shed_job.future.set_result(
+                        ("", self._overflow_metadata("Transcription request shed"))
+                    )
+            self.shed_count += 1
+            logger.warning(
+                f"Transcription queue full, shedding oldest request "
+                f"(shed total: {self.shed_count})"
+            )
+            return None
+
+        self.rejected_count += 1
+        logger.warning(
+            f"Transcription queue full ({self._queued_requests()} waiting), "
+            f"rejecting request (rejected total: {self.rejected_count})"
+        )
+        return self._overflow_metadata("Transcription queue full")
+
+    async def _submit(
+        self, audio: np.ndarray, options: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Queue an admitted transcription request and wait for its result."""
+        job = self._enqueue(audio, options)
+        self._dispatch(asyncio.get_running_loop())
+        return await self._wait(job)
+
+    def _enqueue(
+        self,
+        audio: np.ndarray,
+        options: Dict[str, Any],
+        group: Optional[object] = None,
+    ) -> _TranscriptionJob:
+        """Add an admitted job to the queue (the caller dispatches it)."""
+        job = _TranscriptionJob(
+            audio, options, asyncio.get_running_loop().create_future(), group
+        )
+        self._queue.append(job)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        return job
+
+    async def _wait(self, job: _TranscriptionJob) -> Tuple[str, Dict[str, Any]]:
+        """Wait for a queued job's result."""
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            # Drop the request if it never reached a worker
+            try:
+                self._queue.remove(job)
+            except ValueError:
+                pass
+            raise
+
+    async def _transcribe_long(self, audio: np.ndarray) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe a long utterance as parallel overlapping windows.
+
+        The request takes one queue slot however many windows it has.
+        Windows are decoded with word timings so the overlaps can be stitched
+        by timestamp. If any window is shed, the others are cancelled.
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: Stitched transcript and combined metadata
+        """
+        start_time = time.time()
+        samples = await asyncio.to_thread(self.transcriber.prepare_audio, audio)
+        windows = split_long_audio(
+            samples, self.long_form_window, self.long_form_overlap
+        )
+
+        overflow = self._admit()
+        if overflow:
+            return "", overflow
+        self.long_form_count += 1
+        self.long_form_windows += len(windows)
+
+        # Queue every window before dispatching, as one request
+        options = {"return_segments": True, "word_timestamps": True}
+        group = object()
+        jobs = [
+            self._enqueue(samples[start:end], options, group) for start, end in windows
+        ]
+        self._dispatch(asyncio.get_running_loop())
+        tasks = [asyncio.create_task(self._wait(job)) for job in jobs]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                _, metadata = await next_result
+                if metadata.get("error"):
+                    return "", metadata
+        finally:
+            for task in tasks:
+                task.cancel()
+        results = [task.result() for task in tasks]
+
+        text = stitch_transcripts(
+            windows, [metadata.get("segments", []) for _, metadata in results]
+        )
+        processing_time = time.time() - start_time
+        logger.info(
+            f"Long-form transcription of {len(samples) / WHISPER_SAMPLE_RATE:.1f}s "
+            f"in {len(windows)} windows completed in {processing_time:.2f}s"
+        )
+
+        metadata = dict(results[0][1])
+        metadata.update(
+            {
+                "confidence": float(
+                    np.mean([m.get("confidence", 0) for _, m in results])
+                ),
+                "processing_time": processing_time,
+                "segments_count": sum(m.get("segments_count", 0) for _, m in results),
+                "queue_wait_time": max(m.get("queue_wait_time", 0) for _, m in results),
+                "long_form_windows": len(windows),
+            }
+        )
+        metadata.pop("vad_rejected", None)
+        metadata.pop("segments", None)
+        return text, metadata
+
+    def _overflow_metadata(self, error: str) -> Dict[str, Any]:
+        """Build the metadata returned for rejected or shed requests."""
+        return {
+            "error": error,
+            "rejected": True,
+            "queue_depth": len(self._queue),
+        }
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start queued jobs while workers are available."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+
+        while self._active < self.max_workers and self._queue:
+            if not self._queue[0].options and self.batching:
+                jobs = self._take_batch(loop)
+                if not jobs:
+                    break
+            else:
+                jobs = [self._queue.popleft()]
+
+            jobs = [job for job in jobs if not job.future.done()]
+            if jobs:
+                self._start(loop, jobs)
+
+    def _take_batch(
+        self, loop: asyncio.AbstractEventLoop
+    ) -> List[_TranscriptionJob]:
+        """
+        Collect a batch of plain requests from the front of the queue.
+
+        Returns an empty list (and arms a timer) when the batch window of the
+        oldest request has not elapsed yet and the batch is not full.
+        """
+        batchable = 0
+        for job in self._queue:
+            if job.options or batchable >= self.max_batch_size:
+                break
+            batchable += 1
+
+        waited = time.monotonic() - self._queue[0].enqueued_at
+        if batchable < self.max_batch_size and waited < self.batch_window:
+            self._batch_timer = loop.call_later(
+                self.batch_window - waited, self._dispatch, loop
+            )
+            return []
+
+        return [self._queue.popleft() for _ in range(batchable)]
+
+    def _start(
+        self, loop: asyncio.AbstractEventLoop, jobs: List[_TranscriptionJob]
+    ) -> None:
+        """Hand a job (or a batch of jobs) to a worker thread."""
+        now = time.monotonic()
+        wait_times = [now - job.enqueued_at for job in jobs]
+        for wait_time in wait_times:
+            self.last_wait_time = wait_time
+            self.total_wait_time += wait_time
+            self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        self.started_count += len(jobs)
+        if len(jobs) > 1:
+            self.batch_count += 1
+            self.batched_segments += len(jobs)
+
+        tier = self.transcriber.select_tier(len(self._queue))
+
+        self._active += 1
+        worker_future = loop.run_in_executor(
+            self.executor, self._run_jobs, jobs, wait_times, tier
+        )
+        worker_future.add_done_callback(
+            lambda f, jobs=jobs: self._on_jobs_done(loop, jobs, f)
+        )
+
+    def _run_jobs(
+        self, jobs: List[_TranscriptionJob], wait_times: List[float], tier: int
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Run a single job or a batch of jobs on a worker thread."""
+        if len(jobs) == 1:
+            options = {"tier": tier, **jobs[0].options}
+            results = [self.transcriber.transcribe(jobs[0].audio, **options)]
+        else:
+            results = self.transcriber.transcribe_batch(
+                [job.audio for job in jobs], tier=tier
+            )
+
+        for (_, metadata), wait_time in zip(results, wait_times):
+            metadata["queue_wait_time"] = wait_time
+        return results
+
+    def _on_jobs_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        jobs: List[_TranscriptionJob],
+        worker_future: asyncio.Future,
+    ) -> None:
+        """Fan worker results back out to the callers and start the next jobs."""
+        self._active -= 1
+        self.completed_count += len(jobs)
+
+        if worker_future.cancelled():
+            results = None
+        elif worker_future.exception() is not None:
+            error = worker_future.exception()
+            logger.error(f"Transcription worker error: {error}")
+            results = [("", {"error": str(error)}) for _ in jobs]
+        else:
+            results = worker_future.result()
+
+        for i, job in enumerate(jobs):
+            if job.future.done():
+                continue
+            if results is None:
+                job.future.cancel()
+            else:
+                job.future.set_result(results[i])
+
+        self._dispatch(loop)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue statistics.
+
+        Returns:
+            Dict containing queue depth, wait time and overflow counters
+        """
+        started = self.started_count
+        return {
+            "batching": self.batching,
+            "batch_window": self.batch_window,
+            "max_batch_size": self.max_batch_size,
+            "batches": self.batch_count,
+            "avg_batch_size": (
+                self.batched_segments / self.batch_count if self.batch_count else 0.0
+            ),
+            "workers": self.max_workers,
+            "active": self._active,
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self.max_queue_depth,
+            "max_queue_size": self.max_queue_size,
+            "overflow_policy": self.overflow_policy,
+            "completed": self.completed_count,
+            "rejected": self.rejected_count,
+            "shed": self.shed_count,
+            "avg_wait_time": self.total_wait_time / started if started else 0.0,
+            "max_wait_time": self.max_wait_time,
+            "last_wait_time": self.last_wait_time,
+            "long_form_seconds": self.long_form_seconds,
+            "long_form_requests": self.long_form_count,
+            "long_form_windows": self.long_form_windows,
+        }
+
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the current configuration.
+
+        Returns:
+            Dict containing the transcriber configuration and scheduler statistics
+        """
+        config = self.transcriber.get_config()
+        config["is_processing"] = self.is_processing
+        config["scheduler"] = self.get_stats()
+        return config
+
+    def reset_state(self) -> None:
+        """
+        Forcibly reset the transcription service state.
+
+        Running decodes cannot be stopped, but their results are discarded by
+        the cancelled callers.
+        """
+        self.transcriber.reset_state()
+
+    def shutdown(self) -> None:
+        """Stop accepting work and release the worker threads."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+        while self._queue:
+            job = self._queue.popleft()
+            if not job.future.done():
+                job.future.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Transcription scheduler shut down")
+
+
+def create_transcription_service(cfg: Dict[str, Any]) -> TranscriptionScheduler:
+    """
+    Build the transcription service from configuration.
+
+    Args:
+        cfg: Configuration dictionary as returned by config.get_config()
+
+    Returns:
+        TranscriptionScheduler wrapping the Whisper transcriber
+    """
+    # Server-side silence trimming and non-speech rejection
+    vad = None
+    if cfg["vad_mode"] != "off":
+        vad = VoiceActivityDetector(
+            threshold=cfg["vad_threshold"],
+            padding_ms=cfg["vad_buffer_size"],
+            mode=cfg["vad_mode"],
+            min_speech_ms=cfg["vad_min_speech_ms"],
+        )
+
+    # Measured compute type and thread counts for this host, if enabled
+    tuning = None
+    compute_type = None
+    cpu_threads = 0
+    workers = cfg["transcription_workers"]
+    if cfg["whisper_autotune"]:
+        try:
+            tuning = autotune(cfg["whisper_model"], clip_path=cfg["whisper_autotune_clip"])
+            compute_type = tuning["compute_type"]
+            cpu_threads = tuning["cpu_threads"]
+            workers = tuning["num_workers"]
+        except Exception as e:
+            logger.error(f"Whisper autotune failed, using defaults: {e}")
+
+    # Whisper models behind a bounded worker pool
+    transcriber = WhisperTranscriber(
+        model_size=cfg["whisper_model"],
+        device=tuning["device"] if tuning else None,
+        compute_type=compute_type,
+        sample_rate=cfg["audio_sample_rate"],
+        num_workers=workers,
+        cpu_threads=cpu_threads,
+        autotune=tuning,
+        vad=vad,
+        tier_models=cfg["whisper_tier_models"],
+        tier_queue_depths=cfg["whisper_tier_queue_depths"],
+        max_rtf=cfg["whisper_tier_max_rtf"],
+        cascade_model=cfg["whisper_cascade_model"],
+        cascade_logprob_threshold=cfg["whisper_cascade_logprob_threshold"],
+        cascade_compression_threshold=cfg["whisper_cascade_compression_threshold"],
+        cascade_no_speech_threshold=cfg["whisper_cascade_no_speech_threshold"],
+    )
+    return TranscriptionScheduler(
+        transcriber,
+        max_workers=workers,
+        max_queue_size=cfg["transcription_queue_size"],
+        overflow_policy=cfg["transcription_overflow_policy"],
+        batching=cfg["whisper_batching"],
+        batch_window=cfg["whisper_batch_window_ms"] / 1000,
+        max_batch_size=cfg["whisper_max_batch_size"],
+        long_form_seconds=cfg["long_form_min_seconds"],
+        long_form_window=cfg["long_form_window_seconds"],
+        long_form_overlap=cfg["long_form_overlap_seconds"],
+    )
@@ -0,0 +1,445 @@
+"""
+Whisper Model Server
+
+Runs the Whisper models in a single local process so that any number of web
+workers can share them. Web workers talk to it over a Unix socket and hand
+audio over through shared memory.
+
+Start it with:
+    python -m backend.services.transcription_server [--socket PATH]
+and point the web workers at it with TRANSCRIPTION_SERVER_SOCKET.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import struct
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "/tmp/vocalis-whisper.sock"
+
+# Messages are length-prefixed JSON; audio never travels over the socket
+_HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars found in transcription metadata."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def write_message(writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+    """Write one framed message (a single write, so frames never interleave)."""
+    body = json.dumps(message, default=_json_default).encode("utf-8")
+    writer.write(_HEADER.pack(len(body)) + body)
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """
+    Read one framed message.
+
+    Returns:
+        The decoded message, or None when the connection was closed
+    """
+    try:
+        header = await reader.readexactly(_HEADER.size)
+        (size,) = _HEADER.unpack(header)
+        if size > MAX_MESSAGE_SIZE:
+            raise ValueError(f"Message of {size} bytes exceeds the size limit")
+        return json.loads(await reader.readexactly(size))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+class TranscriptionServer:
+    """
+    Serves a transcription scheduler to web workers over a Unix socket.
+
+    Each transcribe request names a shared memory block holding the audio.
+    The block is mapped and decoded in place, so the audio is copied once
+    (into shared memory by the client) no matter how large it is. Inference
+    concurrency is governed by the single scheduler behind the server.
+    """
+
+    def __init__(self, service, socket_path: str = DEFAULT_SOCKET_PATH):
+        """
+        Initialize the model server.
+
+        Args:
+            service: Transcription scheduler owning the Whisper models
+            socket_path: Filesystem path of the Unix socket to listen on
+        """
+        self.service = service
+        self.socket_path = socket_path
+        self.connections = 0
+        self.requests = 0
+
+        # Shared memory blocks still referenced by a running decode
+        self._open_blocks: List[SharedMemory] = []
+
+    async def serve_forever(self) -> None:
+        """Listen on the Unix socket until cancelled."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.socket_path
+        )
+        os.chmod(self.socket_path, 0o600)
+        logger.info(f"Transcription server listening on {self.socket_path}")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.service.shutdown()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one web worker; requests on a connection run concurrently."""
+        self.connections += 1
+        tasks: Dict[int, asyncio.Task] = {}
+        logger.info(f"Web worker connected ({self.connections} connected)")
+
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+
+                op = message.get("op")
+                request_id = message.get("id")
+                if op == "transcribe":
+                    task = asyncio.create_task(self._transcribe(message, writer))
+                    tasks[request_id] = task
+                    task.add_done_callback(lambda _, rid=request_id: tasks.pop(rid, None))
+                elif op == "cancel":
+                    task = tasks.get(message.get("target"))
+                    if task:
+                        task.cancel()
+                elif op == "config":
+                    self._reply(writer, {"id": request_id, "config": self.get_config()})
+                elif op == "reset":
+                    self.service.reset_state()
+                    self._reply(writer, {"id": request_id})
+                else:
+                    self._reply(writer, {"id": request_id, "error": f"Unknown op '{op}'"})
+        except Exception as e:
+            logger.error(f"Transcription server connection error: {e}")
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            writer.close()
+            self.connections -= 1
+            logger.info(f"Web worker disconnected ({self.connections} connected)")
+
+    def _reply(self, writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        """Send a reply, piggybacking the current load for the client's properties."""
+        message["queue_depth"] = self.service.queue_depth
+        message["is_processing"] = self.service.is_processing
+        if not writer.is_closing():
+            write_message(writer, message)
+
+    async def _transcribe(
+        self, message: Dict[str, Any], writer: asyncio.StreamWriter
+    ) -> None:
+        """Decode the audio in a shared memory block and reply with the result."""
+        self.requests += 1
+        block = None
+        try:
+            block = SharedMemory(name=message["shm"])
+            # The client owns (and unlinks) the block
+            resource_tracker.unregister(block._name, "shared_memory")
+
+            dtype = np.dtype(message["dtype"])
+            audio = np.ndarray(
+                (message["nbytes"] // dtype.itemsize,), dtype=dtype, buffer=block.buf
+            )
+            text, metadata = await self.service.transcribe_async(
+                audio, **message.get("options", {})
+            )
+            del audio
+        except Exception as e:
+            logger.error(f"Transcription server request failed: {e}")
+            text, metadata = "", {"error": str(e)}
+        finally:
+            if block is not None:
+                self._release(block)
+
+        self._reply(writer, {"id": message["id"], "result": [text, metadata]})
+        await writer.drain()
+
+    def _release(self, block: SharedMemory) -> None:
+        """
+        Unmap a shared memory block.
+
+        A cancelled request may still be decoding on a worker thread that holds
+        a view of the block, so blocks that are still exported are kept and
+        retried on the next release.
+        """
+        still_open = []
+        for candidate in self._open_blocks + [block]:
+            try:
+                candidate.close()
+            except BufferError:
+                still_open.append(candidate)
+        self._open_blocks = still_open
+
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the current configuration.
+
+        Returns:
+            Dict containing the transcription configuration and server statistics
+        """
+        config = self.service.get_config()
+        config["server"] = {
+            "socket": self.socket_path,
+            "pid": os.getpid(),
+            "connections": self.connections,
+            "requests": self.requests,
+        }
+        return config
+
+
+class RemoteTranscriptionService:
+    """
+    Client side of the model server, used by web workers.
+
+    It mirrors the TranscriptionScheduler interface (transcribe_async,
+    is_processing, queue_depth, get_config, reset_state, shutdown), so the
+    rest of the backend does not know whether the models are in process.
+    All requests share one connection and are matched up by id.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        """
+        Initialize the remote transcription client.
+
+        Args:
+            socket_path: Filesystem path of the model server's Unix socket
+        """
+        self.socket_path = socket_path
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+
+        # Server state as of the last reply
+        self._queue_depth = 0
+        self._server_processing = False
+        self._config: Dict[str, Any] = {}
+
+        logger.info(f"Initialized Remote Transcription Service with socket={socket_path}")
+
+    @property
+    def is_processing(self) -> bool:
+        """Whether this worker or the server has transcriptions in flight."""
+        return bool(self._pending) or self._server_processing
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a worker on the server."""
+        return self._queue_depth
+
+    @property
+    def connected(self) -> bool:
+        """Whether the connection to the server is open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def _ensure_connected(self) -> None:
+        """Connect to the server if not connected yet."""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.connected:
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                self.socket_path
+            )
+            self._reader_task = asyncio.create_task(self._read_replies())
+            logger.info(f"Connected to transcription server at {self.socket_path}")
+
+    async def _read_replies(self) -> None:
+        """Resolve pending requests as their replies arrive."""
+        error = "Transcription server closed the connection"
+        try:
+            while True:
+                message = await read_message(self._reader)
+                if message is None:
+                    break
+                self._queue_depth = message.get("queue_depth", self._queue_depth)
+                self._server_processing = message.get(
+                    "is_processing", self._server_processing
+                )
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except Exception as e:
+            error = f"Transcription server connection error: {e}"
+            logger.error(error)
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_result({"error": error})
+            self._pending.clear()
+
+    async def _request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request and wait for its reply."""
+        await self._ensure_connected()
+
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        write_message(self._writer, {**message, "id": request_id})
+
+        try:
+            await self._writer.drain()
+            return await future
+        except asyncio.CancelledError:
+            # Let the server drop the request too
+            self._pending.pop(request_id, None)
+            if self.connected:
+                write_message(self._writer, {"op": "cancel", "target": request_id})
+            raise
+
+    async def transcribe_async(
+        self, audio: np.ndarray, **options
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Transcribe audio on the model server.
+
+        Args:
+            audio: Audio data as numpy array
+            **options: Extra keyword arguments passed to WhisperTranscriber.transcribe
+
+        Returns:
+            Tuple[str, Dict[str, Any]]:
+                - Transcribed text
+                - Dictionary with additional information
+        """
+        audio = np.ascontiguousarray(audio)
+        block = SharedMemory(create=True, size=max(1, audio.nbytes))
+        try:
+            np.ndarray(audio.shape, dtype=audio.dtype, buffer=block.buf)[:] = audio
+            reply = await self._request(
+                {
+                    "op": "transcribe",
+                    "shm": block.name,
+                    "nbytes": audio.nbytes,
+                    "dtype": audio.dtype.str,
+                    "options": options,
+                }
+            )
+        except (OSError, ConnectionError) as e:
+            logger.error(f"Transcription server unavailable: {e}")
+            return "", {"error": f"Transcription server unavailable: {e}"}
+        finally:
+            block.close()
+            block.unlink()
+
+        if "result" not in reply:
+            return "", {"error": reply.get("error", "Invalid transcription server reply")}
+        text, metadata = reply["result"]
+        return text, metadata
+
+    async def refresh_config(self) -> Dict[str, Any]:
+        """Fetch the configuration from the server."""
+        try:
+            reply = await self._request({"op": "config"})
+            self._config = reply.get("config", self._config)
+        except (OSError, ConnectionError) as e:
+            logger.error(f"Transcription server unavailable: {e}")
+        return self._config
+
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the current configuration.
+
+        The server configuration is the one last fetched; a refresh is started
+        in the background unless one is already in flight.
+
+        Returns:
+            Dict containing the server configuration and client state
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            try:
+                self._refresh_task = asyncio.get_running_loop().create_task(
+                    self.refresh_config()
+                )
+            except RuntimeError:
+                pass
+
+        config = dict(self._config)
+        config["is_processing"] = self.is_processing
+        config["remote"] = {
+            "socket": self.socket_path,
+            "connected": self.connected,
+            "in_flight": len(self._pending),
+        }
+        return config
+
+    def reset_state(self) -> None:
+        """Ask the server to reset its transcription state."""
+        if self.connected:
+            self._next_id += 1
+            write_message(self._writer, {"op": "reset", "id": self._next_id})
+
+    def shutdown(self) -> None:
+        """Close the connection to the server."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+        logger.info("Remote transcription client shut down")
+
+
+def main() -> None:
+    """Run the model server with the backend configuration."""
+    from .. import config
+    from .transcription_scheduler import create_transcription_service
+
+    parser = argparse.ArgumentParser(description="Vocalis Whisper model server")
+    parser.add_argument(
+        "--socket",
+        default=config.TRANSCRIPTION_SERVER_SOCKET or DEFAULT_SOCKET_PATH,
+        help="Unix socket path to listen on",
+    )
+    args = parser.parse_args()
+
+    server = TranscriptionServer(
+        create_transcription_service(config.get_config()), args.socket
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("Transcription server stopped")
+
+
+if __name__ == "__main__":
+    main()
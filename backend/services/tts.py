@@ -11,21 +11,185 @@ import io
 import time
 import base64
 import asyncio
+import struct
 from typing import Dict, Any, List, Optional, BinaryIO, Generator, AsyncGenerator
 from concurrent.futures import ThreadPoolExecutor
 import threading
 
+import httpx
+
+from .audio_cache import AudioCache
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Weight of the latest request in the typical synthesis time per character
+SYNTHESIS_SMOOTHING = 0.2
+
+# Statuses meaning the TTS server has no streaming endpoint
+STREAM_UNSUPPORTED_STATUSES = (404, 405, 501)
+
+
+def wav_header(
+    pcm_bytes: int, channels: int, sample_rate: int, bits: int, format_tag: int = 1
+) -> bytes:
+    """Build a 44-byte WAV header for PCM data of the given size."""
+    block_align = channels * bits // 8
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + pcm_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        format_tag,
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        bits,
+        b"data",
+        pcm_bytes,
+    )
+
+
+class WavReframer:
+    """
+    Cuts a streamed WAV file into standalone WAV files.
+
+    Streaming servers send one header followed by PCM data of unknown length.
+    Each piece returned here has its own header and whole sample frames, so
+    the client can decode and queue it as soon as it arrives. Data that isn't
+    WAV is passed through in one piece at the end.
+    """
+
+    def __init__(self, chunk_ms: int = 250):
+        """
+        Initialize the reframer.
+
+        Args:
+            chunk_ms: Minimum audio length of each piece in milliseconds
+        """
+        self.chunk_ms = chunk_ms
+        self.passthrough = False
+
+        self.format_tag = 1
+        self.channels = 1
+        self.sample_rate = 24000
+        self.bits = 16
+
+        self._header_parsed = False
+        self._buffer = bytearray()
+        self._pcm = bytearray()
+
+    def _parse_header(self) -> bool:
+        """Read the format from the buffered header (False if more data is needed)."""
+        if len(self._buffer) < 12:
+            return False
+        if self._buffer[:4] != b"RIFF" or self._buffer[8:12] != b"WAVE":
+            self.passthrough = True
+            return True
+
+        offset = 12
+        while offset + 8 <= len(self._buffer):
+            chunk_id = bytes(self._buffer[offset : offset + 4])
+            (size,) = struct.unpack("<I", self._buffer[offset + 4 : offset + 8])
+            if chunk_id == b"data":
+                # Streamed files don't know their length; the rest is PCM
+                del self._buffer[: offset + 8]
+                return True
+            if offset + 8 + size > len(self._buffer):
+                return False
+            if chunk_id == b"fmt ":
+                (
+                    self.format_tag,
+                    self.channels,
+                    self.sample_rate,
+                    _,
+                    _,
+                    self.bits,
+                ) = struct.unpack("<HHIIHH", self._buffer[offset + 8 : offset + 24])
+            offset += 8 + size + (size % 2)
+        return False
+
+    @property
+    def _frame_bytes(self) -> int:
+        return max(1, self.channels * self.bits // 8)
+
+    def _wav(self, pcm: bytes) -> bytes:
+        return (
+            wav_header(len(pcm), self.channels, self.sample_rate, self.bits, self.format_tag)
+            + pcm
+        )
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """
+        Add streamed bytes.
+
+        Returns:
+            Standalone WAV files ready to play (possibly none)
+        """
+        self._buffer.extend(data)
+        if not self._header_parsed:
+            self._header_parsed = self._parse_header()
+            if not self._header_parsed:
+                return []
+        if self.passthrough:
+            return []
+
+        frame_bytes = self._frame_bytes
+        chunk_bytes = max(
+            frame_bytes,
+            self.sample_rate * self.chunk_ms // 1000 * frame_bytes,
+        )
+        pieces = []
+        while len(self._buffer) >= chunk_bytes:
+            pcm = bytes(self._buffer[:chunk_bytes])
+            del self._buffer[:chunk_bytes]
+            self._pcm.extend(pcm)
+            pieces.append(self._wav(pcm))
+        return pieces
+
+    def flush(self) -> List[bytes]:
+        """
+        End the stream.
+
+        Returns:
+            The remaining audio as a final piece (possibly none)
+        """
+        if self.passthrough or not self._header_parsed:
+            # Kept for audio(), which returns the data as received
+            self.passthrough = True
+            data = bytes(self._buffer)
+            self._buffer.clear()
+            self._pcm.extend(data)
+            return [data] if data else []
+
+        # Drop a trailing partial frame, it can't be played
+        usable = len(self._buffer) - len(self._buffer) % self._frame_bytes
+        pcm = bytes(self._buffer[:usable])
+        self._buffer.clear()
+        if not pcm:
+            return []
+        self._pcm.extend(pcm)
+        return [self._wav(pcm)]
+
+    def audio(self) -> bytes:
+        """The complete audio received so far as one file."""
+        if self.passthrough:
+            return bytes(self._pcm) + bytes(self._buffer)
+        return self._wav(bytes(self._pcm))
+
 
 class TTSClient:
     """
     Client for communicating with a local TTS API.
 
     This class handles requests to a locally hosted TTS API that follows
-    the OpenAI API format for text-to-speech generation.
+    the OpenAI API format for text-to-speech generation. Async requests go
+    through a pooled HTTP client, so cancelling one (e.g. on barge-in)
+    closes its connection and the server stops synthesizing.
     """
 
     def __init__(
@@ -37,6 +201,11 @@ class TTSClient:
         speed: float = 1.0,
         timeout: int = 60,
         chunk_size: int = 4096,
+        streaming: bool = False,
+        stream_chunk_ms: int = 250,
+        cache_max_bytes: int = 32 * 1024 * 1024,
+        cache_dir: Optional[str] = None,
+        cache_disk_max_bytes: int = 256 * 1024 * 1024,
     ):
         """
         Initialize the TTS client.
@@ -49,6 +218,13 @@ class TTSClient:
             speed: Speech speed multiplier (0.25 to 4.0)
             timeout: Request timeout in seconds
             chunk_size: Size of audio chunks to stream in bytes
+            streaming: Forward audio from the server's /tts/stream endpoint as it
+                is generated (WAV output only; falls back when unsupported)
+            stream_chunk_ms: Minimum audio length of each streamed piece
+            cache_max_bytes: Memory budget for cached audio
+            cache_dir: Directory of the persistent audio cache shared by all
+                workers (None keeps cached audio in memory only)
+            cache_disk_max_bytes: Disk budget for the persistent audio cache
         """
         self.api_endpoint = api_endpoint
         self.model = model
@@ -57,21 +233,32 @@ class TTSClient:
         self.speed = speed
         self.timeout = timeout
         self.chunk_size = chunk_size
+        self.streaming = streaming
+        self.stream_chunk_ms = stream_chunk_ms
 
-        # State tracking
-        self.is_processing = False
+        # Requests in flight across all sessions and pipelines
+        self.active_requests = 0
         self.last_processing_time = 0
 
-        # Simple cache for frequently used phrases
-        # Using a relatively small cache size to prevent memory issues
-        self.cache_max_size = 50
-        self.cache = {}
-        self.cache_hits = 0
-        self.cache_misses = 0
+        # Audio for text already spoken with the same voice settings
+        self.cache = AudioCache(
+            max_bytes=cache_max_bytes,
+            disk_path=cache_dir,
+            disk_max_bytes=cache_disk_max_bytes,
+        )
 
         self.executor = ThreadPoolExecutor(max_workers=1)
         self.interrupt_event = threading.Event()
 
+        # Pooled async HTTP client, created on first use inside the event loop
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Typical synthesis time, used to estimate what aborted requests saved
+        self.avg_seconds_per_char: Optional[float] = None
+        self.aborted_requests = 0
+        self.saved_seconds = 0.0
+        self.avg_first_chunk_seconds: Optional[float] = None
+
         logger.info(
             f"Initialized TTS Client with endpoint={api_endpoint}, "
             f"model={model}, voice={voice}"
@@ -87,22 +274,18 @@ class TTSClient:
         Returns:
             Audio data as bytes
         """
-        self.is_processing = True
+        self.active_requests += 1
         start_time = time.time()
 
         try:
             # Check cache first
-            if text in self.cache:
-                self.cache_hits += 1
-                audio_data = self.cache[text]
-                logger.info(
-                    f"TTS cache hit for text ({len(text)} chars), cache hits: {self.cache_hits}"
-                )
+            cache_key = self._cache_key(text)
+            audio_data = self.cache.get(cache_key)
+            if audio_data is not None:
+                logger.info(f"TTS cache hit for text ({len(text)} chars)")
                 self.last_processing_time = time.time() - start_time
                 return audio_data
 
-            self.cache_misses += 1
-
             # Prepare request payload
             payload = {
                 "model": self.model,
@@ -112,9 +295,7 @@ class TTSClient:
                 "speed": self.speed,
             }
 
-            logger.info(
-                f"Sending TTS request with {len(text)} characters of text, cache misses: {self.cache_misses}"
-            )
+            logger.info(f"Sending TTS request with {len(text)} characters of text")
 
             # Send request to TTS API
             response = requests.post(
@@ -127,14 +308,8 @@ class TTSClient:
             # Get audio content
             audio_data = response.content
 
-            # Add to cache if not too large
-            if len(self.cache) < self.cache_max_size:
-                self.cache[text] = audio_data
-            elif len(text) < 100:  # Only replace cache items with small text chunks
-                # Simple LRU-like strategy - remove a random item
-                if self.cache:
-                    self.cache.pop(next(iter(self.cache)))
-                    self.cache[text] = audio_data
+            # Add to cache (least recently used audio is evicted)
+            self.cache.put(cache_key, audio_data)
 
             # Calculate processing time
             self.last_processing_time = time.time() - start_time
@@ -153,7 +328,7 @@ class TTSClient:
             logger.error(f"TTS processing error: {e}")
             raise
         finally:
-            self.is_processing = False
+            self.active_requests -= 1
 
     def stream_text_to_speech1(self, text: str) -> Generator[bytes, None, None]:
         """
@@ -165,7 +340,7 @@ class TTSClient:
         Yields:
             Chunks of audio data
         """
-        self.is_processing = True
+        self.active_requests += 1
         start_time = time.time()
 
         try:
@@ -222,7 +397,7 @@ class TTSClient:
             logger.error(f"TTS streaming error: {e}")
             raise
         finally:
-            self.is_processing = False
+            self.active_requests -= 1
 
     async def stream_text_to_speech(self, text, websocket):
         """
@@ -235,14 +410,14 @@ class TTSClient:
         # Reset interrupt flag before starting
         self.interrupt_event.clear()
         # Set processing flag to indicate we're generating speech
-        self.is_processing = True
+        self.active_requests += 1
 
         logger.info(f"Starting TTS for text: {text[:50]}...")
 
         def generate_chunks():
             try:
                 # Get the appropriate streaming endpoint based on config
-                stream_endpoint = f"{self.api_endpoint.rstrip('/').replace('/v1/audio/speech', '')}/tts/stream"
+                stream_endpoint = self.stream_endpoint
                 logger.info(f"Using TTS streaming endpoint: {stream_endpoint}")
 
                 # Make the request with streaming enabled
@@ -330,15 +505,166 @@ class TTSClient:
             except:
                 pass
         finally:
-            # Always reset processing flag
-            self.is_processing = False
+            # Always count the request as finished
+            self.active_requests -= 1
+
+    @property
+    def is_processing(self) -> bool:
+        """Whether any request is in flight."""
+        return self.active_requests > 0
+
+    @property
+    def stream_endpoint(self) -> str:
+        """URL of the server's chunked streaming endpoint."""
+        return f"{self.api_endpoint.rstrip('/').replace('/v1/audio/speech', '')}/tts/stream"
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared, connection-pooling async HTTP client."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=5.0)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _record_abort(self, text: str, elapsed: float) -> None:
+        """Log a synthesis request cancelled before it finished."""
+        self.aborted_requests += 1
+        if self.avg_seconds_per_char is None:
+            logger.info(
+                f"Aborted TTS request for {len(text)} chars after {elapsed:.2f}s"
+            )
+            return
+
+        saved = max(0.0, self.avg_seconds_per_char * len(text) - elapsed)
+        self.saved_seconds += saved
+        logger.info(
+            f"Aborted TTS request for {len(text)} chars after {elapsed:.2f}s, "
+            f"saving about {saved:.2f}s of synthesis"
+        )
+
+    def _cache_key(self, text: str) -> str:
+        """Cache key for a text spoken with the current voice settings."""
+        return self.cache.key(
+            text, self.model, self.voice, self.output_format, self.speed
+        )
+
+    def _record_synthesis(self, text: str, processing_time: float) -> None:
+        """Update the typical synthesis time with a finished request."""
+        self.last_processing_time = processing_time
+        seconds_per_char = processing_time / max(1, len(text))
+        if self.avg_seconds_per_char is None:
+            self.avg_seconds_per_char = seconds_per_char
+        else:
+            self.avg_seconds_per_char += SYNTHESIS_SMOOTHING * (
+                seconds_per_char - self.avg_seconds_per_char
+            )
+
+    async def stream_speech(self, text: str) -> AsyncGenerator[bytes, None]:
+        """
+        Generate audio and yield it in playable pieces as the server produces it.
+
+        With streaming enabled, the server's chunked /tts/stream response is
+        re-framed into standalone WAV files, so playback can start after the
+        server's first chunk instead of after the whole sentence. Closing the
+        generator (e.g. on barge-in) closes the request. Otherwise, or if the
+        stream fails before any audio, the complete audio is yielded once.
+
+        Args:
+            text: Text to convert to speech
+
+        Yields:
+            Audio files to play in order
+        """
+        cache_key = self._cache_key(text)
+        audio_data = await self.cache.aget(cache_key)
+        if audio_data is None and (not self.streaming or self.output_format != "wav"):
+            audio_data = await self._request_speech(text, cache_key)
+        if audio_data is not None:
+            if audio_data:
+                yield audio_data
+            return
+
+        logger.info(f"Streaming TTS request for text ({len(text)} chars)")
+        # Same voice settings as a complete request, so the audio cached
+        # under this key is what the key describes
+        payload = {
+            "model": self.model,
+            "text": text,
+            "voice": self.voice,
+            "response_format": self.output_format,
+            "speed": self.speed,
+        }
+        reframer = WavReframer(self.stream_chunk_ms)
+        start_time = time.time()
+        first_chunk_time = None
+        self.active_requests += 1
+        try:
+            async with self.client.stream(
+                "POST", self.stream_endpoint, json=payload
+            ) as response:
+                response.raise_for_status()
+                async for data in response.aiter_bytes():
+                    for piece in reframer.feed(data):
+                        if first_chunk_time is None:
+                            first_chunk_time = time.time() - start_time
+                        yield piece
+            for piece in reframer.flush():
+                if first_chunk_time is None:
+                    first_chunk_time = time.time() - start_time
+                yield piece
+        except (asyncio.CancelledError, GeneratorExit):
+            self._record_abort(text, time.time() - start_time)
+            raise
+        except Exception as e:
+            if first_chunk_time is not None:
+                logger.error(f"Streaming TTS error after first chunk: {e}")
+                return
+            if (
+                isinstance(e, httpx.HTTPStatusError)
+                and e.response.status_code in STREAM_UNSUPPORTED_STATUSES
+            ):
+                logger.warning(
+                    f"TTS server has no streaming endpoint ({e.response.status_code}), "
+                    f"using complete synthesis from now on"
+                )
+                self.streaming = False
+            else:
+                logger.error(f"Streaming TTS error, using complete synthesis: {e}")
+            audio_data = await self._request_speech(text, cache_key)
+            if audio_data:
+                yield audio_data
+            return
+        finally:
+            self.active_requests -= 1
+
+        processing_time = time.time() - start_time
+        self._record_synthesis(text, processing_time)
+        if first_chunk_time is not None:
+            if self.avg_first_chunk_seconds is None:
+                self.avg_first_chunk_seconds = first_chunk_time
+            else:
+                self.avg_first_chunk_seconds += SYNTHESIS_SMOOTHING * (
+                    first_chunk_time - self.avg_first_chunk_seconds
+                )
+            await self.cache.aput(cache_key, reframer.audio())
+        logger.info(
+            f"Streaming TTS completed in {processing_time:.3f}s "
+            f"(first chunk after {first_chunk_time or 0:.3f}s)"
+        )
 
     async def async_text_to_speech(self, text: str) -> bytes:
         """
         Asynchronously generate audio data from the TTS API.
 
-        This method provides asynchronous TTS capability by running
-        the synchronous method in a thread.
+        Cancelling the calling task closes the request's connection, so the
+        TTS server stops work nobody will hear.
 
         Args:
             text: Text to convert to speech
@@ -346,24 +672,41 @@ class TTSClient:
         Returns:
             Complete audio data as bytes
         """
-        self.is_processing = True
+        # Check cache first (memory hits don't leave the event loop)
+        cache_key = self._cache_key(text)
+        audio_data = await self.cache.aget(cache_key)
+        if audio_data is not None:
+            logger.info(f"Async TTS cache hit for text ({len(text)} chars)")
+            return audio_data
 
-        try:
-            # Check cache first (fast path, no need for async)
-            if text in self.cache:
-                self.cache_hits += 1
-                logger.info(f"Async TTS cache hit for text ({len(text)} chars)")
-                return self.cache[text]
+        return await self._request_speech(text, cache_key)
 
-            # For larger chunks, process in a thread pool to not block the event loop
+    async def _request_speech(self, text: str, cache_key: str) -> bytes:
+        """Request complete audio from the TTS API and cache it (b"" on error)."""
+        self.active_requests += 1
+
+        try:
             logger.info(f"Async TTS request for text ({len(text)} chars)")
             start_time = time.time()
-            audio_data = await asyncio.to_thread(self.text_to_speech, text)
+            payload = {
+                "model": self.model,
+                "input": text,
+                "voice": self.voice,
+                "response_format": self.output_format,
+                "speed": self.speed,
+            }
+            try:
+                response = await self.client.post(self.api_endpoint, json=payload)
+                response.raise_for_status()
+            except asyncio.CancelledError:
+                self._record_abort(text, time.time() - start_time)
+                raise
+            audio_data = response.content
             processing_time = time.time() - start_time
-            self.last_processing_time = processing_time
+            self._record_synthesis(text, processing_time)
 
             # Store in cache after successful generation
-            self.cache[text] = audio_data
+            await self.cache.aput(cache_key, audio_data)
 
             logger.info(f"Async TTS completed in {processing_time:.3f}s")
             return audio_data
@@ -373,7 +716,7 @@ class TTSClient:
             # Return empty audio on error
             return b""
         finally:
-            self.is_processing = False
+            self.active_requests -= 1
 
     def get_config(self) -> Dict[str, Any]:
         """
@@ -390,8 +733,15 @@ class TTSClient:
             "speed": self.speed,
             "timeout": self.timeout,
             "chunk_size": self.chunk_size,
+            "streaming": self.streaming,
+            "stream_chunk_ms": self.stream_chunk_ms,
+            "avg_first_chunk_seconds": self.avg_first_chunk_seconds,
+            "cache": self.cache.get_stats(),
             "is_processing": self.is_processing,
+            "active_requests": self.active_requests,
             "last_processing_time": self.last_processing_time,
+            "aborted_requests": self.aborted_requests,
+            "saved_seconds": self.saved_seconds,
         }
 
     def reset_state(self):
@@ -402,7 +752,6 @@ class TTSClient:
         such as when a user interrupts ongoing TTS playback.
         """
         logger.info("Forcibly resetting TTS client state")
-        self.is_processing = False
         self.interrupt_event.set()  # Signal any ongoing streaming to stop
 
 
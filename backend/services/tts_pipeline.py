@@ -0,0 +1,304 @@
+"""
+Sentence Synthesis Pipeline
+
+Turns a streamed LLM reply into audio: text is split into sentences as it
+arrives, several sentences are synthesized concurrently, and the audio is
+delivered in the original order. Reading the LLM stream never waits for
+synthesis, so a turn takes about as long as the slower of the two.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .llm import stopping_early
+from .tts import TTSClient
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sentence boundaries used to split a reply into audio chunks
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?:;])\s+")
+
+# Sentences shorter than this are joined with the next one
+MIN_SENTENCE_CHARS = 30
+
+# Without a sentence boundary, cut at a space past this length, or anywhere past the maximum
+PHRASE_CHARS = 80
+MAX_CHUNK_CHARS = 120
+
+# Pipeline stages a sentence goes through after it is split off
+STAGES = ("waiting", "synthesizing", "ready")
+
+
+def split_sentences(text: str, min_chars: int = MIN_SENTENCE_CHARS) -> List[str]:
+    """
+    Split a reply into sentences for synthesis, joining very short ones.
+
+    Args:
+        text: Reply text
+        min_chars: Minimum length of a piece (except the last)
+
+    Returns:
+        Non-empty pieces of the text, in order
+    """
+    pieces = []
+    buffer = ""
+    for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+        buffer = f"{buffer} {sentence}" if buffer else sentence
+        if len(buffer) >= min_chars:
+            pieces.append(buffer)
+            buffer = ""
+    if buffer:
+        pieces.append(buffer)
+    return pieces
+
+
+def take_sentence(buffer: str) -> Tuple[str, str]:
+    """
+    Split the next piece worth synthesizing off streamed text.
+
+    Args:
+        buffer: Text received so far and not yet synthesized
+
+    Returns:
+        Tuple of the piece (empty if more text is needed) and the rest
+    """
+    # Cut at the first sentence boundary that leaves a long enough piece, so
+    # each piece is one sentence (or a few short ones joined), as in split_sentences
+    boundary = SENTENCE_BOUNDARY.search(buffer, MIN_SENTENCE_CHARS)
+    if boundary:
+        return buffer[: boundary.start()], buffer[boundary.end():]
+
+    if len(buffer) >= PHRASE_CHARS:
+        space = buffer.rfind(" ")
+        if space > 0:
+            return buffer[:space], buffer[space + 1:]
+
+    if len(buffer) >= MAX_CHUNK_CHARS:
+        return buffer, ""
+
+    return "", buffer
+
+
+class PipelineStats:
+    """Process-wide sentence counts and queue depths of the synthesis pipelines."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.sentences = 0
+        self.depth = {stage: 0 for stage in STAGES}
+        self.peak_depth = {stage: 0 for stage in STAGES}
+
+    def change(self, stage: str, delta: int) -> None:
+        """Move sentences into (positive delta) or out of a stage."""
+        with self._lock:
+            self.depth[stage] += delta
+            self.peak_depth[stage] = max(self.peak_depth[stage], self.depth[stage])
+
+    def record_turn(self, sentences: int) -> None:
+        """Count a finished turn."""
+        with self._lock:
+            self.turns += 1
+            self.sentences += sentences
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pipeline statistics.
+
+        Returns:
+            Dict with turns, sentences, current depth and peak_depth per stage
+        """
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "sentences": self.sentences,
+                "depth": dict(self.depth),
+                "peak_depth": dict(self.peak_depth),
+            }
+
+
+# Shared by all connections
+pipeline_stats = PipelineStats()
+
+
+class SentencePipeline:
+    """
+    Synthesis pipeline for one streamed reply.
+
+    A reader task splits the LLM stream into sentences and starts a synthesis
+    task for each right away; at most max_concurrency of them call the TTS
+    backend at once. Iterating the pipeline yields each sentence's audio in
+    order, piece by piece as the TTS server streams it, as soon as the
+    sentences before it have been yielded.
+    """
+
+    def __init__(
+        self,
+        tts_client: TTSClient,
+        text_stream: AsyncIterator[str],
+        max_concurrency: int = 2,
+        max_sentences: int = 0,
+    ):
+        """
+        Start the pipeline.
+
+        Args:
+            tts_client: Shared TTS client
+            text_stream: LLM text stream (closed when reading stops)
+            max_concurrency: Sentences synthesized at the same time
+            max_sentences: Stop reading the LLM stream after this many
+                sentences (0 reads it to the end)
+        """
+        self.tts_client = tts_client
+        self.text_stream = text_stream
+        self.max_sentences = max_sentences
+
+        self.sentences = 0
+        self.stopped_early = False
+        self.depth = {stage: 0 for stage in STAGES}
+
+        self._slots = asyncio.Semaphore(max(1, max_concurrency))
+        self._audio: asyncio.Queue = asyncio.Queue()
+        self._delivering: Optional["_Sentence"] = None
+        self._reader = asyncio.create_task(self._read())
+
+    def _change(self, stage: str, delta: int) -> None:
+        """Track a sentence entering or leaving a stage."""
+        self.depth[stage] += delta
+        pipeline_stats.change(stage, delta)
+
+    async def _read(self) -> None:
+        """Split the LLM stream into sentences and start synthesizing them."""
+        buffer = ""
+        try:
+            async for text_chunk in self.text_stream:
+                buffer += text_chunk
+                while True:
+                    sentence, buffer = take_sentence(buffer)
+                    if not sentence:
+                        break
+                    self._submit(sentence)
+                    if self.max_sentences and self.sentences >= self.max_sentences:
+                        # The rest of the reply won't be spoken, stop generating it
+                        self.stopped_early = True
+                        return
+
+            if buffer.strip():
+                self._submit(buffer)
+        except Exception as e:
+            logger.error(f"Error reading LLM stream: {e}")
+        finally:
+            if self.stopped_early:
+                with stopping_early():
+                    await self.text_stream.aclose()
+            else:
+                await self.text_stream.aclose()
+            self._audio.put_nowait(None)
+
+    def _submit(self, text: str) -> None:
+        """Queue a sentence for synthesis, keeping its place in the order."""
+        self.sentences += 1
+        self._change("waiting", 1)
+        sentence = _Sentence(text)
+        sentence.task = asyncio.create_task(self._synthesize(sentence))
+        self._audio.put_nowait(sentence)
+
+    async def _synthesize(self, sentence: "_Sentence") -> None:
+        """Synthesize one sentence once a slot is free, queueing audio as it arrives."""
+        started = False
+        try:
+            async with self._slots:
+                started = True
+                self._change("waiting", -1)
+                self._change("synthesizing", 1)
+                try:
+                    start_time = time.time()
+                    audio_stream = self.tts_client.stream_speech(sentence.text)
+                    try:
+                        async for audio_data in audio_stream:
+                            sentence.chunks.put_nowait(audio_data)
+                    finally:
+                        await audio_stream.aclose()
+                    logger.info(
+                        f"TTS processing time: {time.time() - start_time:.3f}s "
+                        f"for {len(sentence.text)} chars"
+                    )
+                finally:
+                    self._change("synthesizing", -1)
+        except Exception as e:
+            logger.error(f"Error synthesizing sentence: {e}")
+        finally:
+            if not started:
+                # Cancelled while waiting for a slot
+                self._change("waiting", -1)
+            sentence.chunks.put_nowait(None)
+        sentence.synthesized = True
+        self._change("ready", 1)
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, bytes]]:
+        """
+        Yield audio in order as (text, audio) pairs.
+
+        A sentence's text comes with its first piece of audio and is empty for
+        the rest; a sentence without audio is yielded once with empty audio.
+        """
+        while True:
+            sentence = await self._audio.get()
+            if sentence is None:
+                break
+            self._delivering = sentence
+
+            text = sentence.text
+            while True:
+                audio_data = await sentence.chunks.get()
+                if audio_data is None:
+                    break
+                yield text, audio_data
+                text = ""
+            if text:
+                yield text, b""
+
+            self._delivered(sentence)
+            self._delivering = None
+
+    def _delivered(self, sentence: "_Sentence") -> None:
+        """Take a sentence out of the ready stage once its audio has gone out."""
+        if sentence.synthesized and not sentence.delivered:
+            self._change("ready", -1)
+        sentence.delivered = True
+
+    async def aclose(self) -> None:
+        """Stop reading the LLM stream and cancel synthesis not delivered yet."""
+        if not self._reader.done():
+            self._reader.cancel()
+        await asyncio.wait({self._reader})
+
+        pending = [self._delivering] if self._delivering else []
+        while not self._audio.empty():
+            sentence = self._audio.get_nowait()
+            if sentence is not None:
+                pending.append(sentence)
+
+        for sentence in pending:
+            sentence.task.cancel()
+            await asyncio.wait({sentence.task})
+            self._delivered(sentence)
+
+        pipeline_stats.record_turn(self.sentences)
+
+
+class _Sentence:
+    """A sentence in the pipeline and its audio as it arrives."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.chunks: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+        self.synthesized = False
+        self.delivered = False
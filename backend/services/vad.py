@@ -0,0 +1,199 @@
+"""
+Voice Activity Detection Service
+
+Trims leading/trailing silence from speech segments and rejects segments
+that contain no speech before they reach the Whisper model.
+"""
+
+import logging
+import threading
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Segments quieter than this (dBFS) never contain usable speech
+ABSOLUTE_FLOOR_DB = -55.0
+
+# Minimum spread between noise floor and loudest frame for speech to stand out
+MIN_DYNAMIC_RANGE_DB = 6.0
+
+
+class VoiceActivityDetector:
+    """
+    Server-side voice activity detection for complete speech segments.
+
+    The default detector works on frame RMS energy with hysteresis: frames
+    above the upper threshold start speech, and speech continues while frames
+    stay above the lower threshold. Both thresholds sit between the segment's
+    noise floor and its loudest frame, so the detector adapts to microphone
+    gain. Optionally the Silero ONNX model bundled with faster-whisper is
+    used instead, running on CPU.
+    """
+
+    MODES = ("rms", "onnx")
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        padding_ms: int = 30,
+        mode: str = "rms",
+        frame_ms: int = 30,
+        min_speech_ms: int = 250,
+        sample_rate: int = 16000,
+    ):
+        """
+        Initialize the voice activity detector.
+
+        Args:
+            threshold: Speech threshold (0.0-1.0). For 'rms' the fraction of the
+                floor-to-peak range in dB, for 'onnx' the speech probability
+            padding_ms: Audio kept around detected speech in milliseconds
+            mode: Detector to use ('rms' or 'onnx')
+            frame_ms: Analysis frame length for the RMS detector
+            min_speech_ms: Segments with less detected speech are rejected
+            sample_rate: Sample rate of the audio in Hz
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown VAD mode '{mode}', expected one of {self.MODES}")
+
+        self.threshold = min(max(threshold, 0.0), 1.0)
+        self.padding_ms = padding_ms
+        self.mode = mode
+        self.frame_ms = frame_ms
+        self.min_speech_ms = min_speech_ms
+        self.sample_rate = sample_rate
+
+        # Counters (segments are processed from several worker threads)
+        self._lock = threading.Lock()
+        self.processed_segments = 0
+        self.rejected_segments = 0
+        self.input_seconds = 0.0
+        self.trimmed_seconds = 0.0
+
+        logger.info(
+            f"Initialized Voice Activity Detector with mode={mode}, "
+            f"threshold={self.threshold}, padding_ms={padding_ms}"
+        )
+
+    def process(self, audio: np.ndarray) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """
+        Trim silence from a speech segment and decide whether it contains speech.
+
+        Args:
+            audio: Mono float32 samples
+
+        Returns:
+            Tuple[np.ndarray, Dict[str, Any]]:
+                - The trimmed audio (a view of the input)
+                - Dictionary with speech flag, trim offset and trimmed duration
+        """
+        if self.mode == "onnx":
+            start, end, speech_samples = self._detect_onnx(audio)
+        else:
+            start, end, speech_samples = self._detect_rms(audio)
+
+        duration = len(audio) / self.sample_rate
+        is_speech = speech_samples * 1000 >= self.min_speech_ms * self.sample_rate
+        if not is_speech:
+            start, end = 0, 0
+
+        trimmed = duration - (end - start) / self.sample_rate
+        with self._lock:
+            self.processed_segments += 1
+            self.input_seconds += duration
+            self.trimmed_seconds += trimmed
+            if not is_speech:
+                self.rejected_segments += 1
+
+        info = {
+            "speech": is_speech,
+            "trim_offset": start / self.sample_rate,
+            "trimmed_seconds": trimmed,
+            "speech_seconds": speech_samples / self.sample_rate,
+        }
+        return audio[start:end], info
+
+    def _detect_rms(self, audio: np.ndarray) -> Tuple[int, int, int]:
+        """
+        Detect speech with frame RMS energy and hysteresis.
+
+        Returns:
+            Tuple of (start sample, end sample, detected speech samples)
+        """
+        frame = int(self.sample_rate * self.frame_ms / 1000)
+        n_frames = len(audio) // frame
+        if n_frames == 0:
+            return 0, 0, 0
+
+        frames = audio[: n_frames * frame].reshape(n_frames, frame)
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+
+        floor = float(np.percentile(energy_db, 10))
+        peak = float(energy_db.max())
+        if peak < ABSOLUTE_FLOOR_DB or peak - floor < MIN_DYNAMIC_RANGE_DB:
+            return 0, 0, 0
+
+        upper = floor + self.threshold * (peak - floor)
+        lower = floor + 0.5 * self.threshold * (peak - floor)
+
+        # Hysteresis: runs above the lower threshold count as speech only if
+        # they reach the upper threshold somewhere
+        weak = energy_db >= lower
+        run_starts = weak & ~np.concatenate(([False], weak[:-1]))
+        run_ids = np.cumsum(run_starts) * weak
+        strong_per_run = np.bincount(run_ids, weights=energy_db >= upper)
+        speech = weak & (strong_per_run[run_ids] > 0)
+
+        speech_frames = np.flatnonzero(speech)
+        if speech_frames.size == 0:
+            return 0, 0, 0
+
+        padding = int(self.sample_rate * self.padding_ms / 1000)
+        start = max(0, speech_frames[0] * frame - padding)
+        end = min(len(audio), (speech_frames[-1] + 1) * frame + padding)
+        return int(start), int(end), int(speech_frames.size * frame)
+
+    def _detect_onnx(self, audio: np.ndarray) -> Tuple[int, int, int]:
+        """
+        Detect speech with the Silero ONNX model bundled with faster-whisper.
+
+        Returns:
+            Tuple of (start sample, end sample, detected speech samples)
+        """
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        chunks = get_speech_timestamps(
+            audio,
+            VadOptions(
+                threshold=self.threshold,
+                min_speech_duration_ms=self.min_speech_ms,
+                speech_pad_ms=self.padding_ms,
+            ),
+            sampling_rate=self.sample_rate,
+        )
+        if not chunks:
+            return 0, 0, 0
+
+        speech_samples = sum(chunk["end"] - chunk["start"] for chunk in chunks)
+        return chunks[0]["start"], chunks[-1]["end"], speech_samples
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get detector settings and counters.
+
+        Returns:
+            Dict containing the configuration, trimmed seconds and rejected segments
+        """
+        return {
+            "mode": self.mode,
+            "threshold": self.threshold,
+            "padding_ms": self.padding_ms,
+            "processed_segments": self.processed_segments,
+            "rejected_segments": self.rejected_segments,
+            "input_seconds": self.input_seconds,
+            "trimmed_seconds": self.trimmed_seconds,
+        }
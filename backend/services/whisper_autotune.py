@@ -0,0 +1,304 @@
+"""
+Whisper Autotuner
+
+Benchmarks combinations of compute type, CPU threads and model workers on a
+reference clip and remembers the fastest one per host and model.
+
+Run it ahead of time with:
+    python -m backend.services.whisper_autotune --model base.en [--clip speech.wav] [--force]
+or let the backend run it on startup with WHISPER_AUTOTUNE=True.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+
+import ctranslate2
+import numpy as np
+from faster_whisper import WhisperModel
+
+from .audio_ingest import wav_to_float32
+from .transcription import WHISPER_SAMPLE_RATE
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "vocalis", "whisper_autotune.json"
+)
+
+# Candidate compute types in order of preference (ties go to the earlier one)
+COMPUTE_TYPES = {
+    "cpu": ["int8", "int8_float32", "float32"],
+    "cuda": ["float16", "int8_float16", "int8"],
+}
+
+REFERENCE_CLIP_SECONDS = 8.0
+
+
+def reference_clip(path: Optional[str] = None) -> np.ndarray:
+    """
+    Load the reference clip used for benchmarking.
+
+    Without a path a deterministic, speech-like clip is synthesized: voiced
+    syllables with a wandering pitch and vowel formants, separated by short
+    pauses. A real recording gives more representative decoder timings.
+
+    Args:
+        path: Optional WAV file to benchmark with instead
+
+    Returns:
+        Mono float32 samples at 16 kHz
+    """
+    if path:
+        with open(path, "rb") as f:
+            return wav_to_float32(f.read())
+
+    rng = np.random.default_rng(2024)
+    t = np.arange(int(REFERENCE_CLIP_SECONDS * WHISPER_SAMPLE_RATE)) / WHISPER_SAMPLE_RATE
+
+    # Pitch contour around 150 Hz and its phase
+    pitch = 150 + 30 * np.sin(2 * np.pi * 0.5 * t) + 10 * np.sin(2 * np.pi * 3.1 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / WHISPER_SAMPLE_RATE
+
+    # Harmonics weighted by two slowly moving vowel formants
+    formant_1 = 500 + 250 * np.sin(2 * np.pi * 1.3 * t)
+    formant_2 = 1500 + 600 * np.sin(2 * np.pi * 0.9 * t + 1.0)
+    voice = np.zeros_like(t)
+    for harmonic in range(1, 25):
+        frequency = harmonic * pitch
+        weight = np.exp(-(((frequency - formant_1) / 200) ** 2)) + 0.6 * np.exp(
+            -(((frequency - formant_2) / 300) ** 2)
+        )
+        voice += weight * np.sin(harmonic * phase) / harmonic
+
+    # Syllable envelope (about 4 per second) with pauses between words
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    words = (np.sin(2 * np.pi * 0.7 * t) > -0.6).astype(np.float64)
+    clip = voice * syllables * words + 0.003 * rng.standard_normal(len(t))
+    return (0.5 * clip / np.max(np.abs(clip))).astype(np.float32)
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    """Pick 'cuda' when available unless a device is given."""
+    if device:
+        return device
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+
+def candidate_settings(device: str) -> List[Dict[str, Any]]:
+    """
+    Build the combinations to benchmark on this host.
+
+    Args:
+        device: 'cpu' or 'cuda'
+
+    Returns:
+        List of dicts with compute_type, cpu_threads and num_workers
+    """
+    supported = ctranslate2.get_supported_compute_types(device)
+    compute_types = [c for c in COMPUTE_TYPES.get(device, []) if c in supported]
+
+    cores = os.cpu_count() or 1
+    if device == "cpu":
+        thread_counts = sorted({max(1, cores // 2), cores})
+    else:
+        thread_counts = [0]  # CTranslate2 default; the GPU does the work
+    worker_counts = [1, 2] if cores >= 2 or device == "cuda" else [1]
+
+    return [
+        {"compute_type": c, "cpu_threads": threads, "num_workers": workers}
+        for c in compute_types
+        for threads in thread_counts
+        for workers in worker_counts
+    ]
+
+
+def _cache_key(model_size: str, device: str) -> str:
+    """Identify the host and model a tuning result applies to."""
+    return "|".join(
+        [
+            platform.node(),
+            platform.machine(),
+            str(os.cpu_count()),
+            device,
+            model_size,
+            ctranslate2.__version__,
+        ]
+    )
+
+
+def _load_cache(cache_path: str) -> Dict[str, Any]:
+    """Read the tuning cache, tolerating a missing or corrupt file."""
+    try:
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def benchmark(
+    model_size: str,
+    device: str,
+    settings: Dict[str, Any],
+    clip: np.ndarray,
+    beam_size: int = 2,
+    runs: int = 2,
+) -> Dict[str, Any]:
+    """
+    Measure one combination of settings.
+
+    With several workers, that many decodes run concurrently, so the
+    effective real-time factor reflects throughput at full load.
+
+    Returns:
+        The settings plus rtf (effective, under load) and latency_rtf (single request)
+    """
+    model = WhisperModel(model_size, device=device, **settings)
+    clip_seconds = len(clip) / WHISPER_SAMPLE_RATE
+
+    def decode(index: int = 0) -> None:
+        segments, info = model.transcribe(
+            clip, beam_size=beam_size, language="en", vad_filter=False
+        )
+        list(segments)
+
+    try:
+        decode()  # Warm-up
+
+        latency = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            decode()
+            latency = min(latency, time.perf_counter() - start)
+
+        workers = settings["num_workers"]
+        load_time = latency
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                load_time = float("inf")
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    list(pool.map(decode, range(workers)))
+                    load_time = min(load_time, (time.perf_counter() - start) / workers)
+    finally:
+        del model
+        gc.collect()
+
+    return {
+        **settings,
+        "rtf": load_time / clip_seconds,
+        "latency_rtf": latency / clip_seconds,
+    }
+
+
+def autotune(
+    model_size: str,
+    device: Optional[str] = None,
+    clip_path: Optional[str] = None,
+    beam_size: int = 2,
+    force: bool = False,
+    cache_path: str = DEFAULT_CACHE_PATH,
+) -> Dict[str, Any]:
+    """
+    Find the fastest compute type, CPU threads and workers for a model on this host.
+
+    Results are cached per host and model, so only the first startup pays
+    for the benchmark.
+
+    Args:
+        model_size: Whisper model size to tune
+        device: 'cpu' or 'cuda', auto-detected if None
+        clip_path: Optional WAV file used instead of the synthetic reference clip
+        beam_size: Beam size used by the transcriber
+        force: Re-run the benchmark even when a cached result exists
+        cache_path: JSON file holding tuning results
+
+    Returns:
+        Dict with compute_type, cpu_threads, num_workers, rtf, latency_rtf,
+        device, tuned_at, cached and the per-candidate results
+    """
+    device = resolve_device(device)
+    key = _cache_key(model_size, device)
+    cache = _load_cache(cache_path)
+
+    if not force and key in cache:
+        result = dict(cache[key], cached=True)
+        logger.info(
+            f"Using cached Whisper tuning for {model_size}: "
+            f"compute_type={result['compute_type']}, cpu_threads={result['cpu_threads']}, "
+            f"num_workers={result['num_workers']} (rtf={result['rtf']:.3f})"
+        )
+        return result
+
+    clip = reference_clip(clip_path)
+    candidates = []
+    for settings in candidate_settings(device):
+        try:
+            measurement = benchmark(model_size, device, settings, clip, beam_size)
+        except Exception as e:
+            logger.warning(f"Skipping Whisper settings {settings}: {e}")
+            continue
+        logger.info(
+            f"Autotune {model_size} {settings}: rtf={measurement['rtf']:.3f}, "
+            f"latency_rtf={measurement['latency_rtf']:.3f}"
+        )
+        candidates.append(measurement)
+
+    if not candidates:
+        raise RuntimeError(f"No Whisper settings could be benchmarked for {model_size}")
+
+    best = min(candidates, key=lambda c: c["rtf"])
+    result = {
+        "compute_type": best["compute_type"],
+        "cpu_threads": best["cpu_threads"],
+        "num_workers": best["num_workers"],
+        "rtf": best["rtf"],
+        "latency_rtf": best["latency_rtf"],
+        "device": device,
+        "tuned_at": time.time(),
+        "candidates": candidates,
+    }
+
+    cache[key] = result
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not save Whisper tuning cache: {e}")
+
+    logger.info(
+        f"Tuned Whisper {model_size}: compute_type={result['compute_type']}, "
+        f"cpu_threads={result['cpu_threads']}, num_workers={result['num_workers']} "
+        f"(rtf={result['rtf']:.3f})"
+    )
+    return dict(result, cached=False)
+
+
+def main() -> None:
+    """Tune from the command line."""
+    from .. import config
+
+    parser = argparse.ArgumentParser(description="Tune Whisper settings for this host")
+    parser.add_argument("--model", default=config.WHISPER_MODEL, help="Whisper model size")
+    parser.add_argument("--device", default=None, help="cpu or cuda (auto-detected)")
+    parser.add_argument(
+        "--clip", default=config.WHISPER_AUTOTUNE_CLIP or None, help="Reference WAV file"
+    )
+    parser.add_argument("--force", action="store_true", help="Ignore cached results")
+    args = parser.parse_args()
+
+    result = autotune(args.model, args.device, args.clip, force=args.force)
+    print(json.dumps({k: v for k, v in result.items() if k != "candidates"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
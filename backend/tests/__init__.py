@@ -0,0 +1,2 @@
+# Tests package initialization
+# This file makes the 'tests' directory a Python package
@@ -0,0 +1,132 @@
+"""
+Barge-in Tests
+
+Aborting a spoken response must reach the upstream LLM stream, not just the
+task wrapping it.
+
+Usage:
+    python -m unittest backend.tests.test_barge_in
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import asynccontextmanager
+
+import numpy as np
+
+from ..routes.websocket import MessageType, WebSocketManager
+
+
+class FakeWebSocket:
+    """Records the messages sent to the client."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+
+class FakeTranscriber:
+    """Transcribes every utterance to the same text right away."""
+
+    queue_depth = 0
+    is_processing = False
+
+    async def transcribe_async(self, audio):
+        return "Tell me a long story.", {}
+
+
+class FakeLLM:
+    """Streams a long reply slowly and records whether the stream was closed."""
+
+    active_requests = 0
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.closed = asyncio.Event()
+
+    @asynccontextmanager
+    async def background_slot(self):
+        yield
+
+    async def stream_response(self, messages, temperature=None, result=None, n_keep=None, max_tokens=None):
+        self.started.set()
+        try:
+            for i in range(1000):
+                await asyncio.sleep(0.01)
+                yield f"Sentence number {i} of a story that goes on and on. "
+        finally:
+            self.closed.set()
+
+
+class FakeTTS:
+    """Returns a short clip for every sentence."""
+
+    output_format = "wav"
+    is_processing = False
+
+    def __init__(self):
+        self.interrupt_event = threading.Event()
+
+    async def stream_speech(self, text):
+        await asyncio.sleep(0.01)
+        yield b"RIFF"
+
+    async def async_text_to_speech(self, text):
+        return b"RIFF"
+
+    def reset_state(self):
+        pass
+
+
+class BargeInTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # The manager creates its prompt files in the working directory
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+        self.websocket = FakeWebSocket()
+        self.llm = FakeLLM()
+        self.manager = WebSocketManager(FakeTranscriber(), self.llm, FakeTTS())
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    async def _start_response(self):
+        await self.manager._start_speech_task(self.websocket, np.zeros(16000, dtype=np.float32))
+        await asyncio.wait_for(self.llm.started.wait(), timeout=2)
+        # Let some audio go out
+        while not any(m["type"] == MessageType.TTS_CHUNK for m in self.websocket.sent):
+            await asyncio.sleep(0.01)
+
+    async def test_abort_closes_llm_stream(self):
+        await self._start_response()
+        task = self.manager.current_audio_task
+
+        self.assertTrue(self.manager._abort_response("test"))
+        await asyncio.wait({task}, timeout=2)
+
+        self.assertTrue(task.done())
+        await asyncio.wait_for(self.llm.closed.wait(), timeout=1)
+
+    async def test_no_audio_after_abort(self):
+        await self._start_response()
+        task = self.manager.current_audio_task
+
+        self.manager._abort_response("test")
+        await asyncio.wait({task}, timeout=2)
+        sent = len(self.websocket.sent)
+        await asyncio.sleep(0.2)
+
+        chunks = [m for m in self.websocket.sent[sent:] if m["type"] == MessageType.TTS_CHUNK]
+        self.assertEqual(chunks, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -439,6 +439,11 @@ const ChatInterface: React.FC = () => {
     // Handle transcription results
     const handleTranscription = (data: any) => {
       setTranscript(data.text);
+      
+      // Partial transcripts only update the text while the user is still speaking
+      if (data.partial) {
+        return;
+      }
     
       if (!data.text.trim()) {
         console.log("Empty transcript received, returning to idle");
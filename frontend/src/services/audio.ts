@@ -87,6 +87,13 @@ export class AudioService {
   // Add the nextPlayTime property to the AudioService class
   private nextPlayTime: number | null = null;
 
+  // Incremental transcription: stream audio to the server while the user is still speaking
+  private streamTranscription: boolean = true;
+  private streamFrameMs: number = 250; // ms of audio per streamed frame
+  private streamId: string | null = null;
+  private streamPending: Float32Array[] = [];
+  private streamPendingLength: number = 0;
+
   constructor(config: Partial<AudioConfig> = {}) {
     this.config = { ...DEFAULT_CONFIG, ...config };
   }
@@ -416,6 +423,11 @@ export class AudioService {
     if (this.isVoiceDetected) {
       this.audioBuffer.push(bufferCopy);
       
+      // Stream the frame so the server can transcribe while the user keeps talking
+      if (this.streamTranscription) {
+        this.queueStreamFrame(bufferCopy);
+      }
+      
       // Check if we've exceeded silence timeout
       const timeSinceVoice = Date.now() - this.lastVoiceTime;
       if (energy <= this.voiceThreshold && timeSinceVoice > this.silenceTimeout) {
@@ -504,6 +516,7 @@ export class AudioService {
     // Don't send audio if we're in processing state
     if (this.isProcessing) {
       console.log('Processing state active, discarding audio chunk');
+      this.cancelAudioStream();
       this.audioBuffer = [];
       return;
     }
@@ -515,6 +528,15 @@ export class AudioService {
     const audioLengthMs = (totalLength / this.config.sampleRate) * 1000;
     if (!this.isVoiceDetected && audioLengthMs < this.minRecordingLength) {
       console.log(`Audio too short (${audioLengthMs.toFixed(0)}ms), discarding`);
+      this.cancelAudioStream();
+      this.audioBuffer = [];
+      return;
+    }
+    
+    // If the utterance was streamed, the server already has the audio - just finish the stream
+    if (this.streamId !== null) {
+      console.log(`Finishing audio stream: ${audioLengthMs.toFixed(0)}ms`);
+      this.flushStreamFrame(true);
       this.audioBuffer = [];
       return;
     }
@@ -541,6 +563,64 @@ export class AudioService {
     this.audioBuffer = [];
   }
 
+  /**
+   * Queue a frame for the incremental audio stream, sending once enough audio is pending
+   */
+  private queueStreamFrame(buffer: Float32Array): void {
+    if (this.streamId === null) {
+      this.streamId = `${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+    }
+    
+    this.streamPending.push(buffer);
+    this.streamPendingLength += buffer.length;
+    
+    const pendingMs = (this.streamPendingLength / this.config.sampleRate) * 1000;
+    if (pendingMs >= this.streamFrameMs) {
+      this.flushStreamFrame(false);
+    }
+  }
+  
+  /**
+   * Send pending stream audio as 16-bit PCM, optionally marking the end of the utterance
+   */
+  private flushStreamFrame(final: boolean): void {
+    if (this.streamId === null) {
+      return;
+    }
+    
+    // Convert from Float32 [-1.0,1.0] to Int16 [-32768,32767]
+    const pcm = new Int16Array(this.streamPendingLength);
+    let offset = 0;
+    for (const buffer of this.streamPending) {
+      for (let i = 0; i < buffer.length; i++) {
+        const sample = Math.max(-1.0, Math.min(1.0, buffer[i]));
+        pcm[offset++] = sample < 0 ? sample * 32768 : sample * 32767;
+      }
+    }
+    
+    websocketService.sendAudioStream(this.streamId, pcm, this.config.sampleRate, final);
+    
+    this.streamPending = [];
+    this.streamPendingLength = 0;
+    if (final) {
+      this.streamId = null;
+    }
+  }
+  
+  /**
+   * Abandon the current audio stream (e.g. utterance too short)
+   */
+  private cancelAudioStream(): void {
+    if (this.streamId === null) {
+      return;
+    }
+    
+    websocketService.cancelAudioStream(this.streamId);
+    this.streamId = null;
+    this.streamPending = [];
+    this.streamPendingLength = 0;
+  }
+
   /**
    * Play audio from base64-encoded data
    * 
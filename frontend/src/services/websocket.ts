@@ -7,6 +7,7 @@
 // Message types (corresponds to backend message types)
 export enum MessageType {
   AUDIO = "audio",
+  AUDIO_STREAM = "audio_stream",
   TRANSCRIPTION = "transcription",
   LLM_RESPONSE = "llm_response",
   TTS_CHUNK = "tts_chunk",
@@ -226,6 +227,28 @@ export class WebSocketService {
     });
   }
 
+  /**
+   * Send a frame of 16-bit PCM audio for incremental transcription
+   */
+  public sendAudioStream(streamId: string, pcm: Int16Array, sampleRate: number, final: boolean = false): boolean {
+    return this.send(MessageType.AUDIO_STREAM, {
+      stream_id: streamId,
+      sample_rate: sampleRate,
+      audio_data: this.arrayBufferToBase64(pcm.buffer as ArrayBuffer),
+      final
+    });
+  }
+
+  /**
+   * Tell the server to discard an incremental audio stream
+   */
+  public cancelAudioStream(streamId: string): boolean {
+    return this.send(MessageType.AUDIO_STREAM, {
+      stream_id: streamId,
+      cancel: true
+    });
+  }
+
   /**
    * Send an interrupt signal to stop ongoing TTS
    * Enhanced with fail-safe approach for maximum reliability